@@ -0,0 +1 @@
+"""Benchmarks of the REST and websocket clients."""
@@ -0,0 +1,149 @@
+"""
+End to end throughput of the REST and websocket clients against the local
+FakeMexcServer. Reports requests per second with p50 and p99 latency and
+websocket messages per second per client configuration.
+
+Run with: python -m benchmarks.bench_end_to_end [--requests N] [--rate R]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, cast
+
+from mexc_api.spot import AsyncSpot, Spot
+from mexc_api.testing import FakeMexcServer
+from mexc_api.websocket import AsyncWebsocketStreamClient, SpotWebsocketStreamClient
+
+KEY = "key"
+SECRET = "secret"
+
+
+def report_requests(name: str, latencies: list[float], seconds: float) -> None:
+    """Prints the request rate and latency percentiles."""
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<32} {len(latencies) / seconds:9.0f} req/s"
+        f"   p50 {quantiles[49] * 1e3:7.2f} ms   p99 {quantiles[98] * 1e3:7.2f} ms"
+    )
+
+
+def report_messages(name: str, messages: int, seconds: float) -> None:
+    """Prints the message rate."""
+    print(f"{name:<32} {messages / seconds:9.0f} msg/s")
+
+
+def timed(request: Callable[[], object]) -> float:
+    """Returns the duration of one request."""
+    started = time.perf_counter()
+    request()
+    return time.perf_counter() - started
+
+
+def bench_sync(
+    name: str, request: Callable[[], object], count: int, threads: int = 1
+) -> None:
+    """Sends count requests from a number of threads."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        latencies = list(executor.map(lambda _: timed(request), range(count)))
+    report_requests(name, latencies, time.perf_counter() - started)
+
+
+async def bench_async(
+    name: str, request: Callable[[], Awaitable[Any]], count: int, concurrency: int
+) -> None:
+    """Sends count requests with at most concurrency in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed_request() -> float:
+        async with semaphore:
+            started = time.perf_counter()
+            await request()
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(timed_request() for _ in range(count)))
+    report_requests(name, list(latencies), time.perf_counter() - started)
+
+
+def bench_websocket(server: FakeMexcServer, duration: float) -> None:
+    """Counts the messages of the threaded client."""
+    messages = 0
+
+    def on_message(_message: object) -> None:
+        nonlocal messages
+        messages += 1
+
+    client = SpotWebsocketStreamClient(
+        KEY, SECRET, on_message, url=server.ws_url, base_url=server.base_url
+    )
+    with client.batch():
+        for symbol in server.markets:
+            client.trades(symbol)
+            client.diff_depth(symbol)
+    time.sleep(0.5)
+    messages = 0
+    time.sleep(duration)
+    report_messages(f"threaded ws, {len(client.streams)} streams", messages, duration)
+    client.stop()
+
+
+async def bench_async_websocket(server: FakeMexcServer, duration: float) -> None:
+    """Counts the messages of the asyncio client."""
+    async with AsyncWebsocketStreamClient(
+        KEY, SECRET, url=server.ws_url, base_url=server.base_url
+    ) as client:
+        for symbol in server.markets:
+            client.trades(symbol)
+            client.diff_depth(symbol)
+
+        messages = 0
+        started = time.perf_counter()
+        async for _ in client:
+            if not messages:
+                started = time.perf_counter()
+            messages += 1
+            if time.perf_counter() - started >= duration:
+                break
+        report_messages(
+            f"async ws, {len(client.streams)} streams",
+            messages,
+            time.perf_counter() - started,
+        )
+
+
+async def bench_async_rest(server: FakeMexcServer, count: int) -> None:
+    """Runs the AsyncSpot benchmarks."""
+    async with AsyncSpot(KEY, SECRET, base_url=server.base_url) as spot:
+        await bench_async("async server_time x50", spot.market.server_time, count, 50)
+        # Inherited endpoints are typed as sync but return the coroutine.
+        get_account_info = cast(
+            Callable[[], Awaitable[Any]], spot.account.get_account_info
+        )
+        await bench_async("async account info x50", get_account_info, count, 50)
+
+
+def main() -> None:
+    """Runs all benchmarks."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=1000.0)
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+
+    with FakeMexcServer(KEY, SECRET, rate=args.rate) as server:
+        spot = Spot(KEY, SECRET, base_url=server.base_url)
+        bench_sync("sync server_time", spot.market.server_time, args.requests)
+        bench_sync("sync account info", spot.account.get_account_info, args.requests)
+        bench_sync(
+            "sync server_time x8 threads", spot.market.server_time, args.requests, 8
+        )
+        asyncio.run(bench_async_rest(server, args.requests))
+        bench_websocket(server, args.duration)
+        asyncio.run(bench_async_websocket(server, args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Compares the size and decode time of the json and protobuf trade streams.
+
+Run with: python -m benchmarks.bench_protobuf
+"""
+import json
+import timeit
+from typing import Callable
+
+from benchmarks.frames import DEALS, JSON_FRAME
+from mexc_api.websocket.protobuf import PushDataV3ApiWrapper, decode
+
+
+def protobuf_frame() -> bytes:
+    """Returns the same trades as a protobuf frame."""
+    wrapper = PushDataV3ApiWrapper(
+        channel="spot@public.aggre.deals.v3.api.pb@100ms@BTCUSDT",
+        symbol="BTCUSDT",
+        sendTime=1700000000001,
+    )
+    wrapper.publicAggreDeals.eventType = "spot@public.aggre.deals.v3.api.pb@100ms"
+    for index in range(DEALS):
+        wrapper.publicAggreDeals.deals.add(
+            price="64123.45", quantity="0.0123", tradeType=1, time=1700000000000 + index
+        )
+    return wrapper.SerializeToString()
+
+
+def report(name: str, statement: Callable[[], object], number: int = 100_000) -> None:
+    """Prints the time per call of a statement."""
+    seconds = min(timeit.repeat(statement, number=number, repeat=5))
+    print(f"{name:<24} {seconds / number * 1e9:8.0f} ns")
+
+
+PROTOBUF_FRAME = protobuf_frame()
+
+if __name__ == "__main__":
+    print(f"json frame      {len(JSON_FRAME.encode()):5d} bytes")
+    print(f"protobuf frame  {len(PROTOBUF_FRAME):5d} bytes")
+    report("json.loads", lambda: json.loads(JSON_FRAME))
+    report("protobuf decode", lambda: decode(PROTOBUF_FRAME))
+    report(
+        "json.loads + prices",
+        lambda: [deal["p"] for deal in json.loads(JSON_FRAME)["d"]["deals"]],
+    )
+    report(
+        "protobuf decode + prices",
+        lambda: [deal.price for deal in decode(PROTOBUF_FRAME).publicAggreDeals.deals],
+    )
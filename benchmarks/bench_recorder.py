@@ -0,0 +1,38 @@
+"""
+Measures the recording cost per frame and the replay rate of a recorded log.
+
+Run with: python -m benchmarks.bench_recorder
+"""
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.frames import JSON_FRAME
+from mexc_api.websocket.recorder import Recorder, Replayer
+
+FRAMES = 1_000_000
+
+
+def main() -> None:
+    """Records and replays FRAMES trade frames."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "trades.log"
+        recorder = Recorder(path)
+        started = time.perf_counter()
+        for _ in range(FRAMES):
+            recorder.record(JSON_FRAME)
+        recorded = time.perf_counter() - started
+        recorder.close()
+
+        replayer = Replayer(path)
+        started = time.perf_counter()
+        count = replayer.replay(lambda frame: None)
+        replayed = time.perf_counter() - started
+
+        print(f"record          {recorded / FRAMES * 1e9:8.0f} ns per frame")
+        print(f"replay          {count / replayed / 1e6:8.2f} M frames per second")
+        print(f"log size        {path.stat().st_size / FRAMES:8.1f} bytes per frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Defines the stream frames shared by the benchmarks."""
+import json
+
+DEALS = 5
+
+
+def json_frame() -> str:
+    """Returns a json trade frame."""
+    return json.dumps(
+        {
+            "c": "spot@public.deals.v3.api@BTCUSDT",
+            "d": {
+                "deals": [
+                    {"S": 1, "p": "64123.45", "t": 1700000000000 + index, "v": "0.0123"}
+                    for index in range(DEALS)
+                ],
+                "e": "spot@public.deals.v3.api",
+            },
+            "s": "BTCUSDT",
+            "t": 1700000000001,
+        }
+    )
+
+
+JSON_FRAME = json_frame()
@@ -1,17 +1,31 @@
 """Defines the Api class."""
 import hashlib
 import hmac
-from typing import Any
-
-from requests import Session
+import re
+import time
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Mapping
+from urllib.parse import quote
 
 from .enums import Method
 from .exceptions import MexcAPIError
+from .instrumentation import Instrumentation, RequestEvent, get_used_weight
+from .rate_limiter import RateLimiter, get_weight
+from .response_cache import ResponseCache
 from .utils import get_timestamp
 
+if TYPE_CHECKING:
+    from requests import Response
+
+# Finds a character that has to be quoted in a parameter value.
+_find_unsafe = re.compile(r"[^\w.~,-]", re.ASCII).search
 
-class Api:
-    """Defines a base api class."""
+
+class BaseApi:
+    """
+    Defines the request building shared by the sync and async api classes.
+    Subclasses only implement the transport in send_request.
+    """
 
     def __init__(
         self,
@@ -19,54 +33,271 @@ class Api:
         api_secret: str,
         base_url: str = "https://api.mexc.com",
         recv_window: int = 5000,
+        rate_limiter: RateLimiter | None = None,
+        max_retries: int = 3,
+        instrumentation: Instrumentation | None = None,
+        cache: ResponseCache | None = None,
     ) -> None:
         self.api_key = api_key
         self.api_secret = api_secret
+        self._hmac = hmac.new(api_secret.encode("utf-8"), digestmod=hashlib.sha256)
 
         self.base_url = base_url
         self.recv_window = recv_window
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.instrumentation = instrumentation
+        self.cache = cache
 
-        self.session = Session()
-        self.session.headers.update(
-            {"Content-Type": "application/json", "X-MEXC-APIKEY": self.api_key}
-        )
+        self.headers = {
+            "Content-Type": "application/json",
+            "X-MEXC-APIKEY": self.api_key,
+        }
+
+    @staticmethod
+    def format_value(value: Any) -> str:
+        """
+        Returns a parameter value as url encoded string.
+        Enums are sent by value, booleans in lowercase and lists comma separated.
+        """
+        if isinstance(value, str):
+            if _find_unsafe(value) is None:
+                return value
+        elif isinstance(value, bool):
+            return "true" if value else "false"
+        elif isinstance(value, Enum):
+            value = str(value.value)
+        elif isinstance(value, (list, tuple)):
+            value = ",".join(
+                str(item.value) if isinstance(item, Enum) else str(item)
+                for item in value
+            )
+        else:
+            return str(value)
+        return quote(value, safe="-_.~,")
 
     def get_query(self, params: dict) -> str:
-        """Returns a query string of all given parameters."""
-        query = ""
-        for key, value in params.items():
-            query += f"{key}={value}&"
-        return query[:-1]
+        """Returns a url encoded query string of all given parameters."""
+        format_value = self.format_value
+        return "&".join(
+            [f"{key}={format_value(value)}" for key, value in params.items()]
+        )
 
     def get_signature(self, query: str) -> str:
-        """Returns the signature based on the api secret and the query."""
-        return hmac.new(
-            self.api_secret.encode("utf-8"), query.encode("utf-8"), hashlib.sha256
-        ).hexdigest()
+        """
+        Returns the signature based on the api secret and the query.
+        The hmac is keyed once and copied for every signature.
+        """
+        signature = self._hmac.copy()
+        signature.update(query.encode("utf-8"))
+        return signature.hexdigest()
 
     def remove_none_params(self, params: dict) -> dict:
         """Returns a dict without empty parameter values."""
         return {k: v for k, v in params.items() if v is not None}
 
+    def prepare_query(self, params: dict, sign: bool = False) -> str:
+        """
+        Returns the query string that will be sent with the request.
+        RecvWindow, timestamp and signature are added when sign is true,
+        the signature is computed over exactly the query that is sent.
+        """
+        query = self.get_query(self.remove_none_params(params))
+
+        if sign:
+            query += f"{'&' if query else ''}recvWindow={self.recv_window}"
+            query += f"&timestamp={get_timestamp()}"
+            query += f"&signature={self.get_signature(query)}"
+        return query
+
+    def get_url(self, endpoint: str, query: str) -> str:
+        """Returns the url of an endpoint with the query string."""
+        if query:
+            return f"{self.base_url}{endpoint}?{query}"
+        return self.base_url + endpoint
+
+    def should_retry(
+        self,
+        endpoint: str,
+        sign: bool,
+        status: int,
+        headers: Mapping[str, str],
+        attempt: int,
+    ) -> bool:
+        """
+        Returns true if a rate limited response should be retried.
+        The rate limiter is updated with every response, so the next
+        reservation waits for the limit and the used weight.
+        """
+        if self.rate_limiter is None:
+            return False
+        blocked = self.rate_limiter.update(endpoint, sign, status, headers)
+        return blocked > 0 and attempt < self.max_retries
+
+    def is_cached(self, method: Method, endpoint: str, sign: bool) -> bool:
+        """Returns if the response of a request is served by the cache."""
+        return (
+            self.cache is not None
+            and method is Method.GET
+            and not sign
+            and self.cache.is_cached(endpoint)
+        )
+
+    def create_event(
+        self,
+        method: Method,
+        endpoint: str,
+        params: dict,
+        sign: bool,
+        attempt: int,
+        url: str,
+    ) -> RequestEvent:
+        """Creates the event of a request and passes it to before_request."""
+        event = RequestEvent(
+            method, endpoint, sign, attempt, get_weight(method, endpoint, params)
+        )
+        event.request_bytes = len(url)
+        if self.instrumentation is not None:
+            self.instrumentation.before_request(event)
+        return event
+
+    def finish_event(
+        self,
+        event: RequestEvent,
+        started: float,
+        status: int,
+        headers: Mapping[str, str],
+        size: int,
+    ) -> None:
+        """Completes the event of a response and passes it to after_response."""
+        event.total = time.perf_counter() - started
+        event.status = status
+        event.response_bytes = size
+        event.used_weight = get_used_weight(headers)
+        if self.instrumentation is not None:
+            self.instrumentation.after_response(event)
+
+    def fail_event(
+        self, event: RequestEvent, started: float, error: BaseException
+    ) -> None:
+        """Completes the event of a failed request and passes it to on_error."""
+        event.total = time.perf_counter() - started
+        if self.instrumentation is not None:
+            self.instrumentation.on_error(event, error)
+
+    def send_request(
+        self, method: Method, endpoint: str, params: dict, sign: bool = False
+    ) -> Any:
+        """Sends a request with the given method to the given endpoint."""
+        raise NotImplementedError
+
+
+class Api(BaseApi):
+    """
+    Defines a base api class.
+    Requests is imported when the first Api is created, so importing the
+    package does not load the http stack.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        base_url: str = "https://api.mexc.com",
+        recv_window: int = 5000,
+        rate_limiter: RateLimiter | None = None,
+        max_retries: int = 3,
+        instrumentation: Instrumentation | None = None,
+        cache: ResponseCache | None = None,
+    ) -> None:
+        super().__init__(
+            api_key,
+            api_secret,
+            base_url,
+            recv_window,
+            rate_limiter,
+            max_retries,
+            instrumentation,
+            cache,
+        )
+
+        from requests import Session  # pylint: disable=import-outside-toplevel
+
+        self.session = Session()
+        self.session.headers.update(self.headers)
+
     def send_request(
         self, method: Method, endpoint: str, params: dict, sign: bool = False
     ) -> Any:
         """
         Sends a request with the given method to the given endpoint.
         RecvWindow, timestamp and signature are added to the parameters.
+        Blocks until the request fits in the rate limit when a limiter is set.
+
+        Unsigned GETs of cached endpoints are served by the cache when set.
 
         Throws an MexcAPIError if the response has an error.
         Returns the json encoded content of the response.
         """
-        params = self.remove_none_params(params)
+        if self.cache is not None and self.is_cached(method, endpoint, sign):
+            return self.cache.fetch(
+                endpoint,
+                self.prepare_query(params),
+                params,
+                lambda: self._send_request(method, endpoint, params, sign),
+            )
+        return self._send_request(method, endpoint, params, sign)
 
-        if sign:
-            params["recvWindow"] = self.recv_window
-            params["timestamp"] = get_timestamp()
-            params["signature"] = self.get_signature(self.get_query(params))
-        response = self.session.request(method.value, self.base_url + endpoint, params)
+    def _send_request(
+        self, method: Method, endpoint: str, params: dict, sign: bool
+    ) -> Any:
+        """Sends a request, retrying rate limited responses."""
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire(method, endpoint, params, sign)
+
+            url = self.get_url(endpoint, self.prepare_query(params, sign))
+            if self.instrumentation is None:
+                response = self.session.request(method.value, url)
+            else:
+                response = self._send_instrumented(
+                    method, endpoint, params, sign, attempt, url
+                )
+            if not self.should_retry(
+                endpoint, sign, response.status_code, response.headers, attempt
+            ):
+                break
+            attempt += 1
 
         if not response.ok:
             raise MexcAPIError(response.status_code, response.json().get("msg"))
 
         return response.json()
+
+    def _send_instrumented(
+        self,
+        method: Method,
+        endpoint: str,
+        params: dict,
+        sign: bool,
+        attempt: int,
+        url: str,
+    ) -> "Response":
+        """
+        Sends a request and passes its event to the instrumentation.
+        Requests only reports the time until the headers are parsed as ttfb.
+        """
+        event = self.create_event(method, endpoint, params, sign, attempt, url)
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method.value, url)
+        except Exception as error:
+            self.fail_event(event, started, error)
+            raise
+
+        event.ttfb = response.elapsed.total_seconds()
+        self.finish_event(
+            event, started, response.status_code, response.headers, len(response.content)
+        )
+        return response
@@ -0,0 +1,198 @@
+"""Defines the AsyncApi class."""
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any
+
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore[assignment]
+
+from .api import BaseApi
+from .enums import Method
+from .exceptions import MexcAPIError
+from .instrumentation import Instrumentation
+from .rate_limiter import RateLimiter
+from .response_cache import ResponseCache
+
+
+async def _on_request_start(
+    _session: Any, context: SimpleNamespace, _params: Any
+) -> None:
+    context.started = time.perf_counter()
+
+
+async def _on_dns_start(_session: Any, context: SimpleNamespace, _params: Any) -> None:
+    context.dns_started = time.perf_counter()
+
+
+async def _on_dns_end(_session: Any, context: SimpleNamespace, _params: Any) -> None:
+    context.trace_request_ctx.dns = time.perf_counter() - context.dns_started
+
+
+async def _on_connect_start(
+    _session: Any, context: SimpleNamespace, _params: Any
+) -> None:
+    context.connect_started = time.perf_counter()
+
+
+async def _on_connect_end(
+    _session: Any, context: SimpleNamespace, _params: Any
+) -> None:
+    context.trace_request_ctx.connect = time.perf_counter() - context.connect_started
+
+
+async def _on_request_end(
+    _session: Any, context: SimpleNamespace, _params: Any
+) -> None:
+    context.trace_request_ctx.ttfb = time.perf_counter() - context.started
+
+
+def _create_trace_config() -> "aiohttp.TraceConfig":
+    """Returns a trace config that writes the timings to the request event."""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_dns_resolvehost_start.append(_on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_end)
+    trace_config.on_connection_create_start.append(_on_connect_start)
+    trace_config.on_connection_create_end.append(_on_connect_end)
+    trace_config.on_request_end.append(_on_request_end)
+    return trace_config
+
+
+class AsyncApi(BaseApi):
+    """
+    Defines an asyncio api class.
+    All requests share one pooled aiohttp session, which is created on first use.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        base_url: str = "https://api.mexc.com",
+        recv_window: int = 5000,
+        rate_limiter: RateLimiter | None = None,
+        max_retries: int = 3,
+        max_connections: int = 100,
+        instrumentation: Instrumentation | None = None,
+        cache: ResponseCache | None = None,
+    ) -> None:
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncApi requires aiohttp, install it with 'pip install mexc-api[async]'."
+            )
+        super().__init__(
+            api_key,
+            api_secret,
+            base_url=base_url,
+            recv_window=recv_window,
+            rate_limiter=rate_limiter,
+            max_retries=max_retries,
+            instrumentation=instrumentation,
+            cache=cache,
+        )
+
+        self.max_connections = max_connections
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> "aiohttp.ClientSession":
+        """
+        Returns the aiohttp session, creating it when needed.
+        With instrumentation the session traces the request timings.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                trace_configs=(
+                    [_create_trace_config()] if self.instrumentation else None
+                ),
+            )
+        return self._session
+
+    async def send_request(  # pylint: disable=invalid-overridden-method
+        self, method: Method, endpoint: str, params: dict, sign: bool = False
+    ) -> Any:
+        """
+        Sends a request with the given method to the given endpoint.
+        RecvWindow, timestamp and signature are added to the parameters.
+        Waits until the request fits in the rate limit when a limiter is set.
+
+        Unsigned GETs of cached endpoints are served by the cache when set.
+
+        Throws an MexcAPIError if the response has an error.
+        Returns the json encoded content of the response.
+        """
+        if self.cache is not None and self.is_cached(method, endpoint, sign):
+            return await self.cache.fetch_async(
+                endpoint,
+                self.prepare_query(params),
+                params,
+                lambda: self._send_request(method, endpoint, params, sign),
+            )
+        return await self._send_request(method, endpoint, params, sign)
+
+    async def _send_request(
+        self, method: Method, endpoint: str, params: dict, sign: bool
+    ) -> Any:
+        """Sends a request, retrying rate limited responses."""
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                wait = self.rate_limiter.reserve(method, endpoint, params, sign)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+            url = self.get_url(endpoint, self.prepare_query(params, sign))
+            if self.instrumentation is None:
+                async with self.session.request(
+                    method.value, URL(url, encoded=True)
+                ) as response:
+                    content = await response.json(content_type=None)
+            else:
+                response, content = await self._send_instrumented(
+                    method, endpoint, params, sign, attempt, url
+                )
+
+            if not self.should_retry(
+                endpoint, sign, response.status, response.headers, attempt
+            ):
+                if response.ok:
+                    return content
+                raise MexcAPIError(response.status, content.get("msg"))
+            attempt += 1
+
+    async def _send_instrumented(
+        self,
+        method: Method,
+        endpoint: str,
+        params: dict,
+        sign: bool,
+        attempt: int,
+        url: str,
+    ) -> tuple["aiohttp.ClientResponse", Any]:
+        """Sends a request and passes its event to the instrumentation."""
+        event = self.create_event(method, endpoint, params, sign, attempt, url)
+        started = time.perf_counter()
+        try:
+            async with self.session.request(
+                method.value, URL(url, encoded=True), trace_request_ctx=event
+            ) as response:
+                body = await response.read()
+                content = await response.json(content_type=None)
+        except Exception as error:
+            self.fail_event(event, started, error)
+            raise
+
+        self.finish_event(event, started, response.status, response.headers, len(body))
+        return response, content
+
+    async def close(self) -> None:
+        """Closes the aiohttp session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
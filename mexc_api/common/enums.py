@@ -70,3 +70,12 @@ class AccountType(Enum):
 
     SPOT = "SPOT"
     FUTURES = "FUTURES"
+
+
+class OverflowPolicy(Enum):
+    """What a full dispatcher queue does with a new message."""
+
+    BLOCK = "BLOCK"
+    DROP_NEWEST = "DROP_NEWEST"
+    DROP_OLDEST = "DROP_OLDEST"
+    CONFLATE = "CONFLATE"
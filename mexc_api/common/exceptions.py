@@ -3,3 +3,7 @@
 
 class MexcAPIError(Exception):
     """Default exception."""
+
+
+class MexcValidationError(MexcAPIError):
+    """Raised when an order is rejected locally before it is sent."""
@@ -0,0 +1,231 @@
+"""Defines the request instrumentation hooks and the HistogramCollector."""
+from bisect import bisect_left
+from threading import Lock
+from typing import Mapping
+
+from .enums import Method
+
+# Headers with the weight used in the current window, the first one sent is used.
+USED_WEIGHT_HEADERS = ("X-MBX-USED-WEIGHT-1M", "X-MEXC-USED-WEIGHT", "X-USED-WEIGHT")
+
+# Upper bounds in seconds of the latency histogram buckets.
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def get_used_weight(headers: Mapping[str, str]) -> int | None:
+    """Returns the used weight reported by the response headers, None if malformed."""
+    for name in USED_WEIGHT_HEADERS:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+
+class RequestEvent:
+    """
+    Describes one attempt of a request.
+    Timings are in seconds, dns, connect and ttfb are None when the
+    transport does not report them.
+    """
+
+    __slots__ = (
+        "method",
+        "endpoint",
+        "sign",
+        "attempt",
+        "weight",
+        "request_bytes",
+        "response_bytes",
+        "status",
+        "used_weight",
+        "dns",
+        "connect",
+        "ttfb",
+        "total",
+    )
+
+    def __init__(
+        self, method: Method, endpoint: str, sign: bool, attempt: int, weight: int
+    ) -> None:
+        self.method = method
+        self.endpoint = endpoint
+        self.sign = sign
+        self.attempt = attempt
+        self.weight = weight
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.status: int | None = None
+        self.used_weight: int | None = None
+        self.dns: float | None = None
+        self.connect: float | None = None
+        self.ttfb: float | None = None
+        self.total: float | None = None
+
+
+class Instrumentation:
+    """
+    Receives the events of the requests of an api.
+    Subclass it and override the hooks that are needed.
+    """
+
+    def before_request(self, event: RequestEvent) -> None:
+        """Called before a request is sent."""
+
+    def after_response(self, event: RequestEvent) -> None:
+        """Called when a response is received, also for error statuses."""
+
+    def on_error(self, event: RequestEvent, error: BaseException) -> None:
+        """Called when a request fails without a response."""
+
+
+class _Histogram:
+    """A cumulative latency histogram."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Adds a value."""
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+def _labels(**labels: object) -> str:
+    """Returns a prometheus label set."""
+    return ",".join(f'{name}="{value}"' for name, value in labels.items())
+
+
+class HistogramCollector(Instrumentation):
+    """
+    Collects the latency, weight, bytes and status counts per endpoint.
+    export returns the metrics in the Prometheus text format.
+    """
+
+    def __init__(self, prefix: str = "mexc") -> None:
+        self.prefix = prefix
+        self.latency: dict[tuple[str, str], _Histogram] = {}
+        self.ttfb: dict[tuple[str, str], _Histogram] = {}
+        self.responses: dict[tuple[str, str, int], int] = {}
+        self.errors: dict[tuple[str, str, str], int] = {}
+        self.weight: dict[tuple[str, str], int] = {}
+        self.request_bytes: dict[tuple[str, str], int] = {}
+        self.response_bytes: dict[tuple[str, str], int] = {}
+        self.throttled = 0
+        self.used_weight: int | None = None
+        self._lock = Lock()
+
+    def after_response(self, event: RequestEvent) -> None:
+        key = (event.method.value, event.endpoint)
+        with self._lock:
+            if key not in self.latency:
+                self.latency[key] = _Histogram()
+                self.ttfb[key] = _Histogram()
+            if event.total is not None:
+                self.latency[key].observe(event.total)
+            if event.ttfb is not None:
+                self.ttfb[key].observe(event.ttfb)
+
+            status_key = (*key, event.status or 0)
+            self.responses[status_key] = self.responses.get(status_key, 0) + 1
+            self.weight[key] = self.weight.get(key, 0) + event.weight
+            self.request_bytes[key] = (
+                self.request_bytes.get(key, 0) + event.request_bytes
+            )
+            self.response_bytes[key] = (
+                self.response_bytes.get(key, 0) + event.response_bytes
+            )
+            if event.status in (418, 429):
+                self.throttled += 1
+            if event.used_weight is not None:
+                self.used_weight = event.used_weight
+
+    def on_error(self, event: RequestEvent, error: BaseException) -> None:
+        error_key = (event.method.value, event.endpoint, type(error).__name__)
+        with self._lock:
+            self.errors[error_key] = self.errors.get(error_key, 0) + 1
+
+    def _export_histogram(
+        self, lines: list[str], name: str, histograms: dict[tuple[str, str], _Histogram]
+    ) -> None:
+        """Adds the lines of a histogram metric."""
+        lines.append(f"# TYPE {name} histogram")
+        for (method, endpoint), histogram in histograms.items():
+            labels = _labels(method=method, endpoint=endpoint)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.total}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+    def _export_counter(
+        self, lines: list[str], name: str, names: tuple[str, ...], values: dict
+    ) -> None:
+        """Adds the lines of a counter metric."""
+        lines.append(f"# TYPE {name} counter")
+        for key, value in values.items():
+            lines.append(f"{name}{{{_labels(**dict(zip(names, key)))}}} {value}")
+
+    def export(self) -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        prefix = self.prefix
+        lines: list[str] = []
+        with self._lock:
+            self._export_histogram(
+                lines, f"{prefix}_request_duration_seconds", self.latency
+            )
+            self._export_histogram(lines, f"{prefix}_request_ttfb_seconds", self.ttfb)
+            self._export_counter(
+                lines,
+                f"{prefix}_responses_total",
+                ("method", "endpoint", "status"),
+                self.responses,
+            )
+            self._export_counter(
+                lines,
+                f"{prefix}_request_errors_total",
+                ("method", "endpoint", "error"),
+                self.errors,
+            )
+            self._export_counter(
+                lines, f"{prefix}_request_weight_total", ("method", "endpoint"), self.weight
+            )
+            self._export_counter(
+                lines,
+                f"{prefix}_request_bytes_total",
+                ("method", "endpoint"),
+                self.request_bytes,
+            )
+            self._export_counter(
+                lines,
+                f"{prefix}_response_bytes_total",
+                ("method", "endpoint"),
+                self.response_bytes,
+            )
+            lines.append(f"# TYPE {prefix}_throttled_total counter")
+            lines.append(f"{prefix}_throttled_total {self.throttled}")
+            if self.used_weight is not None:
+                lines.append(f"# TYPE {prefix}_used_weight gauge")
+                lines.append(f"{prefix}_used_weight {self.used_weight}")
+        return "\n".join(lines) + "\n"
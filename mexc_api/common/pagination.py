@@ -0,0 +1,234 @@
+"""
+Defines the WindowPaginator and PagePaginator classes.
+Asyncio is imported by the async iterators, so sync use does not load it.
+"""
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Iterator
+
+if TYPE_CHECKING:
+    import asyncio
+
+DAY_MS = 86_400_000
+
+# Keys of the item list in the responses of paged endpoints.
+ITEM_KEYS = ("data", "rows", "resultList", "list")
+
+
+def get_items(response: Any) -> list:
+    """Returns the items of a list or paged response."""
+    if isinstance(response, list):
+        return response
+    if isinstance(response, dict):
+        for key in ITEM_KEYS:
+            items = response.get(key)
+            if isinstance(items, list):
+                return items
+    return []
+
+
+def split_range(start_ms: int, end_ms: int, span_ms: int) -> list[tuple[int, int]]:
+    """Splits a time range in windows of at most span_ms."""
+    return [
+        (window_start, min(window_start + span_ms, end_ms))
+        for window_start in range(start_ms, end_ms, span_ms)
+    ]
+
+
+class WindowPaginator:
+    """
+    Iterates lazily over the items of a time range of a list endpoint.
+
+    The range is split in windows of at most max_span_ms. fetch is called
+    with the start, the inclusive end and the limit of a window. A window
+    that returns limit items may be truncated, so it is split in halves
+    which are fetched instead. Items are yielded in window order.
+
+    With prefetch the next windows are fetched concurrently, by threads
+    with `for` and by tasks with `async for` when fetch returns coroutines.
+    At most prefetch + 1 windows are in flight.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[int, int, int], Any],
+        start_ms: int,
+        end_ms: int,
+        max_span_ms: int,
+        limit: int,
+        prefetch: int = 0,
+    ) -> None:
+        self.fetch = fetch
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.max_span_ms = max_span_ms
+        self.limit = limit
+        self.prefetch = prefetch
+        self.requests = 0
+
+    def _split_full(self, window: tuple[int, int], items: list) -> list:
+        """Returns the halves of a window that may be truncated."""
+        start_ms, end_ms = window
+        if len(items) < self.limit or end_ms - start_ms < 2:
+            return []
+        middle = (start_ms + end_ms) // 2
+        return [(start_ms, middle), (middle, end_ms)]
+
+    def _fetch(self, window: tuple[int, int]) -> list:
+        """Fetches the items of a window."""
+        self.requests += 1
+        return get_items(self.fetch(window[0], window[1] - 1, self.limit))
+
+    async def _fetch_async(self, window: tuple[int, int]) -> list:
+        """Fetches the items of a window with a coroutine."""
+        self.requests += 1
+        response = self.fetch(window[0], window[1] - 1, self.limit)
+        return get_items(await response)
+
+    def _submit(
+        self, executor: ThreadPoolExecutor | None, window: tuple[int, int]
+    ) -> Future:
+        """Fetches a window with the executor or directly without one."""
+        if executor is not None:
+            return executor.submit(self._fetch, window)
+        future: Future = Future()
+        future.set_result(self._fetch(window))
+        return future
+
+    def __iter__(self) -> Iterator:
+        windows = deque(split_range(self.start_ms, self.end_ms, self.max_span_ms))
+        executor = (
+            ThreadPoolExecutor(self.prefetch, thread_name_prefix="Mexc pagination")
+            if self.prefetch
+            else None
+        )
+        pending: deque[tuple[tuple[int, int], Future]] = deque()
+        try:
+            while windows or pending:
+                while windows and len(pending) <= self.prefetch:
+                    window = windows.popleft()
+                    pending.append((window, self._submit(executor, window)))
+
+                window, future = pending.popleft()
+                items = future.result()
+                halves = self._split_full(window, items)
+                if halves:
+                    for half in reversed(halves):
+                        pending.appendleft((half, self._submit(executor, half)))
+                    continue
+                yield from items
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aiter__(self) -> AsyncIterator:
+        import asyncio  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        windows = deque(split_range(self.start_ms, self.end_ms, self.max_span_ms))
+        pending: deque[tuple[tuple[int, int], "asyncio.Task"]] = deque()
+        try:
+            while windows or pending:
+                while windows and len(pending) <= self.prefetch:
+                    window = windows.popleft()
+                    task = asyncio.create_task(self._fetch_async(window))
+                    pending.append((window, task))
+
+                window, task = pending.popleft()
+                items = await task
+                halves = self._split_full(window, items)
+                if halves:
+                    for half in reversed(halves):
+                        task = asyncio.create_task(self._fetch_async(half))
+                        pending.appendleft((half, task))
+                    continue
+                for item in items:
+                    yield item
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+
+class PagePaginator:
+    """
+    Iterates lazily over the items of a paged endpoint.
+
+    fetch is called with the page number and page_size, or only with the
+    page number when page_size is None. Iteration stops after the first
+    page with fewer than page_size items, or the first empty page.
+    With prefetch the next pages are fetched concurrently, pages after the
+    last one are discarded.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[..., Any],
+        page_size: int | None = None,
+        prefetch: int = 0,
+        first_page: int = 1,
+    ) -> None:
+        self.fetch = fetch
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.first_page = first_page
+        self.requests = 0
+
+    def _call(self, page: int) -> Any:
+        """Calls fetch for a page."""
+        self.requests += 1
+        if self.page_size is None:
+            return self.fetch(page)
+        return self.fetch(page, self.page_size)
+
+    def _is_last(self, items: list) -> bool:
+        """Returns if no page follows a page with items."""
+        return not items or (self.page_size is not None and len(items) < self.page_size)
+
+    def __iter__(self) -> Iterator:
+        executor = (
+            ThreadPoolExecutor(self.prefetch, thread_name_prefix="Mexc pagination")
+            if self.prefetch
+            else None
+        )
+        pending: deque[Future] = deque()
+        page = self.first_page
+        try:
+            while True:
+                while len(pending) <= self.prefetch:
+                    if executor is not None:
+                        pending.append(executor.submit(self._call, page))
+                    else:
+                        pending.append(Future())
+                        pending[-1].set_result(self._call(page))
+                    page += 1
+
+                items = get_items(pending.popleft().result())
+                yield from items
+                if self._is_last(items):
+                    return
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aiter__(self) -> AsyncIterator:
+        import asyncio  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        async def fetch_page(page: int) -> Any:
+            response: Awaitable = self._call(page)
+            return await response
+
+        pending: deque["asyncio.Task"] = deque()
+        page = self.first_page
+        try:
+            while True:
+                while len(pending) <= self.prefetch:
+                    pending.append(asyncio.create_task(fetch_page(page)))
+                    page += 1
+
+                items = get_items(await pending.popleft())
+                for item in items:
+                    yield item
+                if self._is_last(items):
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,192 @@
+"""Defines the RateLimiter class."""
+import time
+from threading import Lock
+from typing import Mapping
+
+from .enums import Method
+from .instrumentation import get_used_weight
+
+# MEXC gives every endpoint an independent budget of 500 weight per 10 seconds,
+# counted per ip for public endpoints and per uid for signed endpoints.
+LIMIT = 500
+INTERVAL = 10.0
+
+ENDPOINT_WEIGHTS: dict[tuple[Method, str], int] = {
+    # market
+    (Method.GET, "/api/v3/ping"): 1,
+    (Method.GET, "/api/v3/time"): 1,
+    (Method.GET, "/api/v3/defaultSymbols"): 1,
+    (Method.GET, "/api/v3/exchangeInfo"): 10,
+    (Method.GET, "/api/v3/depth"): 1,
+    (Method.GET, "/api/v3/trades"): 5,
+    (Method.GET, "/api/v3/aggTrades"): 1,
+    (Method.GET, "/api/v3/klines"): 1,
+    (Method.GET, "/api/v3/avgPrice"): 1,
+    (Method.GET, "/api/v3/ticker/24hr"): 1,
+    (Method.GET, "/api/v3/ticker/price"): 1,
+    (Method.GET, "/api/v3/ticker/bookTicker"): 1,
+    # account
+    (Method.POST, "/api/v3/order/test"): 1,
+    (Method.POST, "/api/v3/order"): 1,
+    (Method.POST, "/api/v3/batchOrders"): 1,
+    (Method.DELETE, "/api/v3/order"): 1,
+    (Method.DELETE, "/api/v3/openOrders"): 1,
+    (Method.GET, "/api/v3/order"): 2,
+    (Method.GET, "/api/v3/openOrders"): 3,
+    (Method.GET, "/api/v3/allOrders"): 10,
+    (Method.GET, "/api/v3/account"): 10,
+    (Method.GET, "/api/v3/myTrades"): 10,
+    (Method.POST, "/api/v3/mxDeduct/enable"): 1,
+    (Method.GET, "/api/v3/mxDeduct/enable"): 1,
+    # wallet
+    (Method.GET, "/api/v3/capital/config/getall"): 10,
+    (Method.POST, "/api/v3/capital/withdraw/apply"): 1,
+    (Method.DELETE, "/api/v3/capital/withdraw"): 1,
+    (Method.GET, "/api/v3/capital/deposit/hisrec"): 1,
+    (Method.GET, "/api/v3/capital/withdraw/history"): 1,
+    (Method.POST, "/api/v3/capital/deposit/address"): 1,
+    (Method.GET, "/api/v3/capital/deposit/address"): 10,
+    (Method.GET, "/api/v3/capital/withdraw/address"): 10,
+    (Method.POST, "/api/v3/capital/transfer"): 1,
+    (Method.GET, "/api/v3/capital/transfer"): 1,
+    (Method.GET, "/api/v3/capital/transfer/tranId"): 1,
+    (Method.GET, "/api/v3/capital/convert/list"): 1,
+    (Method.POST, "/api/v3/capital/convert"): 10,
+    (Method.GET, "/api/v3/capital/convert"): 1,
+}
+
+# Weights of the ticker endpoints when no symbol is given.
+ALL_SYMBOLS_WEIGHTS: dict[tuple[Method, str], int] = {
+    (Method.GET, "/api/v3/ticker/24hr"): 40,
+    (Method.GET, "/api/v3/ticker/price"): 2,
+    (Method.GET, "/api/v3/ticker/bookTicker"): 2,
+}
+
+
+def get_weight(method: Method, endpoint: str, params: dict) -> int:
+    """Returns the request weight of an endpoint, 1 for unknown endpoints."""
+    if params.get("symbol") is None and (method, endpoint) in ALL_SYMBOLS_WEIGHTS:
+        return ALL_SYMBOLS_WEIGHTS[(method, endpoint)]
+    return ENDPOINT_WEIGHTS.get((method, endpoint), 1)
+
+
+class TokenBucket:
+    """
+    Token bucket that never allows more than limit weight in any interval.
+    The bucket holds a burst of burst * limit tokens and refills the rest
+    evenly over the interval.
+
+    Reservations may take the bucket below zero, the caller then has to wait
+    until the deficit is refilled. This queues callers in reservation order.
+    The bucket is not thread safe on its own, the RateLimiter guards it.
+    """
+
+    def __init__(
+        self, limit: int = LIMIT, interval: float = INTERVAL, burst: float = 0.1
+    ) -> None:
+        self.capacity = limit * burst
+        self.rate = limit * (1 - burst) / interval
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        """Adds the tokens refilled since the last update."""
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def reserve(self, weight: int) -> float:
+        """Reserves weight tokens and returns the seconds to wait before sending."""
+        self._refill()
+        self.tokens -= weight
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def block(self, seconds: float) -> None:
+        """
+        Blocks the bucket for at least the given amount of seconds
+        by moving the token deficit, so queued reservations keep their order.
+        """
+        self._refill()
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+    def sync(self, used: int) -> None:
+        """
+        Lowers the tokens to the weight the server reports as unused,
+        so at most limit - used weight is sent in the next interval.
+        """
+        self._refill()
+        self.tokens = min(self.tokens, self.capacity - used)
+
+
+class RateLimiter:
+    """
+    Client side rate limiter for the MEXC REST API.
+    Keeps a token bucket per endpoint, separate for unsigned (ip) and signed (uid)
+    requests. One instance can be shared by many threads and api instances.
+    """
+
+    def __init__(
+        self,
+        ip_limit: int = LIMIT,
+        uid_limit: int = LIMIT,
+        interval: float = INTERVAL,
+        burst: float = 0.1,
+    ) -> None:
+        self.ip_limit = ip_limit
+        self.uid_limit = uid_limit
+        self.interval = interval
+        self.burst = burst
+
+        self._buckets: dict[tuple[bool, str], TokenBucket] = {}
+        self._lock = Lock()
+
+    def _get_bucket(self, endpoint: str, sign: bool) -> TokenBucket:
+        """Returns the bucket of an endpoint, must be called with the lock held."""
+        bucket = self._buckets.get((sign, endpoint))
+        if bucket is None:
+            limit = self.uid_limit if sign else self.ip_limit
+            bucket = TokenBucket(limit, self.interval, self.burst)
+            self._buckets[(sign, endpoint)] = bucket
+        return bucket
+
+    def reserve(self, method: Method, endpoint: str, params: dict, sign: bool) -> float:
+        """Reserves the weight of a request and returns the seconds to wait."""
+        weight = get_weight(method, endpoint, params)
+        with self._lock:
+            return self._get_bucket(endpoint, sign).reserve(weight)
+
+    def acquire(self, method: Method, endpoint: str, params: dict, sign: bool) -> None:
+        """Blocks until the request can be sent within the limit."""
+        wait = self.reserve(method, endpoint, params, sign)
+        if wait > 0:
+            time.sleep(wait)
+
+    def update(
+        self, endpoint: str, sign: bool, status: int, headers: Mapping[str, str]
+    ) -> float:
+        """
+        Updates the limiter from a response.
+        A used weight header lowers the budget of the endpoint to the weight
+        the server reports as unused.
+        A 429 or 418 response blocks the endpoint for the Retry-After header
+        or a full interval when the header is missing.
+        Returns the seconds the endpoint is blocked.
+        """
+        used = get_used_weight(headers)
+        if used is not None:
+            with self._lock:
+                self._get_bucket(endpoint, sign).sync(used)
+
+        if status not in (418, 429):
+            return 0.0
+
+        try:
+            retry_after = float(headers.get("Retry-After", self.interval))
+        except ValueError:
+            retry_after = self.interval
+
+        with self._lock:
+            self._get_bucket(endpoint, sign).block(retry_after)
+        return retry_after
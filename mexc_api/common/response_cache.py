@@ -0,0 +1,246 @@
+"""Defines the ResponseCache class."""
+import time
+from collections import OrderedDict
+from threading import Event, Lock
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Mapping
+
+if TYPE_CHECKING:
+    import asyncio
+
+# Seconds a response stays fresh per endpoint, other endpoints are not cached.
+DEFAULT_TTLS = {
+    "/api/v3/exchangeInfo": 60.0,
+    "/api/v3/defaultSymbols": 60.0,
+    "/api/v3/ticker/24hr": 1.0,
+    "/api/v3/ticker/price": 1.0,
+    "/api/v3/ticker/bookTicker": 0.5,
+}
+
+# Endpoints whose single symbol response is an item of the all symbols response.
+TICKER_ENDPOINTS = frozenset(
+    ("/api/v3/ticker/24hr", "/api/v3/ticker/price", "/api/v3/ticker/bookTicker")
+)
+
+# Result of an async flight whose leader was cancelled, a waiter sends instead.
+_CANCELLED = object()
+
+
+class _Entry:
+    """A cached response with its expiry time."""
+
+    __slots__ = ("expires", "value", "index")
+
+    def __init__(self, expires: float, value: Any) -> None:
+        self.expires = expires
+        self.value = value
+        self.index: dict[str, Any] | None = None
+
+    def get_index(self, items: list) -> dict[str, Any]:
+        """Returns the items of the response by symbol, built on first use."""
+        if self.index is None:
+            self.index = {item["symbol"]: item for item in items}
+        return self.index
+
+
+class _Flight:
+    """A request in flight that other callers of the same key wait for."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class ResponseCache:
+    """
+    Caches the responses of unsigned GET requests for a ttl per endpoint.
+
+    Concurrent identical requests are sent once, the other callers wait for
+    the response of the first one. Single symbol ticker and exchange info
+    requests are served from a fresh all symbols response when there is one.
+    At most max_size responses are kept, the least recently used is evicted.
+
+    Cached responses are shared between callers and must not be modified.
+    """
+
+    def __init__(
+        self, ttls: Mapping[str, float] | None = None, max_size: int = 1024
+    ) -> None:
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+        self.derived = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._flights: dict[tuple[str, str], _Flight] = {}
+        self._async_flights: dict[tuple[str, str], "asyncio.Future"] = {}
+        self._lock = Lock()
+
+    def is_cached(self, endpoint: str) -> bool:
+        """Returns if the responses of an endpoint are cached."""
+        return endpoint in self.ttls
+
+    def _get_fresh(self, key: tuple[str, str], now: float) -> _Entry | None:
+        """Returns the entry of a key if it has not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _derive(self, endpoint: str, params: dict, now: float) -> Any:
+        """Returns a single symbol response from an all symbols response."""
+        symbol = params.get("symbol")
+        symbols = params.get("symbols")
+        if endpoint == "/api/v3/exchangeInfo":
+            wanted = [symbol] if symbol else symbols
+        elif endpoint in TICKER_ENDPOINTS and isinstance(symbol, str):
+            wanted = [symbol]
+        else:
+            return None
+
+        entry = self._get_fresh((endpoint, ""), now)
+        if entry is None or not wanted:
+            return None
+        if endpoint in TICKER_ENDPOINTS:
+            return entry.get_index(entry.value).get(wanted[0].upper())
+
+        index = entry.get_index(entry.value["symbols"])
+        items = [index.get(name.upper()) for name in wanted]
+        if None in items:
+            return None
+        return {**entry.value, "symbols": items}
+
+    def get(self, endpoint: str, query: str, params: dict) -> tuple[bool, Any]:
+        """Returns if a fresh response was found and the response."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._get_fresh((endpoint, query), now)
+            if entry is not None:
+                self.hits += 1
+                return True, entry.value
+            if query:
+                value = self._derive(endpoint, params, now)
+                if value is not None:
+                    self.derived += 1
+                    return True, value
+        return False, None
+
+    def put(self, endpoint: str, query: str, value: Any) -> None:
+        """Stores a response and evicts the least recently used ones."""
+        key = (endpoint, query)
+        with self._lock:
+            self._entries[key] = _Entry(time.monotonic() + self.ttls[endpoint], value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def fetch(
+        self, endpoint: str, query: str, params: dict, send: Callable[[], Any]
+    ) -> Any:
+        """
+        Returns a fresh response or the response of send.
+        Only one thread sends a request per key, the others wait for it.
+        """
+        found, value = self.get(endpoint, query, params)
+        if found:
+            return value
+
+        key = (endpoint, query)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = send()
+            self.put(endpoint, query, flight.value)
+            return flight.value
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def fetch_async(
+        self,
+        endpoint: str,
+        query: str,
+        params: dict,
+        send: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Returns a fresh response or the response of send.
+        Only one task sends a request per key, the others await it.
+        When that task is cancelled, one of the waiting tasks sends instead.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        key = (endpoint, query)
+        while True:
+            found, value = self.get(endpoint, query, params)
+            if found:
+                return value
+            future = self._async_flights.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            value = await asyncio.shield(future)
+            if value is not _CANCELLED:
+                return value
+
+        self.misses += 1
+        future = self._async_flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await send()
+            self.put(endpoint, query, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.set_result(_CANCELLED)
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            future.exception()
+            raise
+        finally:
+            del self._async_flights[key]
+
+    def clear(self) -> None:
+        """Removes all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Returns the hit, miss and eviction counts."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "derived": self.derived,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
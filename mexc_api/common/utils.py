@@ -1,7 +1,43 @@
 """Defines utils used in the package."""
 import time
+from datetime import datetime, timezone
+
+from .enums import Interval
+
+INTERVAL_MS = {
+    Interval.ONE_MIN: 60_000,
+    Interval.FIVE_MIN: 300_000,
+    Interval.FIFTEEN_MIN: 900_000,
+    Interval.THIRTY_MIN: 1_800_000,
+    Interval.SIXTY_MIN: 3_600_000,
+    Interval.FOUR_HOUR: 14_400_000,
+    Interval.EIGHT_HOUR: 28_800_000,
+    Interval.ONE_DAY: 86_400_000,
+    Interval.ONE_MONTH: 2_678_400_000,
+}
 
 
 def get_timestamp() -> int:
     """Returns the current timestamp in milliseconds."""
     return round(time.time() * 1000)
+
+
+def get_interval_ms(interval: Interval) -> int:
+    """
+    Returns the length of a kline interval in milliseconds.
+    Months are counted as 31 days.
+    """
+    return INTERVAL_MS[interval]
+
+
+def get_open_time(interval: Interval, timestamp: int) -> int:
+    """
+    Returns the open time in milliseconds of the kline containing a timestamp.
+    Monthly klines open on the first day of a calendar month in UTC.
+    """
+    if interval is Interval.ONE_MONTH:
+        date = datetime.fromtimestamp(timestamp / 1000, timezone.utc)
+        month_start = datetime(date.year, date.month, 1, tzinfo=timezone.utc)
+        return int(month_start.timestamp()) * 1000
+    interval_ms = INTERVAL_MS[interval]
+    return timestamp // interval_ms * interval_ms
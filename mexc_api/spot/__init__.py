@@ -1,22 +1,170 @@
-"""Defines the Spot class."""
+"""Defines the Spot and AsyncSpot classes."""
+from functools import cached_property
+from types import TracebackType
+from typing import Awaitable, cast
+
 from ..common.api import Api
+from ..common.instrumentation import Instrumentation
+from ..common.rate_limiter import RateLimiter
+from ..common.response_cache import ResponseCache
 from .endpoints._account import _Account
+from .endpoints._async import (
+    _AsyncAccount,
+    _AsyncMarket,
+    _AsyncRebate,
+    _AsyncSubAccount,
+    _AsyncWallet,
+)
 from .endpoints._etf import _Etf
 from .endpoints._market import _Market
 from .endpoints._rebate import _Rebate
 from .endpoints._sub_account import _SubAccount
 from .endpoints._wallet import _Wallet
+from .symbol_info import SymbolInfoStore
 
 
 class Spot:
-    """Class for handling the MEXC REST API."""
+    """
+    Class for handling the MEXC REST API.
+    The endpoint groups are created on first access.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        rate_limiter: RateLimiter | None = None,
+        base_url: str = "https://api.mexc.com",
+        instrumentation: Instrumentation | None = None,
+        cache: ResponseCache | None = None,
+    ) -> None:
+        self.api = Api(
+            api_key,
+            api_secret,
+            base_url,
+            rate_limiter=rate_limiter,
+            instrumentation=instrumentation,
+            cache=cache,
+        )
+
+    @cached_property
+    def market(self) -> _Market:
+        """Returns the market endpoints."""
+        return _Market(self.api)
+
+    @cached_property
+    def symbol_info(self) -> SymbolInfoStore:
+        """Returns the symbol info store, loaded from the market on first use."""
+        return SymbolInfoStore(self.market)
+
+    @cached_property
+    def account(self) -> _Account:
+        """Returns the account endpoints."""
+        return _Account(self.api, self.symbol_info)
+
+    @cached_property
+    def subaccount(self) -> _SubAccount:
+        """Returns the sub account endpoints."""
+        return _SubAccount(self.api)
+
+    @cached_property
+    def etf(self) -> _Etf:
+        """Returns the etf endpoints."""
+        return _Etf(self.api)
+
+    @cached_property
+    def rebate(self) -> _Rebate:
+        """Returns the rebate endpoints."""
+        return _Rebate(self.api)
+
+    @cached_property
+    def wallet(self) -> _Wallet:
+        """Returns the wallet endpoints."""
+        return _Wallet(self.api)
+
+
+class AsyncSpot:
+    """
+    Class for handling the MEXC REST API with asyncio.
+    All endpoint methods are coroutines sharing one pooled connection.
+    The endpoint groups are created on first access.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        rate_limiter: RateLimiter | None = None,
+        max_connections: int = 100,
+        base_url: str = "https://api.mexc.com",
+        instrumentation: Instrumentation | None = None,
+        cache: ResponseCache | None = None,
+    ) -> None:
+        # Imported here, so only AsyncSpot loads aiohttp.
+        from ..common.async_api import (  # pylint: disable=import-outside-toplevel
+            AsyncApi,
+        )
+
+        self.api = AsyncApi(
+            api_key,
+            api_secret,
+            base_url,
+            rate_limiter=rate_limiter,
+            max_connections=max_connections,
+            instrumentation=instrumentation,
+            cache=cache,
+        )
+        self.symbol_info = SymbolInfoStore()
+
+    @cached_property
+    def market(self) -> _AsyncMarket:
+        """Returns the market endpoints."""
+        return _AsyncMarket(self.api)
+
+    @cached_property
+    def account(self) -> _AsyncAccount:
+        """Returns the account endpoints."""
+        return _AsyncAccount(self.api, self.symbol_info)
+
+    @cached_property
+    def subaccount(self) -> _AsyncSubAccount:
+        """Returns the sub account endpoints."""
+        return _AsyncSubAccount(self.api)
+
+    @cached_property
+    def etf(self) -> _Etf:
+        """Returns the etf endpoints."""
+        return _Etf(self.api)
+
+    @cached_property
+    def rebate(self) -> _AsyncRebate:
+        """Returns the rebate endpoints."""
+        return _AsyncRebate(self.api)
+
+    @cached_property
+    def wallet(self) -> _AsyncWallet:
+        """Returns the wallet endpoints."""
+        return _AsyncWallet(self.api)
+
+    async def refresh_symbol_info(self) -> None:
+        """
+        Loads the exchange info into the symbol info store.
+        Must be awaited before orders are validated.
+        """
+        exchange_info = cast(Awaitable[dict], self.market.exchange_info())
+        self.symbol_info.load(await exchange_info)
+
+    async def close(self) -> None:
+        """Closes the underlying connection pool."""
+        await self.api.close()
 
-    def __init__(self, api_key: str, api_secret: str) -> None:
-        api = Api(api_key, api_secret)
+    async def __aenter__(self) -> "AsyncSpot":
+        return self
 
-        self.market = _Market(api)
-        self.account = _Account(api)
-        self.subaccount = _SubAccount(api)
-        self.etf = _Etf(api)
-        self.rebate = _Rebate(api)
-        self.wallet = _Wallet(api)
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
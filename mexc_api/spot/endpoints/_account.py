@@ -1,15 +1,42 @@
 """Defines the _Account class."""
-from mexc_api.common.api import Api
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+from mexc_api.common.api import BaseApi
 from mexc_api.common.enums import Method, OrderType, Side
+from mexc_api.common.exceptions import MexcAPIError
+from mexc_api.common.pagination import DAY_MS, WindowPaginator
+from mexc_api.common.utils import get_timestamp
+from mexc_api.spot.symbol_info import SymbolInfoStore
+
+BATCH_ORDER_LIMIT = 20
+
+# The page limit and longest time range of a single history query.
+ORDERS_LIMIT = 1000
+ORDERS_WINDOW_MS = 7 * DAY_MS
+TRADES_LIMIT = 100
+TRADES_WINDOW_MS = DAY_MS
+
+
+def _get_error_result(error: MexcAPIError) -> dict:
+    """Returns the result of an order that failed with an error."""
+    if len(error.args) == 2:
+        return {"code": error.args[0], "msg": error.args[1]}
+    return {"code": None, "msg": str(error)}
 
 
 class _Account:
     """Defines all Account endpoints."""
 
-    def __init__(self, api: Api) -> None:
+    def __init__(
+        self, api: BaseApi, symbol_info: SymbolInfoStore | None = None
+    ) -> None:
         self.api = api
+        self.symbol_info = symbol_info
 
-    def test_new_order(
+    def _get_order_params(
         self,
         symbol: str,
         side: Side,
@@ -18,9 +45,20 @@ class _Account:
         quote_order_quantity: str | None = None,
         price: str | None = None,
         client_order_id: str | None = None,
+        validate: bool = False,
     ) -> dict:
-        """Creates a test order."""
-        params = {
+        """
+        Returns the parameters of an order.
+        The quantity and price are rounded and validated when validate is true.
+        """
+        if validate:
+            if self.symbol_info is None:
+                raise ValueError("Order validation requires a symbol info store.")
+            quantity, price = self.symbol_info.validate_order(
+                symbol, side, order_type, quantity, quote_order_quantity, price
+            )
+
+        return {
             "symbol": symbol.upper(),
             "side": side.value,
             "quantity": quantity,
@@ -29,6 +67,33 @@ class _Account:
             "quoteOrderQty": quote_order_quantity,
             "newClientOrderId": client_order_id,
         }
+
+    def test_new_order(
+        self,
+        symbol: str,
+        side: Side,
+        order_type: OrderType,
+        quantity: str | None = None,
+        quote_order_quantity: str | None = None,
+        price: str | None = None,
+        client_order_id: str | None = None,
+        validate: bool = False,
+    ) -> dict:
+        """
+        Creates a test order.
+        With validate the order is rounded and checked against the symbol rules
+        first, a MexcValidationError is raised if it would be rejected.
+        """
+        params = self._get_order_params(
+            symbol,
+            side,
+            order_type,
+            quantity,
+            quote_order_quantity,
+            price,
+            client_order_id,
+            validate,
+        )
         return self.api.send_request(Method.POST, "/api/v3/order/test", params, True)
 
     def new_order(
@@ -40,22 +105,104 @@ class _Account:
         quote_order_quantity: str | None = None,
         price: str | None = None,
         client_order_id: str | None = None,
+        validate: bool = False,
     ) -> dict:
-        """Creates a new order."""
-        params = {
-            "symbol": symbol.upper(),
-            "side": side.value,
-            "quantity": quantity,
-            "price": price,
-            "type": order_type.value,
-            "quoteOrderQty": quote_order_quantity,
-            "newClientOrderId": client_order_id,
-        }
+        """
+        Creates a new order.
+        With validate the order is rounded and checked against the symbol rules
+        first, a MexcValidationError is raised if it would be rejected.
+        """
+        params = self._get_order_params(
+            symbol,
+            side,
+            order_type,
+            quantity,
+            quote_order_quantity,
+            price,
+            client_order_id,
+            validate,
+        )
         return self.api.send_request(Method.POST, "/api/v3/order", params, True)
 
-    def batch_order(self) -> dict:
-        """Creates multiple orders."""
-        raise NotImplementedError
+    def _get_batch_chunks(
+        self, orders: list[dict[str, Any]], results: list[dict], validate: bool
+    ) -> list[tuple[list[int], dict]]:
+        """
+        Splits orders in chunks of at most BATCH_ORDER_LIMIT orders of one symbol.
+        Returns the input indices and the request parameters of every chunk.
+        Orders that fail validation get their error in results instead.
+        """
+        by_symbol: dict[str, list[tuple[int, dict]]] = {}
+        for index, order in enumerate(orders):
+            try:
+                params = self._get_order_params(**order, validate=validate)
+            except MexcAPIError as error:
+                results[index] = _get_error_result(error)
+                continue
+            by_symbol.setdefault(params["symbol"], []).append(
+                (index, self.api.remove_none_params(params))
+            )
+
+        chunks = []
+        for symbol_orders in by_symbol.values():
+            for start in range(0, len(symbol_orders), BATCH_ORDER_LIMIT):
+                chunk = symbol_orders[start : start + BATCH_ORDER_LIMIT]
+                params = {
+                    "batchOrders": json.dumps(
+                        [order_params for _, order_params in chunk],
+                        separators=(",", ":"),
+                    )
+                }
+                chunks.append(([index for index, _ in chunk], params))
+        return chunks
+
+    def _send_batch(self, params: dict) -> list | dict | MexcAPIError:
+        """Sends one chunk of orders and returns the response or the error."""
+        try:
+            return self.api.send_request(
+                Method.POST, "/api/v3/batchOrders", params, True
+            )
+        except MexcAPIError as error:
+            return error
+
+    @staticmethod
+    def _set_batch_results(
+        results: list[dict], indices: list[int], response: list | dict | MexcAPIError
+    ) -> None:
+        """Matches the response of a chunk to the input orders."""
+        for position, index in enumerate(indices):
+            if isinstance(response, MexcAPIError):
+                results[index] = _get_error_result(response)
+            elif isinstance(response, dict):
+                results[index] = response
+            elif position < len(response):
+                results[index] = response[position]
+            else:
+                results[index] = {"code": None, "msg": "Missing in batch response."}
+
+    def batch_order(
+        self,
+        orders: list[dict[str, Any]],
+        validate: bool = False,
+        max_workers: int = 4,
+    ) -> list[dict]:
+        """
+        Creates multiple orders.
+        Every order is a dict with the keyword arguments of new_order.
+        Orders are sent in chunks of at most 20 orders of the same symbol,
+        the chunks are sent concurrently.
+
+        Returns one result per order in the order of the input.
+        The result of a rejected order is a dict with the code and msg of the error.
+        """
+        results: list[dict] = [{} for _ in orders]
+        chunks = self._get_batch_chunks(orders, results, validate)
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            responses = executor.map(self._send_batch, [params for _, params in chunks])
+            for (indices, _), response in zip(chunks, responses):
+                self._set_batch_results(results, indices, response)
+        return results
 
     def cancel_order(
         self,
@@ -116,6 +263,26 @@ class _Account:
         }
         return self.api.send_request(Method.GET, "/api/v3/allOrders", params, True)
 
+    def iter_orders(
+        self,
+        symbol: str,
+        start_ms: int,
+        end_ms: int | None = None,
+        prefetch: int = 0,
+    ) -> WindowPaginator:
+        """
+        Returns a lazy iterator over the orders of a symbol between start_ms
+        and end_ms (exclusive, defaults to now), see WindowPaginator.
+        """
+        return WindowPaginator(
+            partial(self.get_orders, symbol),
+            start_ms,
+            get_timestamp() if end_ms is None else end_ms,
+            ORDERS_WINDOW_MS,
+            ORDERS_LIMIT,
+            prefetch,
+        )
+
     def get_account_info(self) -> dict:
         """Returns the account info."""
         return self.api.send_request(Method.GET, "/api/v3/account", {}, True)
@@ -136,6 +303,26 @@ class _Account:
         }
         return self.api.send_request(Method.GET, "/api/v3/myTrades", params, True)
 
+    def iter_trades(
+        self,
+        symbol: str,
+        start_ms: int,
+        end_ms: int | None = None,
+        prefetch: int = 0,
+    ) -> WindowPaginator:
+        """
+        Returns a lazy iterator over the trades of a symbol between start_ms
+        and end_ms (exclusive, defaults to now), see WindowPaginator.
+        """
+        return WindowPaginator(
+            partial(self.get_trades, symbol),
+            start_ms,
+            get_timestamp() if end_ms is None else end_ms,
+            TRADES_WINDOW_MS,
+            TRADES_LIMIT,
+            prefetch,
+        )
+
     def enable_mx_deduct(self, is_enabled: bool) -> dict:
         """Enables mx deduct."""
         params = dict(mxDeductEnable=is_enabled)
@@ -158,12 +345,17 @@ class _Account:
         """Returns a listen key."""
         return self.api.send_request(Method.GET, "/api/v3/userDataStream", {}, True)
 
+    @staticmethod
+    def _params_listen_key(listen_key: str) -> dict:
+        """Returns the parameters of the listen key endpoints."""
+        return {"listenKey": listen_key}
+
     def keep_alive_listen_key(self, listen_key: str) -> None:
         """Keeps the listen key alive."""
-        params = {"listenKey": listen_key}
+        params = self._params_listen_key(listen_key)
         self.api.send_request(Method.PUT, "/api/v3/userDataStream", params, True)
 
     def delete_listen_key(self, listen_key: str) -> None:
         """deletes a listen key."""
-        params = {"listenKey": listen_key}
+        params = self._params_listen_key(listen_key)
         self.api.send_request(Method.DELETE, "/api/v3/userDataStream", params, True)
@@ -0,0 +1,205 @@
+"""
+Defines the asyncio variants of the endpoint classes.
+
+Endpoints that return the response unchanged are inherited as they are,
+because they return the coroutine of AsyncApi.send_request.
+Only endpoints that post-process the response are overridden, they build
+their parameters with the _params_* helpers of the sync classes.
+Asyncio is imported where it is used, so the sync Spot does not load it.
+"""
+from typing import Any
+
+from mexc_api.common.enums import AccountType, Method
+from mexc_api.common.exceptions import MexcAPIError
+
+from ._account import _Account
+from ._market import _Market
+from ._rebate import _Rebate
+from ._sub_account import _SubAccount
+from ._wallet import _Wallet
+
+# pylint: disable=invalid-overridden-method
+
+
+class _AsyncMarket(_Market):
+    """Defines all Market endpoints as coroutines."""
+
+    async def test(self) -> None:  # type: ignore[override]
+        """Tests connectivity to the Rest API."""
+        await self.api.send_request(Method.GET, "/api/v3/ping", {})
+
+    async def server_time(self) -> int:  # type: ignore[override]
+        """Returns the server time."""
+        response = await self.api.send_request(Method.GET, "/api/v3/time", {})
+        return response["serverTime"]
+
+    async def default_symbols(self) -> list[str]:  # type: ignore[override]
+        """Returns all symbols."""
+        response = await self.api.send_request(
+            Method.GET, "/api/v3/defaultSymbols", {}
+        )
+        return response["data"]
+
+    async def ticker_24h(  # type: ignore[override]
+        self, symbol: str | None = None
+    ) -> list:
+        """
+        Returns ticker data from the last 24 hours.
+        Data for all symbols will be sent if symbol was not given.
+        """
+        params = self._params_ticker(symbol)
+        response = await self.api.send_request(
+            Method.GET, "/api/v3/ticker/24hr", params
+        )
+        return [response] if isinstance(response, dict) else response
+
+    async def ticker_price(  # type: ignore[override]
+        self, symbol: str | None = None
+    ) -> list:
+        """
+        Returns the ticker price of a symbol.
+        Prices of all symbols will be send if symbol was not given.
+        """
+        params = self._params_ticker(symbol)
+        response = await self.api.send_request(
+            Method.GET, "/api/v3/ticker/price", params
+        )
+        return [response] if isinstance(response, dict) else response
+
+    async def ticker_book_price(  # type: ignore[override]
+        self, symbol: str | None = None
+    ) -> list:
+        """
+        Returns the best price/qty on the order book for a symbol.
+        Data for all symbols will be sent if symbol was not given.
+        """
+        params = self._params_ticker(symbol)
+        response = await self.api.send_request(
+            Method.GET, "/api/v3/ticker/bookTicker", params
+        )
+        return [response] if isinstance(response, dict) else response
+
+
+class _AsyncAccount(_Account):
+    """Defines all Account endpoints as coroutines."""
+
+    async def _send_batch_async(
+        self, params: dict
+    ) -> list | dict | MexcAPIError:
+        """Sends one chunk of orders and returns the response or the error."""
+        try:
+            return await self.api.send_request(
+                Method.POST, "/api/v3/batchOrders", params, True
+            )
+        except MexcAPIError as error:
+            return error
+
+    async def batch_order(  # type: ignore[override]
+        self,
+        orders: list[dict[str, Any]],
+        validate: bool = False,
+        max_workers: int = 4,
+    ) -> list[dict]:
+        """
+        Creates multiple orders.
+        Every order is a dict with the keyword arguments of new_order.
+        Orders are sent in chunks of at most 20 orders of the same symbol,
+        all chunks are sent concurrently, max_workers is ignored.
+
+        Returns one result per order in the order of the input.
+        The result of a rejected order is a dict with the code and msg of the error.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        results: list[dict] = [{} for _ in orders]
+        chunks = self._get_batch_chunks(orders, results, validate)
+
+        responses = await asyncio.gather(
+            *(self._send_batch_async(params) for _, params in chunks)
+        )
+        for (indices, _), response in zip(chunks, responses):
+            self._set_batch_results(results, indices, response)
+        return results
+
+    async def create_listen_key(self) -> str:  # type: ignore[override]
+        """Returns a listen key"""
+        response = await self.api.send_request(
+            Method.POST, "/api/v3/userDataStream", {}, True
+        )
+        return response["listenKey"]
+
+    async def keep_alive_listen_key(  # type: ignore[override]
+        self, listen_key: str
+    ) -> None:
+        """Keeps the listen key alive."""
+        params = self._params_listen_key(listen_key)
+        await self.api.send_request(Method.PUT, "/api/v3/userDataStream", params, True)
+
+    async def delete_listen_key(  # type: ignore[override]
+        self, listen_key: str
+    ) -> None:
+        """deletes a listen key."""
+        params = self._params_listen_key(listen_key)
+        await self.api.send_request(
+            Method.DELETE, "/api/v3/userDataStream", params, True
+        )
+
+
+class _AsyncSubAccount(_SubAccount):
+    """Defines all sub account endpoints as coroutines."""
+
+    async def delete_api_key(  # type: ignore[override]
+        self, account_name: str, api_key: str
+    ) -> None:
+        """Deletes the api key of a sub account."""
+        params = self._params_api_key(account_name, api_key)
+        await self.api.send_request(
+            Method.DELETE, "/api/v3/sub-account/apiKey", params, True
+        )
+
+    async def transfer(  # type: ignore[override]
+        self,
+        send_account_type: AccountType,
+        receive_account_type: AccountType,
+        asset: str,
+        amount: str,
+        sender: str | None = None,
+        receiver: str | None = None,
+    ) -> str:
+        """
+        Transfers an asset between accounts.
+        The default sender/receiver is the master account.
+        Returns the transfer id.
+        """
+        params = self._params_transfer(
+            send_account_type, receive_account_type, asset, amount, sender, receiver
+        )
+        response = await self.api.send_request(
+            Method.POST, "/api/v3/capital/sub-account/universalTransfer", params, True
+        )
+        return response["tranId"]
+
+
+class _AsyncWallet(_Wallet):
+    """Defines all wallet endpoints as coroutines."""
+
+    async def cancel_withdraw(  # type: ignore[override]
+        self, withdraw_id: str
+    ) -> str:
+        """Cancels a withdrawal."""
+        params = self._params_withdraw_id(withdraw_id)
+        response = await self.api.send_request(
+            Method.DELETE, "/api/v3/capital/withdraw", params, True
+        )
+        return response["id"]
+
+
+class _AsyncRebate(_Rebate):
+    """Defines all rebate endpoints as coroutines."""
+
+    async def get_refer_code(self) -> str:  # type: ignore[override]
+        """Returns an refer code"""
+        response = await self.api.send_request(
+            Method.GET, "/api/v3/rebate/referCode", {}, True
+        )
+        return response["referCode"]
@@ -1,12 +1,12 @@
 """Defines the _Etf class."""
-from mexc_api.common.api import Api
+from mexc_api.common.api import BaseApi
 from mexc_api.common.enums import Method
 
 
 class _Etf:
     """Defines all etf endpoints."""
 
-    def __init__(self, api: Api) -> None:
+    def __init__(self, api: BaseApi) -> None:
         self.api = api
 
     def info(self, etf_symbol: str) -> dict:
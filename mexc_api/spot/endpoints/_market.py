@@ -1,12 +1,12 @@
 """Defines the _Market class."""
-from mexc_api.common.api import Api
+from mexc_api.common.api import BaseApi
 from mexc_api.common.enums import Interval, Method
 
 
 class _Market:
     """Defines all Market endpoints."""
 
-    def __init__(self, api: Api) -> None:
+    def __init__(self, api: BaseApi) -> None:
         self.api = api
 
     def test(self) -> None:
@@ -93,17 +93,17 @@ class _Market:
         }
         return self.api.send_request(Method.GET, "/api/v3/avgPrice", params)
 
+    @staticmethod
+    def _params_ticker(symbol: str | None) -> dict:
+        """Returns the parameters of the ticker endpoints."""
+        return {"symbol": symbol.upper() if symbol else None}
+
     def ticker_24h(self, symbol: str | None = None) -> list:
         """
         Returns ticker data from the last 24 hours.
         Data for all symbols will be sent if symbol was not given.
         """
-        if symbol:
-            symbol.upper()
-
-        params = {
-            "symbol": symbol,
-        }
+        params = self._params_ticker(symbol)
         response = self.api.send_request(Method.GET, "/api/v3/ticker/24hr", params)
         return [response] if isinstance(response, dict) else response
 
@@ -112,12 +112,7 @@ class _Market:
         Returns the ticker price of a symbol.
         Prices of all symbols will be send if symbol was not given.
         """
-        if symbol:
-            symbol.upper()
-
-        params = {
-            "symbol": symbol,
-        }
+        params = self._params_ticker(symbol)
         response = self.api.send_request(Method.GET, "/api/v3/ticker/price", params)
         return [response] if isinstance(response, dict) else response
 
@@ -126,12 +121,7 @@ class _Market:
         Returns the best price/qty on the order book for a symbol.
         Data for all symbols will be sent if symbol was not given.
         """
-        if symbol:
-            symbol.upper()
-
-        params = {
-            "symbol": symbol,
-        }
+        params = self._params_ticker(symbol)
         response = self.api.send_request(
             Method.GET, "/api/v3/ticker/bookTicker", params
         )
@@ -1,12 +1,17 @@
 """Defines the _Rebate class."""
-from mexc_api.common.api import Api
+from functools import partial
+
+from mexc_api.common.api import BaseApi
 from mexc_api.common.enums import Method
+from mexc_api.common.pagination import PagePaginator
+
+RECORDS_PAGE_SIZE = 100
 
 
 class _Rebate:
     """Defines all rebate endpoints."""
 
-    def __init__(self, api: Api) -> None:
+    def __init__(self, api: BaseApi) -> None:
         self.api = api
 
     def get_records(
@@ -27,6 +32,17 @@ class _Rebate:
             Method.GET, "/api/v3/rebate/taxQuery", params, True
         )
 
+    def iter_records(
+        self,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+        prefetch: int = 0,
+    ) -> PagePaginator:
+        """Returns a lazy iterator over all pages of rebate records."""
+        return PagePaginator(
+            partial(self.get_records, start_ms, end_ms), RECORDS_PAGE_SIZE, prefetch
+        )
+
     def get_record_details(
         self,
         start_ms: int | None = None,
@@ -41,6 +57,20 @@ class _Rebate:
         }
         return self.api.send_request(Method.GET, "/api/v3/rebate/detail", params, True)
 
+    def iter_record_details(
+        self,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+        prefetch: int = 0,
+    ) -> PagePaginator:
+        """
+        Returns a lazy iterator over all pages of rebate record details.
+        The page size is fixed by the exchange, so it stops at an empty page.
+        """
+        return PagePaginator(
+            partial(self.get_record_details, start_ms, end_ms), prefetch=prefetch
+        )
+
     def get_self_rebate_records(
         self,
         start_ms: int | None = None,
@@ -57,6 +87,21 @@ class _Rebate:
             Method.GET, "/api/v3/rebate/detail/kickback", params, True
         )
 
+    def iter_self_rebate_records(
+        self,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+        prefetch: int = 0,
+    ) -> PagePaginator:
+        """
+        Returns a lazy iterator over all pages of self rebate records.
+        The page size is fixed by the exchange, so it stops at an empty page.
+        """
+        return PagePaginator(
+            partial(self.get_self_rebate_records, start_ms, end_ms),
+            prefetch=prefetch,
+        )
+
     def get_refer_code(self) -> str:
         """Returns an refer code"""
         response = self.api.send_request(
@@ -1,12 +1,12 @@
 """Defines the _SubAccount class."""
-from mexc_api.common.api import Api
+from mexc_api.common.api import BaseApi
 from mexc_api.common.enums import AccountType, Method
 
 
 class _SubAccount:
     """Defines all sub account endpoints."""
 
-    def __init__(self, api: Api) -> None:
+    def __init__(self, api: BaseApi) -> None:
         self.api = api
 
     def create_sub_account(self, account_name: str, desc: str) -> dict:
@@ -59,11 +59,35 @@ class _SubAccount:
             Method.GET, "/api/v3/sub-account/apiKey", params, True
         )
 
+    @staticmethod
+    def _params_api_key(account_name: str, api_key: str) -> dict:
+        """Returns the parameters of delete_api_key."""
+        return {"subAccount": account_name, "apiKey": api_key}
+
     def delete_api_key(self, account_name: str, api_key: str) -> None:
         """Deletes the api key of a sub account."""
-        params = {"subAccount": account_name, "apiKey": api_key}
+        params = self._params_api_key(account_name, api_key)
         self.api.send_request(Method.DELETE, "/api/v3/sub-account/apiKey", params, True)
 
+    @staticmethod
+    def _params_transfer(
+        send_account_type: AccountType,
+        receive_account_type: AccountType,
+        asset: str,
+        amount: str,
+        sender: str | None,
+        receiver: str | None,
+    ) -> dict:
+        """Returns the parameters of transfer."""
+        return {
+            "fromAccount": sender,
+            "toAccount": receiver,
+            "fromAccountType": send_account_type,
+            "toAccountType": receive_account_type,
+            "asset": asset.upper(),
+            "amount": amount,
+        }
+
     def transfer(
         self,
         send_account_type: AccountType,
@@ -78,14 +102,9 @@ class _SubAccount:
         The default sender/receiver is the master account.
         Returns the transfer id.
         """
-        params = {
-            "fromAccount": sender,
-            "toAccount": receiver,
-            "fromAccountType": send_account_type,
-            "toAccountType": receive_account_type,
-            "asset": asset.upper(),
-            "amount": amount,
-        }
+        params = self._params_transfer(
+            send_account_type, receive_account_type, asset, amount, sender, receiver
+        )
         response = self.api.send_request(
             Method.POST, "/api/v3/capital/sub-account/universalTransfer", params, True
         )
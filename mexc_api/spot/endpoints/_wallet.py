@@ -1,12 +1,22 @@
 """Defines the _Wallet class."""
-from mexc_api.common.api import Api
+from functools import partial
+
+from mexc_api.common.api import BaseApi
 from mexc_api.common.enums import AccountType, Method
+from mexc_api.common.pagination import DAY_MS, PagePaginator, WindowPaginator
+from mexc_api.common.utils import get_timestamp
+
+# The page limit and longest time range of a single history query.
+HISTORY_LIMIT = 1000
+HISTORY_WINDOW_MS = 7 * DAY_MS
+TRANSFERS_PAGE_SIZE = 50
+DUST_LOG_PAGE_SIZE = 100
 
 
 class _Wallet:
     """Defines all wallet endpoints."""
 
-    def __init__(self, api: Api) -> None:
+    def __init__(self, api: BaseApi) -> None:
         self.api = api
 
     def info(self) -> list:
@@ -39,11 +49,14 @@ class _Wallet:
             Method.POST, "/api/v3/capital/withdraw/apply", params, True
         )
 
+    @staticmethod
+    def _params_withdraw_id(withdraw_id: str) -> dict:
+        """Returns the parameters of cancel_withdraw."""
+        return {"id": withdraw_id}
+
     def cancel_withdraw(self, withdraw_id: str) -> str:
         """Cancels a withdrawal."""
-        params = {
-            "id": withdraw_id,
-        }
+        params = self._params_withdraw_id(withdraw_id)
         response = self.api.send_request(
             Method.DELETE, "/api/v3/capital/withdraw", params, True
         )
@@ -69,6 +82,27 @@ class _Wallet:
             Method.GET, "/api/v3/capital/withdraw/history", params, True
         )
 
+    def iter_withdrawal_history(
+        self,
+        start_ms: int,
+        end_ms: int | None = None,
+        asset: str | None = None,
+        status: int | None = None,
+        prefetch: int = 0,
+    ) -> WindowPaginator:
+        """
+        Returns a lazy iterator over the withdrawals between start_ms and
+        end_ms (exclusive, defaults to now), see WindowPaginator.
+        """
+        return WindowPaginator(
+            partial(self.get_withdrawal_history, asset, status),
+            start_ms,
+            get_timestamp() if end_ms is None else end_ms,
+            HISTORY_WINDOW_MS,
+            HISTORY_LIMIT,
+            prefetch,
+        )
+
     def get_deposit_history(
         self,
         asset: str | None = None,
@@ -89,6 +123,27 @@ class _Wallet:
             Method.GET, "/api/v3/capital/deposit/hisrec", params, True
         )
 
+    def iter_deposit_history(
+        self,
+        start_ms: int,
+        end_ms: int | None = None,
+        asset: str | None = None,
+        status: int | None = None,
+        prefetch: int = 0,
+    ) -> WindowPaginator:
+        """
+        Returns a lazy iterator over the deposits between start_ms and
+        end_ms (exclusive, defaults to now), see WindowPaginator.
+        """
+        return WindowPaginator(
+            partial(self.get_deposit_history, asset, status),
+            start_ms,
+            get_timestamp() if end_ms is None else end_ms,
+            HISTORY_WINDOW_MS,
+            HISTORY_LIMIT,
+            prefetch,
+        )
+
     def get_create_deposit_address(
         self,
         asset: str,
@@ -173,6 +228,27 @@ class _Wallet:
             Method.GET, "/api/v3/capital/transfer", params, True
         )
 
+    def iter_transfers(
+        self,
+        send_account_type: AccountType,
+        receive_account_type: AccountType,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+        prefetch: int = 0,
+    ) -> PagePaginator:
+        """Returns a lazy iterator over all pages of transfers, see PagePaginator."""
+        return PagePaginator(
+            partial(
+                self.get_transfers,
+                send_account_type,
+                receive_account_type,
+                start_ms,
+                end_ms,
+            ),
+            TRANSFERS_PAGE_SIZE,
+            prefetch,
+        )
+
     def get_transfers_by_id(self, transfer_id: str) -> dict:
         """Returns an transfer."""
         params = {
@@ -214,3 +290,14 @@ class _Wallet:
         return self.api.send_request(
             Method.GET, "/api/v3/capital/convert", params, True
         )
+
+    def iter_dust_log(
+        self,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+        prefetch: int = 0,
+    ) -> PagePaginator:
+        """Returns a lazy iterator over all pages of the dust log, see PagePaginator."""
+        return PagePaginator(
+            partial(self.dust_log, start_ms, end_ms), DUST_LOG_PAGE_SIZE, prefetch
+        )
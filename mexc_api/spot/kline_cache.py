@@ -0,0 +1,209 @@
+"""Defines the KlineCache class."""
+import json
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import IO, Iterator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+from mexc_api.common.enums import Interval
+from mexc_api.common.utils import get_interval_ms, get_open_time, get_timestamp
+
+from . import Spot
+from .kline_downloader import get_kline_dtype, merge_klines, parse_klines
+
+if sys.platform == "win32":
+    import msvcrt  # pylint: disable=import-error
+
+    def _lock_file(file: IO[bytes]) -> None:
+        """Blocks until the first byte of a file is locked."""
+        while True:
+            try:
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def _unlock_file(file: IO[bytes]) -> None:
+        """Unlocks the first byte of a file."""
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(file: IO[bytes]) -> None:
+        """Blocks until a file is locked exclusively."""
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(file: IO[bytes]) -> None:
+        """Unlocks a file."""
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Holds an exclusive lock on a lock file, shared by all processes."""
+    with open(path, "a+b") as file:
+        _lock_file(file)
+        try:
+            yield
+        finally:
+            _unlock_file(file)
+
+
+def _merge_ranges(ranges: list[list[int]]) -> list[list[int]]:
+    """Returns the sorted union of [start, end) ranges."""
+    merged: list[list[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _get_gaps(
+    ranges: list[list[int]], start_ms: int, end_ms: int
+) -> list[tuple[int, int]]:
+    """Returns the parts of [start_ms, end_ms) that are not in the ranges."""
+    gaps = []
+    for range_start, range_end in ranges:
+        if range_end <= start_ms:
+            continue
+        if range_start >= end_ms:
+            break
+        if range_start > start_ms:
+            gaps.append((start_ms, range_start))
+        start_ms = max(start_ms, range_end)
+    if start_ms < end_ms:
+        gaps.append((start_ms, end_ms))
+    return gaps
+
+
+class KlineCache:
+    """
+    Persistent local cache of the klines endpoint per symbol and interval.
+
+    Every symbol and interval is stored as one sorted .npy file next to a json
+    file with the time ranges it holds. Only the gaps of a requested range are
+    fetched and the still open kline is never stored.
+    Cached klines are returned as a read only memory mapped numpy array.
+
+    Reading and filling a directory holds a lock file, so processes sharing
+    the cache never see klines and ranges of different writes. Files are
+    replaced by a rename and the merge reads the old klines without mapping
+    them, so no map of the cache itself blocks the rename on Windows.
+    """
+
+    def __init__(self, spot: Spot, directory: str | os.PathLike, limit: int = 1000):
+        get_kline_dtype()
+        self.spot = spot
+        self.directory = Path(directory)
+        self.limit = limit
+
+        self._locks: dict[tuple[str, Interval], Lock] = {}
+        self._locks_lock = Lock()
+
+    def _get_lock(self, symbol: str, interval: Interval) -> Lock:
+        """Returns the lock of a symbol and interval."""
+        with self._locks_lock:
+            return self._locks.setdefault((symbol, interval), Lock())
+
+    def get_directory(self, symbol: str, interval: Interval) -> Path:
+        """
+        Returns the directory of a symbol and interval.
+        Intervals are named by their enum name, as 1m and 1M would be the same
+        directory on case insensitive file systems.
+        """
+        return self.directory / symbol / interval.name
+
+    def get_ranges(self, symbol: str, interval: Interval) -> list[list[int]]:
+        """Returns the cached [start, end) ranges of a symbol and interval."""
+        path = self.get_directory(symbol.upper(), interval) / "ranges.json"
+        if not path.exists():
+            return []
+        return json.loads(path.read_text())
+
+    def _load(self, directory: Path, mmap: bool = True) -> "np.ndarray":
+        """Returns the klines of a directory, memory mapped by default."""
+        path = directory / "klines.npy"
+        if not path.exists():
+            return np.empty(0, get_kline_dtype())
+        return np.load(path, mmap_mode="r" if mmap else None)
+
+    def _fetch(
+        self, symbol: str, interval: Interval, start_ms: int, end_ms: int
+    ) -> "np.ndarray":
+        """Fetches the klines with an open time in [start_ms, end_ms)."""
+        step = get_interval_ms(interval) * self.limit
+        arrays = []
+        for window_start in range(start_ms, end_ms, step):
+            window_end = min(window_start + step, end_ms)
+            rows = self.spot.market.klines(
+                symbol, interval, window_start, window_end - 1, self.limit
+            )
+            arrays.append(parse_klines(rows))
+        return merge_klines(*arrays)
+
+    def _fill(
+        self,
+        symbol: str,
+        interval: Interval,
+        directory: Path,
+        gaps: list[tuple[int, int]],
+        ranges: list[list[int]],
+    ) -> None:
+        """Fetches the gaps and stores the klines and the new ranges."""
+        arrays = []
+        for gap_start, gap_end in gaps:
+            klines = self._fetch(symbol, interval, gap_start, gap_end)
+            arrays.append(klines[klines["open_time"] < gap_end])
+            ranges.append([gap_start, gap_end])
+
+        if not arrays:
+            return
+
+        klines = merge_klines(self._load(directory, mmap=False), *arrays)
+        temporary_path = directory / "klines.tmp.npy"
+        np.save(temporary_path, klines)
+        os.replace(temporary_path, directory / "klines.npy")
+
+        temporary_path = directory / "ranges.tmp.json"
+        temporary_path.write_text(json.dumps(_merge_ranges(ranges)))
+        os.replace(temporary_path, directory / "ranges.json")
+
+    def get(
+        self, symbol: str, interval: Interval, start_ms: int, end_ms: int
+    ) -> "np.ndarray":
+        """
+        Returns the klines with an open time between start_ms (inclusive)
+        and end_ms (exclusive). Only the ranges missing in the cache are fetched.
+        Klines that are not closed yet are fetched but not cached.
+        """
+        symbol = symbol.upper()
+        directory = self.get_directory(symbol, interval)
+        open_kline_start = get_open_time(interval, get_timestamp())
+
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._get_lock(symbol, interval), _file_lock(directory / "lock"):
+            ranges = self.get_ranges(symbol, interval)
+            gaps = _get_gaps(ranges, start_ms, min(end_ms, open_kline_start))
+            if gaps:
+                self._fill(symbol, interval, directory, gaps, ranges)
+            klines = self._load(directory)
+
+        open_times = klines["open_time"]
+        cached = klines[
+            np.searchsorted(open_times, start_ms) : np.searchsorted(open_times, end_ms)
+        ]
+        if end_ms <= open_kline_start:
+            return cached
+
+        recent = self._fetch(symbol, interval, max(start_ms, open_kline_start), end_ms)
+        return merge_klines(np.asarray(cached), recent)
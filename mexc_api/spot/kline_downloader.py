@@ -0,0 +1,190 @@
+"""Defines the KlineDownloader class."""
+import logging
+import os
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+from mexc_api.common.enums import Interval
+from mexc_api.common.utils import get_interval_ms
+
+from . import Spot
+
+KLINE_COLUMNS = (
+    ("open_time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+    ("close_time", "<i8"),
+    ("quote_volume", "<f8"),
+)
+
+
+def get_kline_dtype() -> "np.dtype":
+    """Returns the structured numpy dtype of a kline row."""
+    if np is None:
+        raise ImportError(
+            "Kline arrays require numpy, install it with 'pip install mexc-api[data]'."
+        )
+    return np.dtype(list(KLINE_COLUMNS))
+
+
+def parse_klines(rows: list) -> "np.ndarray":
+    """Converts the rows of the klines endpoint to a structured numpy array."""
+    dtype = get_kline_dtype()
+    klines = np.empty(len(rows), dtype)
+    if rows:
+        columns = np.array(rows, dtype=object)
+        for index, (name, column_type) in enumerate(KLINE_COLUMNS):
+            klines[name] = columns[:, index].astype(column_type)
+    return klines
+
+
+def merge_klines(*arrays: "np.ndarray") -> "np.ndarray":
+    """Returns the klines of all arrays sorted by open time without duplicates."""
+    klines = np.concatenate(arrays) if arrays else np.empty(0, get_kline_dtype())
+    _, indices = np.unique(klines["open_time"], return_index=True)
+    return klines[indices]
+
+
+class KlineDownloader:
+    """
+    Downloads historical klines concurrently and stores them as numpy arrays.
+
+    A time range is split in windows of limit klines which are fetched by a
+    thread pool. Every finished window is written to a part file, so an
+    interrupted download only fetches the missing windows when it is restarted.
+    When all windows are done the parts are merged into one .npy file.
+
+    Pass a Spot with a RateLimiter to keep the workers within the rate limit.
+    """
+
+    def __init__(
+        self,
+        spot: Spot,
+        directory: str | os.PathLike,
+        max_workers: int = 8,
+        limit: int = 1000,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.spot = spot
+        self.directory = Path(directory)
+        self.max_workers = max_workers
+        self.limit = limit
+
+    def get_path(
+        self, symbol: str, interval: Interval, start_ms: int, end_ms: int
+    ) -> Path:
+        """
+        Returns the path of the merged file of a download.
+        Intervals are named by their enum name, as 1m and 1M would be the same
+        file on case insensitive file systems.
+        """
+        return self.directory / f"{symbol.upper()}-{interval.name}-{start_ms}-{end_ms}.npy"
+
+    def get_windows(
+        self, interval: Interval, start_ms: int, end_ms: int
+    ) -> list[tuple[int, int]]:
+        """Splits a time range in windows of at most limit klines."""
+        step = get_interval_ms(interval) * self.limit
+        return [
+            (window_start, min(window_start + step, end_ms))
+            for window_start in range(start_ms, end_ms, step)
+        ]
+
+    def _download_window(
+        self, symbol: str, interval: Interval, window: tuple[int, int], parts: Path
+    ) -> None:
+        """Fetches one window and writes it to a part file."""
+        start_ms, end_ms = window
+        rows = self.spot.market.klines(
+            symbol, interval, start_ms, end_ms - 1, self.limit
+        )
+        temporary_path = parts / f"{start_ms}-{end_ms}.tmp.npy"
+        np.save(temporary_path, parse_klines(rows))
+        os.replace(temporary_path, parts / f"{start_ms}-{end_ms}.npy")
+
+    def _submit(
+        self,
+        executor: ThreadPoolExecutor,
+        symbol: str,
+        interval: Interval,
+        start_ms: int,
+        end_ms: int,
+    ) -> list[Future]:
+        """Submits the missing windows of a download."""
+        parts = self.get_path(symbol, interval, start_ms, end_ms).with_suffix(".parts")
+        parts.mkdir(parents=True, exist_ok=True)
+
+        return [
+            executor.submit(self._download_window, symbol, interval, window, parts)
+            for window in self.get_windows(interval, start_ms, end_ms)
+            if not (parts / f"{window[0]}-{window[1]}.npy").exists()
+        ]
+
+    def _merge(
+        self, symbol: str, interval: Interval, start_ms: int, end_ms: int
+    ) -> "np.ndarray":
+        """Merges the part files of a finished download into one file."""
+        path = self.get_path(symbol, interval, start_ms, end_ms)
+        parts = path.with_suffix(".parts")
+        klines = merge_klines(
+            *(np.load(part) for part in sorted(parts.glob("*[0-9].npy")))
+        )
+        klines = klines[
+            (klines["open_time"] >= start_ms) & (klines["open_time"] < end_ms)
+        ]
+
+        temporary_path = path.with_suffix(".tmp.npy")
+        np.save(temporary_path, klines)
+        os.replace(temporary_path, path)
+        shutil.rmtree(parts)
+        return klines
+
+    def download(
+        self, symbol: str, interval: Interval, start_ms: int, end_ms: int
+    ) -> "np.ndarray":
+        """
+        Returns the klines of a symbol with an open time between start_ms
+        (inclusive) and end_ms (exclusive). Downloads the missing windows first.
+        """
+        return self.download_many([symbol], interval, start_ms, end_ms)[symbol]
+
+    def download_many(
+        self, symbols: list[str], interval: Interval, start_ms: int, end_ms: int
+    ) -> dict[str, "np.ndarray"]:
+        """
+        Downloads the klines of many symbols with one thread pool.
+        Returns a dict with the klines per symbol.
+        """
+        get_kline_dtype()
+        result: dict[str, Any] = {}
+        pending: dict[str, list[Future]] = {}
+
+        with ThreadPoolExecutor(
+            self.max_workers, thread_name_prefix="Mexc kline download"
+        ) as executor:
+            for symbol in symbols:
+                path = self.get_path(symbol, interval, start_ms, end_ms)
+                if path.exists():
+                    result[symbol] = np.load(path)
+                else:
+                    pending[symbol] = self._submit(
+                        executor, symbol, interval, start_ms, end_ms
+                    )
+
+            for symbol, futures in pending.items():
+                for future in futures:
+                    future.result()
+                result[symbol] = self._merge(symbol, interval, start_ms, end_ms)
+                self.logger.debug("Downloaded %s %s klines.", symbol, interval.value)
+
+        return result
@@ -0,0 +1,212 @@
+"""Defines the SymbolInfo and SymbolInfoStore classes."""
+import time
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from mexc_api.common.enums import OrderType, Side
+from mexc_api.common.exceptions import MexcValidationError
+
+if TYPE_CHECKING:
+    from .endpoints._market import _Market
+
+TRADING_STATUSES = {"1", "ENABLED", "TRADING"}
+
+
+def _get_decimal(value: str | int | None) -> Decimal | None:
+    """Returns a positive decimal or None."""
+    if value in (None, ""):
+        return None
+    number = Decimal(str(value))
+    return number if number > 0 else None
+
+
+class SymbolInfo:
+    """The trading rules of a symbol from the exchange info endpoint."""
+
+    __slots__ = (
+        "symbol",
+        "status",
+        "base_asset",
+        "quote_asset",
+        "order_types",
+        "tick_size",
+        "step_size",
+        "min_quantity",
+        "min_notional",
+        "max_notional",
+        "data",
+    )
+
+    def __init__(self, data: dict) -> None:
+        self.data = data
+        self.symbol: str = data["symbol"]
+        self.status = str(data.get("status", "1"))
+        self.base_asset: str = data.get("baseAsset", "")
+        self.quote_asset: str = data.get("quoteAsset", "")
+        self.order_types: set[str] = set(data.get("orderTypes", ()))
+
+        self.tick_size = Decimal(1).scaleb(-int(data.get("quotePrecision", 8)))
+        self.step_size = Decimal(1).scaleb(-int(data.get("baseAssetPrecision", 8)))
+        self.min_quantity = _get_decimal(data.get("baseSizePrecision"))
+        self.min_notional = _get_decimal(data.get("quoteAmountPrecision"))
+        self.max_notional = _get_decimal(data.get("maxQuoteAmount"))
+
+        # Binance style filters take precedence when the exchange sends them.
+        for symbol_filter in data.get("filters", ()):
+            filter_type = symbol_filter.get("filterType")
+            if filter_type == "PRICE_FILTER":
+                self.tick_size = (
+                    _get_decimal(symbol_filter.get("tickSize")) or self.tick_size
+                )
+            elif filter_type == "LOT_SIZE":
+                self.step_size = (
+                    _get_decimal(symbol_filter.get("stepSize")) or self.step_size
+                )
+                self.min_quantity = (
+                    _get_decimal(symbol_filter.get("minQty")) or self.min_quantity
+                )
+            elif filter_type in ("MIN_NOTIONAL", "NOTIONAL"):
+                self.min_notional = (
+                    _get_decimal(symbol_filter.get("minNotional")) or self.min_notional
+                )
+
+    def round_price(self, price: str, side: Side) -> Decimal:
+        """Rounds a price to the tick size, down for buys and up for sells."""
+        rounding = ROUND_FLOOR if side == Side.BUY else ROUND_CEILING
+        return (Decimal(price) / self.tick_size).to_integral_value(
+            rounding
+        ) * self.tick_size
+
+    def round_quantity(self, quantity: str) -> Decimal:
+        """Rounds a quantity down to the step size."""
+        return (Decimal(quantity) / self.step_size).to_integral_value(
+            ROUND_FLOOR
+        ) * self.step_size
+
+    def validate_order(
+        self,
+        side: Side,
+        order_type: OrderType,
+        quantity: str | None = None,
+        quote_order_quantity: str | None = None,
+        price: str | None = None,
+    ) -> tuple[str | None, str | None]:
+        """
+        Rounds the quantity and price of an order and checks them against the rules.
+        Returns the rounded quantity and price.
+        Throws a MexcValidationError if the order would be rejected.
+        """
+        if self.status not in TRADING_STATUSES:
+            raise MexcValidationError(f"{self.symbol} is not trading.")
+        if self.order_types and order_type.value not in self.order_types:
+            raise MexcValidationError(
+                f"{order_type.value} orders are not allowed for {self.symbol}."
+            )
+
+        rounded_price = self.round_price(price, side) if price is not None else None
+        rounded_quantity = (
+            self.round_quantity(quantity) if quantity is not None else None
+        )
+        if rounded_price is not None and rounded_price <= 0:
+            raise MexcValidationError(f"Price {price} is below the tick size.")
+        if rounded_quantity is not None:
+            if rounded_quantity <= 0:
+                raise MexcValidationError(f"Quantity {quantity} is below the step size.")
+            if self.min_quantity and rounded_quantity < self.min_quantity:
+                raise MexcValidationError(
+                    f"Quantity {quantity} is below the minimum {self.min_quantity}."
+                )
+
+        notional = None
+        if quote_order_quantity is not None:
+            notional = Decimal(quote_order_quantity)
+        elif rounded_quantity is not None and rounded_price is not None:
+            notional = rounded_quantity * rounded_price
+
+        if notional is not None:
+            if self.min_notional and notional < self.min_notional:
+                raise MexcValidationError(
+                    f"Notional {notional} is below the minimum {self.min_notional}."
+                )
+            if self.max_notional and notional > self.max_notional:
+                raise MexcValidationError(
+                    f"Notional {notional} is above the maximum {self.max_notional}."
+                )
+
+        return (
+            None if rounded_quantity is None else f"{rounded_quantity:f}",
+            None if rounded_price is None else f"{rounded_price:f}",
+        )
+
+
+class SymbolInfoStore:
+    """
+    Caches the exchange info endpoint indexed by symbol.
+    The cache is refreshed on access once it is older than the ttl.
+    Without a market the store is only filled by load.
+    """
+
+    def __init__(self, market: "_Market | None" = None, ttl: float = 300) -> None:
+        self.market = market
+        self.ttl = ttl
+
+        self._symbols: dict[str, SymbolInfo] = {}
+        self._updated = 0.0
+        self._lock = Lock()
+
+    def load(self, exchange_info: dict) -> None:
+        """Replaces the cache with the response of the exchange info endpoint."""
+        self._symbols = {
+            data["symbol"]: SymbolInfo(data) for data in exchange_info["symbols"]
+        }
+        self._updated = time.monotonic()
+
+    def is_expired(self) -> bool:
+        """Returns true if the cache is older than the ttl."""
+        return time.monotonic() - self._updated > self.ttl
+
+    def refresh(self) -> None:
+        """Reloads the exchange info."""
+        if self.market is None:
+            return
+        with self._lock:
+            self.load(self.market.exchange_info())
+
+    def _refresh_if_expired(self) -> None:
+        """Reloads the exchange info once when the ttl has passed."""
+        if self.market is None or not self.is_expired():
+            return
+        with self._lock:
+            if self.is_expired():
+                self.load(self.market.exchange_info())
+
+    def get(self, symbol: str) -> SymbolInfo | None:
+        """Returns the rules of a symbol."""
+        self._refresh_if_expired()
+        return self._symbols.get(symbol.upper())
+
+    def symbols(self) -> list[str]:
+        """Returns all cached symbols."""
+        self._refresh_if_expired()
+        return list(self._symbols)
+
+    def validate_order(
+        self,
+        symbol: str,
+        side: Side,
+        order_type: OrderType,
+        quantity: str | None = None,
+        quote_order_quantity: str | None = None,
+        price: str | None = None,
+    ) -> tuple[str | None, str | None]:
+        """
+        Rounds and validates an order of a symbol, see SymbolInfo.validate_order.
+        Throws a MexcValidationError for unknown symbols.
+        """
+        info = self.get(symbol)
+        if info is None:
+            raise MexcValidationError(f"Unknown symbol {symbol}.")
+        return info.validate_order(
+            side, order_type, quantity, quote_order_quantity, price
+        )
@@ -0,0 +1,262 @@
+"""Defines the TickerSnapshot and SnapshotDiff classes."""
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Any, Mapping
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+from mexc_api.common.utils import get_timestamp
+
+from .endpoints._market import _Market
+
+TICKER_24H_COLUMNS = (
+    "priceChange",
+    "priceChangePercent",
+    "prevClosePrice",
+    "lastPrice",
+    "bidPrice",
+    "bidQty",
+    "askPrice",
+    "askQty",
+    "openPrice",
+    "highPrice",
+    "lowPrice",
+    "volume",
+    "quoteVolume",
+)
+TICKER_PRICE_COLUMNS = ("price",)
+BOOK_TICKER_COLUMNS = ("bidPrice", "bidQty", "askPrice", "askQty")
+
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+# Scale of the int columns, one for all columns or one per column.
+Decimals = int | Mapping[str, int] | None
+
+
+def _require_numpy() -> None:
+    """Raises an ImportError when numpy is not installed."""
+    if np is None:
+        raise ImportError(
+            "Ticker snapshots require numpy, install it with 'pip install mexc-api[data]'."
+        )
+
+
+def _get_scale(decimals: Decimals, field: str) -> int | None:
+    """Returns the decimals of a column, None for a float column."""
+    if decimals is None or isinstance(decimals, int):
+        return decimals
+    return decimals.get(field)
+
+
+def _parse_column(
+    values: list, field: str, decimals: int | None
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Converts decimal strings to floats, or exactly to ints scaled by
+    10**decimals, digits beyond decimals are rounded half to even.
+    Returns the column and the mask of missing values, which are nan in
+    float columns and 0 in int columns.
+    Raises an OverflowError when a scaled value does not fit in an int64.
+    """
+    missing = np.array([value is None or value == "" for value in values], dtype=bool)
+    if decimals is None:
+        column = np.array(
+            ["nan" if value is None or value == "" else value for value in values],
+            dtype=np.str_,
+        ).astype(np.float64)
+        return column, missing
+
+    scaled = []
+    for value in values:
+        if value is None or value == "":
+            scaled.append(0)
+            continue
+        number = int(
+            Decimal(str(value)).scaleb(decimals).to_integral_value(ROUND_HALF_EVEN)
+        )
+        if not INT64_MIN <= number <= INT64_MAX:
+            raise OverflowError(
+                f"{field} {value} scaled by 10**{decimals} does not fit in an int64."
+            )
+        scaled.append(number)
+    return np.array(scaled, dtype=np.int64), missing
+
+
+class TickerSnapshot:
+    """
+    Columnar snapshot of the ticker of all symbols.
+
+    Every field is a numpy array with one row per symbol. The rows are sorted
+    by symbol, index maps a symbol to its row. Values are floats, or ints
+    scaled by 10**decimals when decimals is given, parsed exactly from the
+    decimal strings. decimals is one scale for all fields or a scale per
+    field, fields without a scale are floats. missing holds a mask of the
+    missing values per field, which are nan in floats and 0 in ints.
+
+    Ranking and filtering across all symbols is vectorized:
+
+        top = snapshot.symbols[np.argsort(-snapshot["quoteVolume"])[:10]]
+    """
+
+    def __init__(
+        self,
+        symbols: "np.ndarray",
+        columns: dict[str, "np.ndarray"],
+        time_ms: int,
+        decimals: Decimals = None,
+        missing: dict[str, "np.ndarray"] | None = None,
+    ) -> None:
+        self.symbols = symbols
+        self.columns = columns
+        self.time_ms = time_ms
+        self.decimals = decimals
+        self.missing = missing or {
+            field: (
+                np.isnan(column)
+                if column.dtype.kind == "f"
+                else np.zeros(len(column), dtype=bool)
+            )
+            for field, column in columns.items()
+        }
+        self.index = {symbol: row for row, symbol in enumerate(symbols.tolist())}
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: list[dict],
+        fields: tuple[str, ...],
+        decimals: Decimals = None,
+        time_ms: int | None = None,
+    ) -> "TickerSnapshot":
+        """Creates a snapshot of the given fields of ticker rows."""
+        _require_numpy()
+        rows = sorted(rows, key=lambda row: row["symbol"])
+        columns = {}
+        missing = {}
+        for field in fields:
+            columns[field], missing[field] = _parse_column(
+                [row.get(field) for row in rows], field, _get_scale(decimals, field)
+            )
+        return cls(
+            np.array([row["symbol"] for row in rows], dtype=np.str_),
+            columns,
+            get_timestamp() if time_ms is None else time_ms,
+            decimals,
+            missing,
+        )
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __getitem__(self, field: str) -> "np.ndarray":
+        return self.columns[field]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.index
+
+    def get(self, symbol: str) -> dict[str, Any] | None:
+        """Returns the fields of a symbol as dict, missing values are None."""
+        row = self.index.get(symbol)
+        if row is None:
+            return None
+        return {
+            field: None if self.missing[field][row] else column[row].item()
+            for field, column in self.columns.items()
+        }
+
+    def select(self, mask: "np.ndarray") -> "TickerSnapshot":
+        """Returns a snapshot of the rows of a boolean mask or row indices."""
+        return TickerSnapshot(
+            self.symbols[mask],
+            {field: column[mask] for field, column in self.columns.items()},
+            self.time_ms,
+            self.decimals,
+            {field: missing[mask] for field, missing in self.missing.items()},
+        )
+
+    def diff(self, previous: "TickerSnapshot") -> "SnapshotDiff":
+        """Returns the changes since a previous snapshot."""
+        return SnapshotDiff(previous, self)
+
+
+class SnapshotDiff:
+    """
+    Differences between two snapshots of the same fields.
+
+    Rows are aligned by a vectorized search over the sorted symbols, so a
+    diff of all symbols takes a few numpy operations. rows and
+    previous_rows are the rows of the symbols in both snapshots.
+    """
+
+    def __init__(self, previous: TickerSnapshot, current: TickerSnapshot) -> None:
+        self.previous = previous
+        self.current = current
+
+        positions = np.searchsorted(previous.symbols, current.symbols)
+        positions[positions == len(previous.symbols)] = 0
+        in_previous = (
+            previous.symbols[positions] == current.symbols
+            if len(previous.symbols)
+            else np.zeros(len(current.symbols), dtype=bool)
+        )
+        self.rows = np.flatnonzero(in_previous)
+        self.previous_rows = positions[in_previous]
+
+        self.added = current.symbols[~in_previous]
+        self.removed = np.setdiff1d(
+            previous.symbols, current.symbols, assume_unique=True
+        )
+
+    def delta(self, field: str) -> "np.ndarray":
+        """
+        Returns the change of a field per symbol that is in both snapshots.
+        Check the missing masks of int fields, a missing value counts as 0.
+        """
+        return self.current[field][self.rows] - self.previous[field][self.previous_rows]
+
+    @property
+    def symbols(self) -> "np.ndarray":
+        """Returns the symbols that are in both snapshots."""
+        return self.current.symbols[self.rows]
+
+    @property
+    def changed(self) -> "np.ndarray":
+        """Returns the symbols of which any field changed or went missing."""
+        mask = np.zeros(len(self.rows), dtype=bool)
+        for field, column in self.current.columns.items():
+            old = self.previous[field][self.previous_rows]
+            new = column[self.rows]
+            old_missing = self.previous.missing[field][self.previous_rows]
+            new_missing = self.current.missing[field][self.rows]
+            mask |= ((new != old) & ~(new_missing & old_missing)) | (
+                new_missing != old_missing
+            )
+        return self.symbols[mask]
+
+
+def ticker_24h_snapshot(
+    market: _Market, decimals: Decimals = None
+) -> TickerSnapshot:
+    """Returns a snapshot of the 24 hour ticker of all symbols."""
+    return TickerSnapshot.from_rows(market.ticker_24h(), TICKER_24H_COLUMNS, decimals)
+
+
+def ticker_price_snapshot(
+    market: _Market, decimals: Decimals = None
+) -> TickerSnapshot:
+    """Returns a snapshot of the price of all symbols."""
+    return TickerSnapshot.from_rows(
+        market.ticker_price(), TICKER_PRICE_COLUMNS, decimals
+    )
+
+
+def book_ticker_snapshot(
+    market: _Market, decimals: Decimals = None
+) -> TickerSnapshot:
+    """Returns a snapshot of the best bid and ask of all symbols."""
+    return TickerSnapshot.from_rows(
+        market.ticker_book_price(), BOOK_TICKER_COLUMNS, decimals
+    )
@@ -0,0 +1,2 @@
+"""Testing utilities."""
+from .fake_server import FakeMexcServer
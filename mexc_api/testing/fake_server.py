@@ -0,0 +1,670 @@
+"""
+Defines the FakeMexcServer, a local stand-in for the MEXC REST and
+websocket api. Requires aiohttp.
+"""
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import random
+import zlib
+from threading import Event, Thread
+from types import TracebackType
+from typing import Any, Awaitable, Callable
+
+try:
+    from aiohttp import WSMsgType, web
+except ImportError:  # pragma: no cover
+    web = None  # type: ignore[assignment]
+
+from mexc_api.common.utils import get_timestamp
+
+Handler = Callable[["web.Request", dict], Awaitable[Any]]
+
+SIGNED_PREFIXES = (
+    "/api/v3/order",
+    "/api/v3/batchOrders",
+    "/api/v3/openOrders",
+    "/api/v3/allOrders",
+    "/api/v3/account",
+    "/api/v3/myTrades",
+    "/api/v3/userDataStream",
+    "/api/v3/sub-account",
+    "/api/v3/capital",
+    "/api/v3/rebate",
+    "/api/v3/mxDeduct",
+)
+DEPTH_LEVELS = 50
+
+
+def _error(status: int, code: int, msg: str) -> "web.Response":
+    """Returns a MEXC style error response."""
+    return web.json_response({"code": code, "msg": msg}, status=status)
+
+
+class FakeMarket:
+    """
+    Generates deterministic trades and depth updates of one symbol.
+    The depth snapshot and the diff updates share one version counter.
+    """
+
+    def __init__(self, symbol: str, price: float, seed: int = 0) -> None:
+        self.symbol = symbol
+        self.random = random.Random(zlib.crc32(symbol.encode()) ^ seed)
+        self.tick = 0.01
+        self.price = price
+        self.version = 1
+        self.bids = {
+            round(price - self.tick * index, 2): 1.0 for index in range(1, DEPTH_LEVELS)
+        }
+        self.asks = {
+            round(price + self.tick * index, 2): 1.0 for index in range(1, DEPTH_LEVELS)
+        }
+
+    def trade(self, time_ms: int) -> dict:
+        """Moves the price and returns a deal of the trades stream."""
+        self.price = round(
+            max(self.tick, self.price + self.tick * self.random.choice((-1, 0, 1))), 2
+        )
+        return {
+            "S": self.random.choice((1, 2)),
+            "p": f"{self.price:.2f}",
+            "t": time_ms,
+            "v": f"{self.random.uniform(0.001, 2):.4f}",
+        }
+
+    def depth_update(self) -> dict:
+        """Changes one level on each side and returns the diff."""
+        self.version += 1
+        update: dict[str, Any] = {"r": str(self.version)}
+        for name, levels, sign in (("bids", self.bids, -1), ("asks", self.asks, 1)):
+            price = round(
+                self.price + sign * self.tick * self.random.randint(1, DEPTH_LEVELS), 2
+            )
+            quantity = self.random.choice((0.0, self.random.uniform(0.1, 5)))
+            if quantity:
+                levels[price] = quantity
+            else:
+                levels.pop(price, None)
+            update[name] = [{"p": f"{price:.2f}", "v": f"{quantity:.4f}"}]
+        return update
+
+    def snapshot(self, limit: int = 100) -> dict:
+        """Returns the depth endpoint response."""
+        return {
+            "lastUpdateId": self.version,
+            "bids": [
+                [f"{price:.2f}", f"{self.bids[price]:.4f}"]
+                for price in sorted(self.bids, reverse=True)[:limit]
+            ],
+            "asks": [
+                [f"{price:.2f}", f"{self.asks[price]:.4f}"]
+                for price in sorted(self.asks)[:limit]
+            ],
+        }
+
+    def book_ticker(self) -> dict:
+        """Returns the best bid and ask."""
+        bid = max(self.bids, default=self.price)
+        ask = min(self.asks, default=self.price)
+        return {
+            "b": f"{bid:.2f}",
+            "B": f"{self.bids.get(bid, 0):.4f}",
+            "a": f"{ask:.2f}",
+            "A": f"{self.asks.get(ask, 0):.4f}",
+        }
+
+
+class FakeMexcServer:
+    """
+    Serves the REST routes of the endpoint modules and the websocket
+    subscription protocol on localhost.
+
+    Signed requests are checked like MEXC does: the api key header must
+    match, the timestamp must be within recvWindow and the signature must be
+    the HMAC SHA256 of the query string without the signature. Only the
+    market, order, account and listen key routes are served, the wallet,
+    sub-account, rebate, ETF and mxDeduct routes answer with a 404 error,
+    which the clients raise as MexcAPIError.
+
+    Every subscribed trades, depth, partial depth and book ticker stream gets
+    rate messages per second of deterministic traffic. Private and protobuf
+    streams are acknowledged but get no traffic.
+
+    Use async with on a running loop or with to run the server in a thread.
+    """
+
+    def __init__(
+        self,
+        api_key: str = "key",
+        api_secret: str = "secret",
+        symbols: tuple[str, ...] = ("BTCUSDT", "ETHUSDT"),
+        rate: float = 100.0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        if web is None:
+            raise ImportError(
+                "FakeMexcServer requires aiohttp, "
+                "install it with 'pip install mexc-api[async]'."
+            )
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.rate = rate
+        self.host = host
+        self.port = port
+        self.markets = {
+            symbol: FakeMarket(symbol, 100.0 * (index + 1), seed)
+            for index, symbol in enumerate(symbols)
+        }
+
+        self.requests = 0
+        self.messages = 0
+        self.orders: dict[str, dict] = {}
+        self.listen_keys: set[str] = set()
+        self._order_ids = itertools.count(1)
+        self._listen_key_ids = itertools.count(1)
+        self._runner: web.AppRunner | None = None
+        self._thread: Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopped = Event()
+
+        self.routes: dict[tuple[str, str], Handler] = {
+            ("GET", "/api/v3/ping"): self._empty,
+            ("GET", "/api/v3/time"): self._time,
+            ("GET", "/api/v3/defaultSymbols"): self._default_symbols,
+            ("GET", "/api/v3/exchangeInfo"): self._exchange_info,
+            ("GET", "/api/v3/depth"): self._depth,
+            ("GET", "/api/v3/trades"): self._trades,
+            ("GET", "/api/v3/aggTrades"): self._agg_trades,
+            ("GET", "/api/v3/klines"): self._klines,
+            ("GET", "/api/v3/avgPrice"): self._avg_price,
+            ("GET", "/api/v3/ticker/24hr"): self._ticker_24h,
+            ("GET", "/api/v3/ticker/price"): self._ticker_price,
+            ("GET", "/api/v3/ticker/bookTicker"): self._book_ticker,
+            ("POST", "/api/v3/order/test"): self._empty,
+            ("POST", "/api/v3/order"): self._new_order,
+            ("GET", "/api/v3/order"): self._get_order,
+            ("DELETE", "/api/v3/order"): self._cancel_order,
+            ("POST", "/api/v3/batchOrders"): self._batch_orders,
+            ("GET", "/api/v3/openOrders"): self._open_orders,
+            ("DELETE", "/api/v3/openOrders"): self._cancel_open_orders,
+            ("GET", "/api/v3/allOrders"): self._all_orders,
+            ("GET", "/api/v3/account"): self._account,
+            ("GET", "/api/v3/myTrades"): self._list,
+            ("POST", "/api/v3/userDataStream"): self._create_listen_key,
+            ("GET", "/api/v3/userDataStream"): self._get_listen_keys,
+            ("PUT", "/api/v3/userDataStream"): self._listen_key,
+            ("DELETE", "/api/v3/userDataStream"): self._listen_key,
+        }
+
+    @property
+    def base_url(self) -> str:
+        """Returns the base url of the REST api."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> str:
+        """Returns the url of the websocket api."""
+        return f"ws://{self.host}:{self.port}/ws"
+
+    def _get_market(self, params: dict) -> FakeMarket:
+        """Returns the market of the symbol parameter."""
+        return self.markets[params.get("symbol", next(iter(self.markets)))]
+
+    def _check_signature(self, request: "web.Request") -> "web.Response | None":
+        """Returns an error response if the request is not signed correctly."""
+        if request.headers.get("X-MEXC-APIKEY") != self.api_key:
+            return _error(400, 700001, "Api key info invalid")
+
+        query, _, signature = request.rel_url.raw_query_string.rpartition(
+            "&signature="
+        )
+        expected = hmac.new(
+            self.api_secret.encode(), query.encode(), hashlib.sha256
+        ).hexdigest()
+        if not hmac.compare_digest(signature, expected):
+            return _error(400, 700002, "Signature for this request is not valid.")
+
+        timestamp = int(request.query.get("timestamp", 0))
+        recv_window = int(request.query.get("recvWindow", 5000))
+        if abs(get_timestamp() - timestamp) > recv_window:
+            return _error(400, 700003, "Timestamp for this request is outside of the recvWindow.")
+        return None
+
+    async def _handle_rest(self, request: "web.Request") -> "web.StreamResponse":
+        """Checks the signature and calls the handler of a route."""
+        self.requests += 1
+        path = request.path
+        if path.startswith(SIGNED_PREFIXES) or "signature" in request.query:
+            error = self._check_signature(request)
+            if error is not None:
+                return error
+
+        handler = self.routes.get((request.method, path))
+        if handler is None:
+            return _error(404, 404, f"{request.method} {path} is not supported.")
+        params = dict(request.query)
+        try:
+            content = await handler(request, params)
+        except KeyError as error:
+            return _error(400, 700004, f"Invalid parameter {error}.")
+        if isinstance(content, web.Response):
+            return content
+        return web.json_response(content)
+
+    async def _empty(self, _request: "web.Request", _params: dict) -> Any:
+        return {}
+
+    async def _list(self, _request: "web.Request", _params: dict) -> Any:
+        return []
+
+    async def _time(self, _request: "web.Request", _params: dict) -> Any:
+        return {"serverTime": get_timestamp()}
+
+    async def _default_symbols(self, _request: "web.Request", _params: dict) -> Any:
+        return {"code": 0, "data": list(self.markets), "msg": None}
+
+    async def _exchange_info(self, _request: "web.Request", _params: dict) -> Any:
+        return {
+            "timezone": "CST",
+            "serverTime": get_timestamp(),
+            "symbols": [
+                {
+                    "symbol": symbol,
+                    "status": "1",
+                    "baseAsset": symbol[:-4],
+                    "quoteAsset": symbol[-4:],
+                    "baseAssetPrecision": 4,
+                    "quotePrecision": 2,
+                    "baseSizePrecision": "0.0001",
+                    "quoteAmountPrecision": "1",
+                    "maxQuoteAmount": "2000000",
+                    "orderTypes": ["LIMIT", "MARKET", "LIMIT_MAKER"],
+                    "isSpotTradingAllowed": True,
+                }
+                for symbol in self.markets
+            ],
+        }
+
+    async def _depth(self, _request: "web.Request", params: dict) -> Any:
+        return self._get_market(params).snapshot(int(params.get("limit", 100)))
+
+    async def _trades(self, _request: "web.Request", params: dict) -> Any:
+        market = self._get_market(params)
+        now = get_timestamp()
+        return [
+            {
+                "id": None,
+                "price": deal["p"],
+                "qty": deal["v"],
+                "quoteQty": f"{float(deal['p']) * float(deal['v']):.4f}",
+                "time": deal["t"],
+                "isBuyerMaker": deal["S"] == 2,
+                "isBestMatch": True,
+            }
+            for deal in (
+                market.trade(now) for _ in range(int(params.get("limit", 500)))
+            )
+        ]
+
+    async def _agg_trades(self, _request: "web.Request", params: dict) -> Any:
+        market = self._get_market(params)
+        end = int(params.get("endTime", get_timestamp()))
+        start = int(params.get("startTime", end - 60_000))
+        limit = int(params.get("limit", 500))
+        step = max(1, (end - start) // limit)
+        return [
+            {
+                "a": None,
+                "f": None,
+                "l": None,
+                "p": deal["p"],
+                "q": deal["v"],
+                "T": deal["t"],
+                "m": deal["S"] == 2,
+                "M": True,
+            }
+            for deal in (
+                market.trade(time_ms) for time_ms in range(start, end + 1, step)
+            )
+        ][:limit]
+
+    async def _klines(self, _request: "web.Request", params: dict) -> Any:
+        market = self._get_market(params)
+        units = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "M": 2_678_400_000}
+        interval = params["interval"]
+        interval_ms = int(interval[:-1]) * units[interval[-1]]
+        limit = int(params.get("limit", 500))
+        end = int(params.get("endTime", get_timestamp()))
+        start = int(params.get("startTime", end - interval_ms * (limit - 1)))
+        start -= start % interval_ms
+        klines = []
+        for open_time in range(start, end + 1, interval_ms)[:limit]:
+            prices = [float(market.trade(open_time)["p"]) for _ in range(4)]
+            klines.append(
+                [
+                    open_time,
+                    f"{prices[0]:.2f}",
+                    f"{max(prices):.2f}",
+                    f"{min(prices):.2f}",
+                    f"{prices[-1]:.2f}",
+                    "10.0",
+                    open_time + interval_ms,
+                    f"{10 * prices[-1]:.2f}",
+                ]
+            )
+        return klines
+
+    async def _avg_price(self, _request: "web.Request", params: dict) -> Any:
+        return {"mins": 5, "price": f"{self._get_market(params).price:.2f}"}
+
+    def _ticker(self, market: FakeMarket) -> dict:
+        """Returns the 24 hour ticker of a market."""
+        ticker = market.book_ticker()
+        return {
+            "symbol": market.symbol,
+            "priceChange": "0",
+            "priceChangePercent": "0",
+            "prevClosePrice": f"{market.price:.2f}",
+            "lastPrice": f"{market.price:.2f}",
+            "bidPrice": ticker["b"],
+            "bidQty": ticker["B"],
+            "askPrice": ticker["a"],
+            "askQty": ticker["A"],
+            "openPrice": f"{market.price:.2f}",
+            "highPrice": f"{market.price:.2f}",
+            "lowPrice": f"{market.price:.2f}",
+            "volume": "1000",
+            "quoteVolume": f"{1000 * market.price:.2f}",
+            "openTime": get_timestamp() - 86_400_000,
+            "closeTime": get_timestamp(),
+            "count": None,
+        }
+
+    async def _ticker_24h(self, _request: "web.Request", params: dict) -> Any:
+        if "symbol" in params:
+            return self._ticker(self._get_market(params))
+        return [self._ticker(market) for market in self.markets.values()]
+
+    async def _ticker_price(self, _request: "web.Request", params: dict) -> Any:
+        tickers = [
+            {"symbol": market.symbol, "price": f"{market.price:.2f}"}
+            for market in self.markets.values()
+        ]
+        if "symbol" in params:
+            return tickers[list(self.markets).index(params["symbol"])]
+        return tickers
+
+    async def _book_ticker(self, _request: "web.Request", params: dict) -> Any:
+        tickers = []
+        for market in self.markets.values():
+            ticker = market.book_ticker()
+            tickers.append(
+                {
+                    "symbol": market.symbol,
+                    "bidPrice": ticker["b"],
+                    "bidQty": ticker["B"],
+                    "askPrice": ticker["a"],
+                    "askQty": ticker["A"],
+                }
+            )
+        if "symbol" in params:
+            return tickers[list(self.markets).index(params["symbol"])]
+        return tickers
+
+    def _create_order(self, params: dict) -> dict:
+        """Stores a new order and returns the order response."""
+        market = self._get_market(params)
+        order_id = f"C02__{next(self._order_ids)}"
+        order = {
+            "symbol": market.symbol,
+            "orderId": order_id,
+            "orderListId": -1,
+            "clientOrderId": params.get("newClientOrderId", ""),
+            "price": params.get("price", f"{market.price:.2f}"),
+            "origQty": params.get("quantity", "0"),
+            "executedQty": "0",
+            "cummulativeQuoteQty": "0",
+            "status": "NEW",
+            "timeInForce": None,
+            "type": params["type"],
+            "side": params["side"],
+            "transactTime": get_timestamp(),
+        }
+        self.orders[order_id] = order
+        return order
+
+    async def _new_order(self, _request: "web.Request", params: dict) -> Any:
+        return self._create_order(params)
+
+    async def _batch_orders(self, _request: "web.Request", params: dict) -> Any:
+        return [self._create_order(order) for order in json.loads(params["batchOrders"])]
+
+    def _find_order(self, params: dict) -> dict | None:
+        """Returns an order by order id or client order id."""
+        if "orderId" in params:
+            return self.orders.get(params["orderId"])
+        for order in self.orders.values():
+            if order["clientOrderId"] == params.get("origClientOrderId"):
+                return order
+        return None
+
+    async def _get_order(self, _request: "web.Request", params: dict) -> Any:
+        return self._find_order(params) or _error(400, -2013, "Order does not exist.")
+
+    async def _cancel_order(self, _request: "web.Request", params: dict) -> Any:
+        order = self._find_order(params)
+        if order is None:
+            return _error(400, -2011, "Unknown order sent.")
+        order["status"] = "CANCELED"
+        return order
+
+    async def _cancel_open_orders(self, request: "web.Request", params: dict) -> Any:
+        orders = await self._open_orders(request, params)
+        for order in orders:
+            order["status"] = "CANCELED"
+        return orders
+
+    async def _open_orders(self, _request: "web.Request", params: dict) -> Any:
+        return [
+            order
+            for order in self.orders.values()
+            if order["status"] == "NEW" and order["symbol"] == params.get("symbol")
+        ]
+
+    async def _all_orders(self, _request: "web.Request", params: dict) -> Any:
+        start_ms = int(params.get("startTime", 0))
+        end_ms = int(params.get("endTime", 1 << 62))
+        orders = [
+            order
+            for order in self.orders.values()
+            if order["symbol"] == params.get("symbol")
+            and start_ms <= order["transactTime"] <= end_ms
+        ]
+        return orders[: int(params.get("limit", 500))]
+
+    async def _account(self, _request: "web.Request", _params: dict) -> Any:
+        return {
+            "canTrade": True,
+            "canWithdraw": True,
+            "canDeposit": True,
+            "updateTime": None,
+            "accountType": "SPOT",
+            "balances": [
+                {"asset": "USDT", "free": "10000", "locked": "0"},
+                *(
+                    {"asset": symbol[:-4], "free": "100", "locked": "0"}
+                    for symbol in self.markets
+                ),
+            ],
+            "permissions": ["SPOT"],
+        }
+
+    async def _create_listen_key(self, _request: "web.Request", _params: dict) -> Any:
+        listen_key = hashlib.sha256(
+            str(next(self._listen_key_ids)).encode()
+        ).hexdigest()
+        self.listen_keys.add(listen_key)
+        return {"listenKey": listen_key}
+
+    async def _get_listen_keys(self, _request: "web.Request", _params: dict) -> Any:
+        return {"listenKey": sorted(self.listen_keys)}
+
+    async def _listen_key(self, request: "web.Request", params: dict) -> Any:
+        listen_key = params["listenKey"]
+        if listen_key not in self.listen_keys:
+            raise KeyError("listenKey")
+        if request.method == "DELETE":
+            self.listen_keys.discard(listen_key)
+        return {"listenKey": listen_key}
+
+    def _get_stream_message(self, stream: str, time_ms: int) -> dict | None:
+        """Returns the next message of a public json stream."""
+        parts = stream.split("@")
+        if len(parts) < 3 or parts[2] not in self.markets or stream.endswith(".pb"):
+            return None
+        market = self.markets[parts[2]]
+        channel = parts[1]
+
+        if channel == "public.deals.v3.api":
+            data: dict = {"deals": [market.trade(time_ms)]}
+        elif channel == "public.increase.depth.v3.api":
+            data = market.depth_update()
+        elif channel == "public.bookTicker.v3.api":
+            market.trade(time_ms)
+            data = market.book_ticker()
+        elif channel == "public.limit.depth.v3.api":
+            market.depth_update()
+            snapshot = market.snapshot(int(parts[3]))
+            data = {
+                side: [{"p": price, "v": quantity} for price, quantity in snapshot[side]]
+                for side in ("bids", "asks")
+            }
+            data["r"] = str(market.version)
+        else:
+            return None
+        data["e"] = f"spot@{channel}"
+        return {"c": stream, "d": data, "s": market.symbol, "t": time_ms}
+
+    async def _publish(self, websocket: "web.WebSocketResponse", streams: set[str]) -> None:
+        """Sends rate messages per second for every subscribed stream."""
+        interval = max(0.001, 1 / self.rate)
+        loop = asyncio.get_running_loop()
+        last = loop.time()
+        due = 0.0
+        while not websocket.closed:
+            await asyncio.sleep(interval)
+            now = loop.time()
+            due += (now - last) * self.rate
+            last = now
+            count, due = int(due), due % 1
+            time_ms = get_timestamp()
+            for stream in list(streams):
+                for _ in range(count):
+                    message = self._get_stream_message(stream, time_ms)
+                    if message is None:
+                        break
+                    await websocket.send_str(json.dumps(message))
+                    self.messages += 1
+
+    async def _handle_websocket(self, request: "web.Request") -> "web.StreamResponse":
+        """Handles the subscription protocol of one connection."""
+        listen_key = request.query.get("listenKey")
+        if listen_key is not None and listen_key not in self.listen_keys:
+            return _error(401, 700001, "Invalid listen key")
+
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        streams: set[str] = set()
+        publisher = asyncio.create_task(self._publish(websocket, streams))
+        try:
+            async for message in websocket:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                data = json.loads(message.data)
+                method = data.get("method")
+                params = data.get("params", [])
+                if method == "PING":
+                    await websocket.send_json({"id": 0, "code": 0, "msg": "PONG"})
+                    continue
+                if method == "SUBSCRIPTION":
+                    streams.update(params)
+                elif method == "UNSUBSCRIPTION":
+                    streams.difference_update(params)
+                else:
+                    await websocket.send_json({"id": 0, "code": 1, "msg": "Invalid method"})
+                    continue
+                await websocket.send_json({"id": 0, "code": 0, "msg": ",".join(params)})
+        finally:
+            publisher.cancel()
+        return websocket
+
+    async def start(self) -> None:
+        """Starts the server on the running loop."""
+        app = web.Application()
+        app.router.add_get("/ws", self._handle_websocket)
+        app.router.add_route("*", "/api/v3/{path:.*}", self._handle_rest)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Stops the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _run(self, started: Event) -> None:
+        """Runs the server on a loop in this thread until stopped."""
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self.start())
+        started.set()
+        self._loop.run_until_complete(asyncio.to_thread(self._stopped.wait))
+        self._loop.run_until_complete(self.stop())
+        self._loop.close()
+
+    def start_in_thread(self) -> None:
+        """Starts the server in a daemon thread."""
+        started = Event()
+        self._stopped.clear()
+        self._thread = Thread(
+            target=self._run, args=(started,), daemon=True, name="Fake mexc server"
+        )
+        self._thread.start()
+        started.wait()
+
+    def stop_thread(self) -> None:
+        """Stops the server thread."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "FakeMexcServer":
+        self.start_in_thread()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop_thread()
+
+    async def __aenter__(self) -> "FakeMexcServer":
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.stop()
@@ -1,2 +1,28 @@
-"""Websocket."""
-from .websocket_stream import SpotWebsocketStreamClient
+"""
+Websocket.
+The clients are imported on first access, so importing the package does not
+load the REST or asyncio stack of clients that are not used.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .async_stream import AsyncWebsocketStreamClient
+    from .sharded_stream import ShardedWebsocketStreamClient
+    from .websocket_stream import SpotWebsocketStreamClient
+
+_MODULES = {
+    "AsyncWebsocketStreamClient": ".async_stream",
+    "ShardedWebsocketStreamClient": ".sharded_stream",
+    "SpotWebsocketStreamClient": ".websocket_stream",
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_MODULES[name], __name__), name)
+    globals()[name] = value
+    return value
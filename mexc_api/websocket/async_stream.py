@@ -0,0 +1,293 @@
+"""Defines the AsyncWebsocketStreamClient."""
+import asyncio
+import json
+import logging
+from types import TracebackType
+from typing import Any
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore[assignment]
+
+from mexc_api.common.enums import Action
+from mexc_api.common.exceptions import MexcAPIError
+from mexc_api.spot import AsyncSpot
+
+from .listen_key_manager import ListenKeyManager
+from .mexc_websocket_app import STREAM_URL
+from .subscription_manager import SubscriptionManager
+from .websocket_stream import BaseStreamClient
+
+
+class AsyncWebsocketStreamClient(BaseStreamClient):
+    """
+    Handles the stream subscriptions with asyncio.
+
+    The connection, ping, reconnect and listen key renewal run as tasks on
+    the running loop, started by start or async with. Received messages are
+    yielded by async iteration, text frames as dicts and binary frames as
+    decoded PushDataV3ApiWrapper messages.
+
+    The subscription methods can be called at any time, streams subscribed
+    before the connection is open are sent once it is.
+
+    Without api key and secret the client is public, it connects without a
+    listen key and only supports the public streams.
+
+    With a listen key manager the listen key is taken from the manager, which
+    renews and rotates it. Otherwise the client creates and renews its own
+    listen key and deletes it on close.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        api_secret: str | None = None,
+        protobuf: bool = False,
+        url: str = STREAM_URL,
+        ping_interval: float = 20,
+        reconnect_delay: float = 1,
+        keep_alive_interval: float = 1800,
+        queue_size: int = 0,
+        base_url: str = "https://api.mexc.com",
+        listen_key_manager: ListenKeyManager | None = None,
+    ) -> None:
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncWebsocketStreamClient requires aiohttp, "
+                "install it with 'pip install mexc-api[async]'."
+            )
+        super().__init__(protobuf, api_key is None or api_secret is None)
+        self.logger = logging.getLogger(__name__)
+        self.spot = (
+            None
+            if api_key is None or api_secret is None
+            else AsyncSpot(api_key, api_secret, base_url=base_url)
+        )
+        self.url = url
+        self.ping_interval = ping_interval
+        self.reconnect_delay = reconnect_delay
+        self.keep_alive_interval = keep_alive_interval
+        self.listen_key_manager = listen_key_manager
+        self._credentials = (
+            None if api_key is None or api_secret is None else (api_key, api_secret)
+        )
+
+        self.listen_key: str | None = None
+        self.subscriptions = SubscriptionManager(self._send)
+        self.messages: asyncio.Queue = asyncio.Queue(queue_size)
+        self._outgoing: asyncio.Queue[dict] = asyncio.Queue()
+        self._session: aiohttp.ClientSession | None = None
+        self._websocket: aiohttp.ClientWebSocketResponse | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._closed = False
+
+    @property
+    def streams(self) -> set[str]:
+        """Returns the subscribed streams."""
+        return self.subscriptions.desired
+
+    def _send(self, message: dict) -> None:
+        """Queues a message for the writer of the connection."""
+        self._outgoing.put_nowait(message)
+
+    def _change_subscription(
+        self, stream: str, action: Action = Action.SUBSCRIBE
+    ) -> None:
+        """Subscribes to or unsubscribes from stream."""
+        self.subscriptions.change([stream], action)
+
+    def start(self) -> None:
+        """Starts the connection and listen key tasks on the running loop."""
+        if self._tasks:
+            return
+        self._closed = False
+        self._loop = asyncio.get_running_loop()
+        self._tasks = [asyncio.create_task(self._run(), name="Mexc websocket")]
+        if self.spot is not None and self.listen_key_manager is None:
+            self._tasks.append(
+                asyncio.create_task(
+                    self._keep_alive(self.spot), name="Mexc keep alive listen key"
+                )
+            )
+
+    async def _keep_alive(self, spot: AsyncSpot) -> None:
+        """Keeps the listen key alive."""
+        while True:
+            await asyncio.sleep(self.keep_alive_interval)
+            if self.listen_key is None:
+                continue
+            try:
+                await spot.account.keep_alive_listen_key(self.listen_key)
+            except Exception:  # pylint: disable=broad-exception-caught
+                self.logger.exception("Listen key renewal failed.")
+                self.listen_key = None
+
+    def _on_rotate(self, listen_key: str) -> None:
+        """Reconnects with a new listen key, called by the manager thread."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._rotate, listen_key)
+
+    def _rotate(self, listen_key: str) -> None:
+        """Closes the connection, so it reconnects with the new listen key."""
+        self.listen_key = listen_key
+        if self._websocket is not None:
+            asyncio.create_task(self._websocket.close())
+
+    async def _get_listen_key(self) -> str | None:
+        """Returns the listen key, creating or acquiring it when needed."""
+        if self.listen_key is not None or self._credentials is None:
+            return self.listen_key
+        if self.listen_key_manager is not None:
+            self.listen_key = await asyncio.to_thread(
+                self.listen_key_manager.acquire, *self._credentials, self._on_rotate
+            )
+        elif self.spot is not None:
+            self.listen_key = await self.spot.account.create_listen_key()
+        return self.listen_key
+
+    def _release_listen_key(self) -> None:
+        """Drops the listen key, it is returned to the manager if there is one."""
+        if self.listen_key_manager is not None and self.listen_key is not None:
+            self.listen_key_manager.release(self.listen_key, self._on_rotate)
+        self.listen_key = None
+
+    async def _delete_listen_key(self) -> None:
+        """Deletes the listen key the client created itself."""
+        if self.spot is None or self.listen_key is None:
+            return
+        try:
+            await self.spot.account.delete_listen_key(self.listen_key)
+        except (MexcAPIError, aiohttp.ClientError, asyncio.TimeoutError) as error:
+            self.logger.warning("Deleting the listen key failed: %s", error)
+        self.listen_key = None
+
+    async def _ping(self, websocket: "aiohttp.ClientWebSocketResponse") -> None:
+        """
+        Sends a ping message every ping interval.
+        Expired subscriptions are retried, also when no messages arrive.
+        """
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await websocket.send_json({"method": "PING"})
+            self.subscriptions.retry_expired()
+
+    async def _write(self, websocket: "aiohttp.ClientWebSocketResponse") -> None:
+        """Sends the queued messages."""
+        while True:
+            message = await self._outgoing.get()
+            self.logger.debug("Sending message to Mexc WebSocket Server: %s", message)
+            await websocket.send_json(message)
+
+    async def _read(self, websocket: "aiohttp.ClientWebSocketResponse") -> None:
+        """
+        Puts the received messages in the message queue.
+        Frames that can not be decoded are logged and skipped.
+        """
+        async for message in websocket:
+            try:
+                if message.type == aiohttp.WSMsgType.BINARY:
+                    self.subscriptions.retry_expired()
+                    await self.messages.put(self._decode_frame(message.data))
+                elif message.type == aiohttp.WSMsgType.TEXT:
+                    data = json.loads(message.data)
+                    if not self.subscriptions.process_message(data):
+                        await self.messages.put(data)
+                elif message.type == aiohttp.WSMsgType.ERROR:
+                    raise websocket.exception() or ConnectionError()
+            except ValueError as error:
+                self.logger.warning("Skipped an invalid Mexc WebSocket frame: %s", error)
+
+    async def _connect(self) -> None:
+        """Connects once and handles the connection until it is closed."""
+        listen_key = await self._get_listen_key()
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+
+        params = {} if listen_key is None else {"listenKey": listen_key}
+        async with self._session.ws_connect(self.url, params=params) as websocket:
+            self._websocket = websocket
+            self.logger.debug("Mexc WebSocket connection opened.")
+            while not self._outgoing.empty():
+                self._outgoing.get_nowait()
+            self.subscriptions.reset()
+
+            tasks = [
+                asyncio.create_task(self._read(websocket)),
+                asyncio.create_task(self._write(websocket)),
+                asyncio.create_task(self._ping(websocket)),
+            ]
+            try:
+                done, _ = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                for task in tasks:
+                    task.cancel()
+            for task in done:
+                task.result()
+
+    async def _run(self) -> None:
+        """Reconnects until the client is closed."""
+        while not self._closed:
+            try:
+                await self._connect()
+                self.logger.debug("Mexc WebSocket connection closed.")
+            except aiohttp.WSServerHandshakeError as error:
+                self.logger.warning("Mexc WebSocket connection refused: %s", error)
+                self._release_listen_key()
+            except (
+                aiohttp.ClientError,
+                ConnectionError,
+                asyncio.TimeoutError,
+                MexcAPIError,
+            ) as error:
+                self.logger.warning("Mexc WebSocket connection lost: %s", error)
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def close(self) -> None:
+        """Stops the connection and ends the iteration."""
+        self._closed = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._websocket = None
+        if self.listen_key_manager is None:
+            await self._delete_listen_key()
+        self._release_listen_key()
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self.spot is not None:
+            await self.spot.close()
+        try:
+            self.messages.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    def __aiter__(self) -> "AsyncWebsocketStreamClient":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._closed and self.messages.empty():
+            raise StopAsyncIteration
+        message = await self.messages.get()
+        if message is None and self._closed:
+            raise StopAsyncIteration
+        return message
+
+    async def __aenter__(self) -> "AsyncWebsocketStreamClient":
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
@@ -0,0 +1,220 @@
+"""Defines the Balance and BalanceStore classes."""
+import logging
+import math
+from threading import Event, Lock, Thread
+from typing import Any, Callable
+
+from mexc_api.common.exceptions import MexcAPIError
+from mexc_api.spot import Spot
+
+from .websocket_stream import SpotWebsocketStreamClient
+
+ACCOUNT_STREAM = "spot@private.account.v3.api"
+
+
+class Balance:
+    """The balance of an asset, which is never modified once stored."""
+
+    __slots__ = ("asset", "free", "locked", "update_time")
+
+    def __init__(self, asset: str, free: float, locked: float, update_time: int) -> None:
+        self.asset = asset
+        self.free = free
+        self.locked = locked
+        self.update_time = update_time
+
+    @property
+    def total(self) -> float:
+        """Returns the free and locked balance."""
+        return self.free + self.locked
+
+    def __repr__(self) -> str:
+        return f"Balance({self.asset}, free={self.free}, locked={self.locked})"
+
+
+class BalanceStore:
+    """
+    Maintains the balances of an account from the account updates stream.
+
+    seed loads all balances with get_account_info. Every stream update
+    stores a new Balance of its asset. Balances are replaced, never
+    modified, so free, locked and get read without a lock and without
+    requests and always see both values of one update.
+
+    An update whose change does not lead from the stored balance to the new
+    one shows missed updates, its balance is stored and the store is
+    reconciled with get_account_info in the background. on_open, passed as
+    on_open of the stream client, reconciles after a reconnect. With
+    reconcile_interval the store is also reconciled periodically. Stream
+    updates received while a reconcile request is in flight are applied to
+    its response, assets missing in the response are removed and passed to
+    on_change with a zero balance.
+    """
+
+    def __init__(
+        self,
+        spot: Spot,
+        client: SpotWebsocketStreamClient | None = None,
+        on_change: Callable[[Balance], None] | None = None,
+        reconcile_interval: float | None = None,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.spot = spot
+        self.client = client
+        self.on_change = on_change
+        self.reconcile_interval = reconcile_interval
+
+        self.reconciles = 0
+        self.inconsistencies = 0
+
+        self._balances: dict[str, Balance] = {}
+        # Stream updates received while a reconcile request is in flight.
+        self._buffer: list[Balance] | None = None
+        self._lock = Lock()
+        self._reconcile_lock = Lock()
+        self._due = Event()
+        self._stopped = Event()
+        self._thread: Thread | None = None
+        if client:
+            client.account_updates()
+        if reconcile_interval is not None:
+            self._start()
+
+    def get(self, asset: str) -> Balance | None:
+        """Returns the balance of an asset."""
+        return self._balances.get(asset)
+
+    def free(self, asset: str) -> float:
+        """Returns the free balance of an asset, 0 for unknown assets."""
+        balance = self._balances.get(asset)
+        return 0.0 if balance is None else balance.free
+
+    def locked(self, asset: str) -> float:
+        """Returns the locked balance of an asset, 0 for unknown assets."""
+        balance = self._balances.get(asset)
+        return 0.0 if balance is None else balance.locked
+
+    @property
+    def balances(self) -> dict[str, Balance]:
+        """Returns a copy of all balances."""
+        return dict(self._balances)
+
+    def _changed(self, balance: Balance) -> None:
+        """Calls on_change with a new balance."""
+        if self.on_change is not None:
+            self.on_change(balance)
+
+    def process_message(self, message: Any) -> bool:
+        """
+        Applies an account updates stream message.
+        Returns false if the message is of another stream.
+        """
+        if not isinstance(message, dict) or message.get("c") != ACCOUNT_STREAM:
+            return False
+
+        data = message["d"]
+        balance = Balance(data["a"], float(data["f"]), float(data["l"]), data["c"])
+        with self._lock:
+            old = self._balances.get(balance.asset)
+            if old is not None and old.update_time > balance.update_time:
+                return True
+            if old is not None and not (
+                math.isclose(old.free + float(data["fd"]), balance.free, abs_tol=1e-12)
+                and math.isclose(
+                    old.locked + float(data["ld"]), balance.locked, abs_tol=1e-12
+                )
+            ):
+                self.inconsistencies += 1
+                self.logger.warning("Balance %s missed updates, reconciling.", balance.asset)
+                self.request_reconcile()
+            self._balances[balance.asset] = balance
+            if self._buffer is not None:
+                self._buffer.append(balance)
+            self._changed(balance)
+        return True
+
+    def seed(self) -> None:
+        """Loads all balances."""
+        self.reconcile()
+
+    def reconcile(self) -> None:
+        """Replaces the balances with the response of get_account_info."""
+        with self._reconcile_lock:
+            with self._lock:
+                self._buffer = []
+            try:
+                response = self.spot.account.get_account_info()
+            except BaseException:
+                with self._lock:
+                    self._buffer = None
+                raise
+
+            update_time = response.get("updateTime") or 0
+            with self._lock:
+                buffered, self._buffer = self._buffer or [], None
+                self.reconciles += 1
+                balances = {
+                    row["asset"]: Balance(
+                        row["asset"],
+                        float(row["free"]),
+                        float(row["locked"]),
+                        update_time,
+                    )
+                    for row in response.get("balances", [])
+                }
+                for balance in buffered:
+                    if balance.update_time >= update_time:
+                        balances[balance.asset] = balance
+                old_balances, self._balances = self._balances, balances
+                changed = [
+                    balance
+                    for asset, balance in balances.items()
+                    if asset not in old_balances
+                    or (old_balances[asset].free, old_balances[asset].locked)
+                    != (balance.free, balance.locked)
+                ]
+                changed.extend(
+                    Balance(asset, 0.0, 0.0, update_time)
+                    for asset in old_balances
+                    if asset not in balances
+                )
+                for balance in changed:
+                    self._changed(balance)
+
+    def request_reconcile(self) -> None:
+        """Reconciles the balances in the background."""
+        self._start()
+        self._due.set()
+
+    def on_open(self) -> None:
+        """Reconciles the balances after a reconnect."""
+        if self._balances:
+            self.request_reconcile()
+
+    def _start(self) -> None:
+        """Starts the reconcile thread once."""
+        if self._thread is None and not self._stopped.is_set():
+            self._thread = Thread(
+                target=self._run, daemon=True, name="Mexc balance store"
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Reconciles when requested or every reconcile_interval."""
+        while True:
+            self._due.wait(self.reconcile_interval)
+            if self._stopped.is_set():
+                return
+            self._due.clear()
+            try:
+                self.reconcile()
+            except (MexcAPIError, OSError) as error:
+                self.logger.error("Reconciling the balances failed: %s", error)
+
+    def stop(self) -> None:
+        """Stops the reconcile thread."""
+        self._stopped.set()
+        self._due.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,236 @@
+"""Defines the Candle and CandleBuilder classes."""
+import logging
+from threading import Lock
+from typing import Any, Callable, Iterable
+
+from mexc_api.common.utils import get_timestamp
+from mexc_api.spot.endpoints._market import _Market
+
+UNIT_MS = {"s": 1000, "m": 60_000, "h": 3_600_000, "d": 86_400_000}
+
+# The aggregate trades endpoint accepts at most one hour between start and end.
+AGG_TRADES_WINDOW_MS = 3_600_000
+
+
+def parse_interval(interval: str | int) -> int:
+    """Returns the length of an interval like 5s, 1m or 4h in milliseconds."""
+    if isinstance(interval, int):
+        return interval
+    return int(interval[:-1]) * UNIT_MS[interval[-1]]
+
+
+def fetch_agg_trades(
+    market: _Market, symbol: str, start_ms: int, end_ms: int
+) -> list[dict]:
+    """Fetches the aggregate trades of a symbol between start_ms and end_ms."""
+    trades: list[dict] = []
+    while start_ms < end_ms:
+        window_end = min(start_ms + AGG_TRADES_WINDOW_MS, end_ms) - 1
+        page = market.agg_trades(symbol, start_ms, window_end, 1000)
+        trades.extend(page)
+        if len(page) == 1000:
+            start_ms = page[-1]["T"] + 1
+        else:
+            start_ms = window_end + 1
+    return trades
+
+
+class Candle:
+    """An OHLCV bar of one interval."""
+
+    __slots__ = (
+        "symbol",
+        "interval_ms",
+        "open_time",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "quote_volume",
+        "trades",
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        interval_ms: int,
+        open_time: int,
+        price: float,
+        quantity: float,
+        trades: int = 1,
+    ) -> None:
+        self.symbol = symbol
+        self.interval_ms = interval_ms
+        self.open_time = open_time
+        self.open = price
+        self.high = price
+        self.low = price
+        self.close = price
+        self.volume = quantity
+        self.quote_volume = price * quantity
+        self.trades = trades
+
+    @property
+    def close_time(self) -> int:
+        """Returns the last millisecond of the bar."""
+        return self.open_time + self.interval_ms - 1
+
+    def update(self, price: float, quantity: float) -> None:
+        """Adds a trade to the bar."""
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += quantity
+        self.quote_volume += price * quantity
+        self.trades += 1
+
+    def __repr__(self) -> str:
+        return (
+            f"Candle({self.symbol}, {self.interval_ms}, {self.open_time}, "
+            f"o={self.open}, h={self.high}, l={self.low}, c={self.close}, "
+            f"v={self.volume})"
+        )
+
+
+class CandleBuilder:
+    """
+    Builds OHLCV bars of any intervals from the trades of one symbol.
+
+    Every trade updates the open bar of each interval in O(1). A bar is
+    passed to on_candle when the first trade of a later bar arrives or when
+    close_expired is called after it ended. Intervals without trades emit
+    no bar, unless fill_gaps is set which emits bars without volume at the
+    last close.
+
+    Pass process_message as on_message or as dispatcher route of the trades
+    stream. backfill loads the trades of the open bars from the aggregate
+    trades endpoint, so bars started before the stream are complete.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        intervals: Iterable[str | int],
+        on_candle: Callable[[Candle], None] | None = None,
+        fill_gaps: bool = False,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.symbol = symbol.upper()
+        self.intervals = sorted({parse_interval(interval) for interval in intervals})
+        self.on_candle = on_candle
+        self.fill_gaps = fill_gaps
+
+        self.candles: dict[int, Candle] = {}
+        self.late_trades = 0
+        self._emitted: dict[int, int] = {}
+        self._buffer: list[tuple[float, float, int]] | None = None
+        self._lock = Lock()
+
+    def _emit(self, candle: Candle) -> None:
+        """Passes a closed bar to the callback once."""
+        if candle.open_time <= self._emitted.get(candle.interval_ms, -1):
+            return
+        self._emitted[candle.interval_ms] = candle.open_time
+        if self.on_candle is not None:
+            self.on_candle(candle)
+
+    def _emit_gaps(self, candle: Candle, open_time: int) -> None:
+        """Emits empty bars between a closed bar and the next open time."""
+        for gap_time in range(
+            candle.open_time + candle.interval_ms, open_time, candle.interval_ms
+        ):
+            self._emit(
+                Candle(self.symbol, candle.interval_ms, gap_time, candle.close, 0.0, 0)
+            )
+
+    def _add_trade(self, price: float, quantity: float, time_ms: int) -> None:
+        """Adds a trade to the open bar of every interval."""
+        for interval_ms in self.intervals:
+            open_time = time_ms - time_ms % interval_ms
+            candle = self.candles.get(interval_ms)
+            if candle is not None and open_time == candle.open_time:
+                candle.update(price, quantity)
+                continue
+            if candle is not None and open_time < candle.open_time:
+                self.late_trades += 1
+                continue
+
+            if candle is not None:
+                self._emit(candle)
+                if self.fill_gaps:
+                    self._emit_gaps(candle, open_time)
+            self.candles[interval_ms] = Candle(
+                self.symbol, interval_ms, open_time, price, quantity
+            )
+
+    def add_trade(self, price: float, quantity: float, time_ms: int) -> None:
+        """Adds a trade, trades older than the open bar are counted as late."""
+        with self._lock:
+            if self._buffer is not None:
+                self._buffer.append((price, quantity, time_ms))
+            else:
+                self._add_trade(price, quantity, time_ms)
+
+    def process_message(self, message: Any) -> None:
+        """Adds the deals of a json or protobuf trades stream message."""
+        if isinstance(message, dict):
+            for deal in message["d"]["deals"]:
+                self.add_trade(float(deal["p"]), float(deal["v"]), deal["t"])
+        else:
+            for deal in message.publicAggreDeals.deals:
+                self.add_trade(float(deal.price), float(deal.quantity), deal.time)
+
+    def close_expired(self, now_ms: int | None = None) -> None:
+        """Emits the bars that ended before now_ms."""
+        now_ms = get_timestamp() if now_ms is None else now_ms
+        with self._lock:
+            for interval_ms, candle in list(self.candles.items()):
+                if candle.close_time < now_ms:
+                    self._emit(candle)
+                    if self.fill_gaps:
+                        self._emit_gaps(candle, now_ms - now_ms % interval_ms)
+                    del self.candles[interval_ms]
+
+    def _fetch_trades(
+        self, market: _Market, start_ms: int, end_ms: int
+    ) -> list[tuple[float, float, int]]:
+        """Fetches the aggregate trades between start_ms and end_ms."""
+        return [
+            (float(trade["p"]), float(trade["q"]), trade["T"])
+            for trade in fetch_agg_trades(market, self.symbol, start_ms, end_ms)
+        ]
+
+    def backfill(self, market: _Market, now_ms: int | None = None) -> None:
+        """
+        Rebuilds the open bars from the aggregate trades endpoint.
+        Stream trades received meanwhile are buffered and added afterwards,
+        only rest trades before the first buffered trade are used. When the
+        request fails the bars are kept, the buffered trades are added to
+        them and the error is raised.
+        """
+        now_ms = get_timestamp() if now_ms is None else now_ms
+        start_ms = now_ms - now_ms % self.intervals[-1]
+        with self._lock:
+            self._buffer = []
+
+        try:
+            trades = self._fetch_trades(market, start_ms, now_ms + 1)
+        except BaseException:
+            with self._lock:
+                buffer, self._buffer = self._buffer or [], None
+                for trade in buffer:
+                    self._add_trade(*trade)
+            raise
+
+        with self._lock:
+            buffer, self._buffer = self._buffer or [], None
+            if buffer:
+                trades = [trade for trade in trades if trade[2] < buffer[0][2]]
+
+            self.candles = {}
+            for trade in sorted(trades, key=lambda trade: trade[2]) + buffer:
+                self._add_trade(*trade)
+        self.logger.debug("Backfilled %s trades of %s.", len(trades), self.symbol)
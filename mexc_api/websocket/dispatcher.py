@@ -0,0 +1,180 @@
+"""Defines the Dispatcher and Route classes."""
+import logging
+from collections import deque
+from threading import Condition, Lock, Thread
+from typing import Any, Callable
+
+from mexc_api.common.enums import OverflowPolicy
+
+
+def get_channel(message: Any) -> str | None:
+    """Returns the stream of a json or protobuf message."""
+    if isinstance(message, dict):
+        return message.get("c")
+    return getattr(message, "channel", None)
+
+
+class Route:
+    """
+    Passes the messages of one stream to a handler.
+
+    Without workers the handler is called on the websocket thread.
+    Otherwise messages are put in a queue of at most max_size messages,
+    which is handled by the worker threads. The policy decides what happens
+    with a message when the queue is full, with CONFLATE only the newest
+    message is kept.
+    """
+
+    def __init__(
+        self,
+        stream: str,
+        handler: Callable[[Any], None],
+        max_size: int = 1000,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        workers: int = 1,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.stream = stream
+        self.handler = handler
+        self.max_size = 1 if policy == OverflowPolicy.CONFLATE else max_size
+        self.policy = policy
+
+        self.received = 0
+        self.dropped = 0
+        self.handled = 0
+
+        self._queue: deque = deque()
+        self._condition = Condition()
+        self._running = True
+        self._workers = [
+            Thread(
+                target=self._work,
+                daemon=True,
+                name=f"Mexc dispatcher {stream} {index}",
+            )
+            for index in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def depth(self) -> int:
+        """Returns the number of queued messages."""
+        return len(self._queue)
+
+    def put(self, message: Any) -> None:
+        """Handles a message or queues it for the workers."""
+        self.received += 1
+        if not self._workers:
+            self._handle(message)
+            return
+
+        with self._condition:
+            if len(self._queue) >= self.max_size:
+                if self.policy == OverflowPolicy.BLOCK:
+                    self._condition.wait_for(
+                        lambda: len(self._queue) < self.max_size or not self._running
+                    )
+                elif self.policy == OverflowPolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                else:
+                    self._queue.popleft()
+                    self.dropped += 1
+            self._queue.append(message)
+            self._condition.notify_all()
+
+    def _handle(self, message: Any) -> None:
+        """Calls the handler, errors are logged."""
+        try:
+            self.handler(message)
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.logger.exception("Handler of %s failed.", self.stream)
+        self.handled += 1
+
+    def _work(self) -> None:
+        """Handles queued messages until the route is stopped."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or not self._running)
+                if not self._queue:
+                    return
+                message = self._queue.popleft()
+                self._condition.notify_all()
+            self._handle(message)
+
+    def stats(self) -> dict[str, int]:
+        """Returns the queue depth and message counts."""
+        return {
+            "depth": self.depth,
+            "received": self.received,
+            "dropped": self.dropped,
+            "handled": self.handled,
+        }
+
+    def stop(self) -> None:
+        """Stops the workers after the queued messages are handled."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join()
+
+
+class Dispatcher:
+    """
+    Routes messages by their stream to the handler registered for it.
+    Messages of streams without a route are passed to the default handler.
+    """
+
+    def __init__(self, default: Callable[[Any], None] | None = None) -> None:
+        self.default = default
+        self.routes: dict[str, Route] = {}
+        self._lock = Lock()
+
+    def register(
+        self,
+        stream: str,
+        handler: Callable[[Any], None],
+        max_size: int = 1000,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        workers: int = 1,
+    ) -> Route:
+        """Routes the messages of a stream to a handler, see Route."""
+        route = Route(stream, handler, max_size, policy, workers)
+        with self._lock:
+            previous = self.routes.get(stream)
+            self.routes = {**self.routes, stream: route}
+        if previous is not None:
+            previous.stop()
+        return route
+
+    def unregister(self, stream: str) -> None:
+        """Removes the route of a stream."""
+        with self._lock:
+            routes = dict(self.routes)
+            route = routes.pop(stream, None)
+            self.routes = routes
+        if route is not None:
+            route.stop()
+
+    def dispatch(self, message: Any) -> None:
+        """Passes a message to the route of its stream."""
+        channel = get_channel(message)
+        route = self.routes.get(channel) if channel else None
+        if route is not None:
+            route.put(message)
+        elif self.default is not None:
+            self.default(message)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Returns the stats of every route by stream."""
+        return {stream: route.stats() for stream, route in self.routes.items()}
+
+    def stop(self) -> None:
+        """Stops all routes."""
+        with self._lock:
+            routes = self.routes
+            self.routes = {}
+        for route in routes.values():
+            route.stop()
@@ -0,0 +1,388 @@
+"""Defines the GapRecovery class."""
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Iterable
+
+from mexc_api.common.enums import Interval, StreamInterval
+from mexc_api.common.exceptions import MexcAPIError
+from mexc_api.common.utils import get_timestamp
+from mexc_api.spot import Spot
+
+from .candle_builder import fetch_agg_trades
+from .dispatcher import get_channel
+
+DEALS = "deals"
+KLINES = "klines"
+PRIVATE_DEALS = "private deals"
+
+PRIVATE_DEALS_STREAM = "spot@private.deals.v3.api"
+
+# The http interval of every stream interval, week klines have none.
+KLINE_INTERVALS = {
+    interval.value: Interval[interval.name]
+    for interval in StreamInterval
+    if interval.name in Interval.__members__
+}
+
+# Keys of the latest events per stream that live messages are compared with.
+MAX_RECENT_KEYS = 10_000
+
+
+class _StreamState:
+    """Recovery state of one stream, guarded by the lock of GapRecovery."""
+
+    __slots__ = (
+        "stream",
+        "kind",
+        "symbol",
+        "interval",
+        "protobuf",
+        "last_time",
+        "covered",
+        "recent",
+        "buffer",
+    )
+
+    def __init__(
+        self, stream: str, kind: str, symbol: str, interval: Interval | None = None
+    ) -> None:
+        self.stream = stream
+        self.kind = kind
+        self.symbol = symbol
+        self.interval = interval
+        self.protobuf = stream.split("@")[1].endswith(".pb")
+        self.last_time: int | None = None
+        self.covered: int | None = None
+        self.recent: OrderedDict[Any, None] = OrderedDict()
+        self.buffer: list | None = None
+
+    def is_seen(self, time_ms: int, key: Any) -> bool:
+        """
+        Returns if an event was delivered before. Deals up to the last
+        backfilled millisecond are covered by the aggregate trades. An
+        update of the last or a later kline window is never a duplicate.
+        Account deals are compared by their trade id.
+        """
+        if self.kind == DEALS:
+            return self.covered is not None and time_ms <= self.covered
+        if self.kind == KLINES:
+            return self.last_time is not None and time_ms < self.last_time
+        return key in self.recent
+
+    def remember(self, time_ms: int, key: Any) -> None:
+        """Records a delivered event."""
+        if self.last_time is None or time_ms > self.last_time:
+            self.last_time = time_ms
+        if key is not None:
+            self.recent[key] = None
+            if len(self.recent) > MAX_RECENT_KEYS:
+                self.recent.popitem(last=False)
+
+
+def _parse_stream(stream: str) -> _StreamState | None:
+    """Returns the state of a recoverable stream, None for other streams."""
+    if stream == PRIVATE_DEALS_STREAM:
+        return _StreamState(stream, PRIVATE_DEALS, "")
+    parts = stream.split("@")
+    channel = parts[1] if len(parts) > 1 else ""
+    if (channel == "public.deals.v3.api" and len(parts) == 3) or (
+        channel == "public.aggre.deals.v3.api.pb" and len(parts) == 4
+    ):
+        return _StreamState(stream, DEALS, parts[-1])
+    if (
+        channel in ("public.kline.v3.api", "public.kline.v3.api.pb")
+        and len(parts) == 4
+        and parts[3] in KLINE_INTERVALS
+    ):
+        return _StreamState(stream, KLINES, parts[2], KLINE_INTERVALS[parts[3]])
+    return None
+
+
+def _get_events(state: _StreamState, message: Any) -> list[tuple[int, Any]]:
+    """Returns the time and dedup key of every event of a message."""
+    if state.kind == DEALS:
+        if isinstance(message, dict):
+            return [(deal["t"], None) for deal in message["d"]["deals"]]
+        return [(deal.time, None) for deal in message.publicAggreDeals.deals]
+    if state.kind == KLINES:
+        if isinstance(message, dict):
+            return [(message["d"]["k"]["t"] * 1000, None)]
+        return [(message.publicSpotKline.windowStart * 1000, None)]
+    return [(message["d"]["T"], message["d"]["t"])]
+
+
+def _filter_deals(message: Any, keep: list[bool]) -> Any:
+    """Returns a copy of a trades message with only the kept deals."""
+    if isinstance(message, dict):
+        deals = [deal for deal, kept in zip(message["d"]["deals"], keep) if kept]
+        return {**message, "d": {**message["d"], "deals": deals}}
+    # pylint: disable-next=import-outside-toplevel
+    from .protobuf import PushDataV3ApiWrapper
+
+    copy = PushDataV3ApiWrapper()
+    copy.CopyFrom(message)
+    del copy.publicAggreDeals.deals[:]
+    copy.publicAggreDeals.deals.extend(
+        deal for deal, kept in zip(message.publicAggreDeals.deals, keep) if kept
+    )
+    return copy
+
+
+def _deal_message(state: _StreamState, trade: dict) -> Any:
+    """Returns an aggregate trade in the format of the trades stream."""
+    side = 2 if trade["m"] else 1
+    if not state.protobuf:
+        return {
+            "c": state.stream,
+            "d": {
+                "deals": [{"S": side, "p": trade["p"], "t": trade["T"], "v": trade["q"]}],
+                "e": "spot@public.deals.v3.api",
+            },
+            "s": state.symbol,
+            "t": trade["T"],
+        }
+    # pylint: disable-next=import-outside-toplevel
+    from .protobuf import PushDataV3ApiWrapper
+
+    message = PushDataV3ApiWrapper(
+        channel=state.stream, symbol=state.symbol, sendTime=trade["T"]
+    )
+    message.publicAggreDeals.eventType = state.stream.rsplit("@", 1)[0]
+    message.publicAggreDeals.deals.add(
+        price=trade["p"], quantity=trade["q"], tradeType=side, time=trade["T"]
+    )
+    return message
+
+
+def _kline_message(state: _StreamState, kline: list) -> Any:
+    """Returns a kline in the format of the kline stream."""
+    interval = state.stream.rsplit("@", 1)[1]
+    if not state.protobuf:
+        return {
+            "c": state.stream,
+            "d": {
+                "k": {
+                    "t": kline[0] // 1000,
+                    "o": kline[1],
+                    "c": kline[4],
+                    "h": kline[2],
+                    "l": kline[3],
+                    "v": kline[5],
+                    "a": kline[7],
+                    "T": kline[6] // 1000,
+                    "i": interval,
+                },
+                "e": "spot@public.kline.v3.api",
+            },
+            "s": state.symbol,
+            "t": kline[0],
+        }
+    # pylint: disable-next=import-outside-toplevel
+    from .protobuf import PushDataV3ApiWrapper
+
+    message = PushDataV3ApiWrapper(
+        channel=state.stream, symbol=state.symbol, sendTime=kline[0]
+    )
+    message.publicSpotKline.interval = interval
+    message.publicSpotKline.windowStart = kline[0] // 1000
+    message.publicSpotKline.openingPrice = kline[1]
+    message.publicSpotKline.highestPrice = kline[2]
+    message.publicSpotKline.lowestPrice = kline[3]
+    message.publicSpotKline.closingPrice = kline[4]
+    message.publicSpotKline.volume = kline[5]
+    message.publicSpotKline.windowEnd = kline[6] // 1000
+    message.publicSpotKline.amount = kline[7]
+    return message
+
+
+def _private_deal_message(trade: dict) -> dict:
+    """Returns an account trade in the format of the account deals stream."""
+    return {
+        "c": PRIVATE_DEALS_STREAM,
+        "d": {
+            "S": 1 if trade["isBuyer"] else 2,
+            "T": trade["time"],
+            "a": trade["quoteQty"],
+            "c": trade.get("clientOrderId") or "",
+            "i": trade["orderId"],
+            "m": int(trade["isMaker"]),
+            "n": trade["commission"],
+            "N": trade["commissionAsset"],
+            "p": trade["price"],
+            "t": trade["id"],
+            "v": trade["qty"],
+        },
+        "s": trade["symbol"],
+        "t": trade["time"],
+    }
+
+
+class GapRecovery:
+    """
+    Fills the gaps that reconnects leave in the trades, kline and account
+    deals streams.
+
+    Pass process_message as on_message or as dispatcher route of the
+    streams and on_open as on_open of the stream client. The time of the
+    last event of every stream is recorded. When the connection is opened
+    again, the missed events are loaded in the background from the
+    aggregate trades, klines or account trades endpoint and passed to
+    on_message in the message format of their stream. Live messages of the
+    stream are buffered meanwhile and passed after the backfill, only
+    backfilled events before the first buffered one are used.
+
+    The quantity of an aggregate trade is the sum of the deals of one
+    price and millisecond, so deals are deduplicated by time. Trades are
+    loaded from the millisecond after the last passed deal, deals of that
+    millisecond that were not passed before the disconnect are lost. Live
+    deals up to the last backfilled millisecond are dropped, as the
+    aggregate trades contain them, trades messages with some dropped deals
+    are passed without them.
+
+    Account deals that were already passed are dropped by trade id. Kline
+    updates of windows before the last one are dropped. Account deals are
+    loaded for the given symbols and every symbol of a received account
+    deal. Other streams are passed through unchanged.
+
+    on_message is called with the lock held, so messages are passed in
+    order even while a backfill ends.
+    """
+
+    def __init__(
+        self,
+        spot: Spot,
+        on_message: Callable[[Any], None],
+        symbols: Iterable[str] = (),
+        max_workers: int = 4,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.spot = spot
+        self.on_message = on_message
+        self.symbols = {symbol.upper() for symbol in symbols}
+
+        self.backfilled = 0
+        self.duplicates = 0
+
+        self._states: dict[str, _StreamState | None] = {}
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="Mexc gap recovery"
+        )
+
+    def _get_state(self, stream: str | None) -> _StreamState | None:
+        """Returns the state of a stream, created on its first message."""
+        if stream is None:
+            return None
+        if stream not in self._states:
+            self._states[stream] = _parse_stream(stream)
+        return self._states[stream]
+
+    def _deliver(self, state: _StreamState, message: Any) -> bool:
+        """
+        Passes the events of a message that were not passed before.
+        Returns false if all events were passed before.
+        """
+        events = _get_events(state, message)
+        keep = [not state.is_seen(time_ms, key) for time_ms, key in events]
+        if not any(keep):
+            self.duplicates += len(events)
+            return False
+        if not all(keep):
+            self.duplicates += keep.count(False)
+            message = _filter_deals(message, keep)
+
+        for (time_ms, key), kept in zip(events, keep):
+            if kept:
+                state.remember(time_ms, key)
+        if state.kind == PRIVATE_DEALS:
+            self.symbols.add(message["s"])
+        self.on_message(message)
+        return True
+
+    def process_message(self, message: Any) -> None:
+        """Passes a message on, or buffers it while its stream is backfilled."""
+        with self._lock:
+            state = self._get_state(get_channel(message))
+            if state is None:
+                self.on_message(message)
+            elif state.buffer is not None:
+                state.buffer.append(message)
+            else:
+                self._deliver(state, message)
+
+    def on_open(self) -> None:
+        """Starts the backfill of every stream that received events before."""
+        with self._lock:
+            for state in self._states.values():
+                if (
+                    state is not None
+                    and state.last_time is not None
+                    and state.buffer is None
+                ):
+                    state.buffer = []
+                    start_ms = state.last_time + (state.kind == DEALS)
+                    self._executor.submit(self._backfill, state, start_ms)
+
+    def _fetch(self, state: _StreamState, start_ms: int, end_ms: int) -> list:
+        """Returns the events since start_ms as stream messages ordered by time."""
+        if state.kind == DEALS:
+            trades = fetch_agg_trades(self.spot.market, state.symbol, start_ms, end_ms)
+            return [_deal_message(state, trade) for trade in trades]
+
+        if state.interval is not None:
+            klines: list = []
+            while start_ms < end_ms:
+                page = self.spot.market.klines(
+                    state.symbol, state.interval, start_ms, end_ms - 1, 1000
+                )
+                klines.extend(page)
+                if len(page) < 1000:
+                    break
+                start_ms = page[-1][0] + 1
+            return [_kline_message(state, kline) for kline in klines]
+
+        with self._lock:
+            symbols = sorted(self.symbols)
+        trades = [
+            trade
+            for symbol in symbols
+            for trade in self.spot.account.iter_trades(symbol, start_ms, end_ms)
+        ]
+        trades.sort(key=lambda trade: trade["time"])
+        return [_private_deal_message(trade) for trade in trades]
+
+    def _backfill(self, state: _StreamState, start_ms: int) -> None:
+        """Loads the missed events of a stream and passes them before the buffer."""
+        messages: list = []
+        try:
+            messages = self._fetch(state, start_ms, get_timestamp() + 1)
+        except (MexcAPIError, OSError) as error:
+            self.logger.error("Backfilling %s failed: %s", state.stream, error)
+        finally:
+            with self._lock:
+                buffer, state.buffer = state.buffer or [], None
+                live_times = [
+                    time_ms
+                    for message in buffer
+                    for time_ms, _ in _get_events(state, message)
+                ]
+                if live_times:
+                    messages = [
+                        message
+                        for message in messages
+                        if _get_events(state, message)[0][0] < live_times[0]
+                    ]
+
+                for message in messages:
+                    self.backfilled += self._deliver(state, message)
+                if state.kind == DEALS and messages:
+                    state.covered = _get_events(state, messages[-1])[0][0]
+                for message in buffer:
+                    self._deliver(state, message)
+        self.logger.debug("Backfilled %s messages of %s.", len(messages), state.stream)
+
+    def stop(self) -> None:
+        """Stops the background backfills."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,278 @@
+"""Defines the ListenKeyManager class."""
+import atexit
+import logging
+import time
+from threading import Condition, Event, Lock, Thread
+from typing import TYPE_CHECKING, Callable
+
+from mexc_api.common.exceptions import MexcAPIError
+
+if TYPE_CHECKING:
+    from mexc_api.spot import Spot
+
+# A listen key expires 60 minutes after its last renewal.
+KEEP_ALIVE_INTERVAL = 1800
+# A listen key is valid for at most 24 hours, it is replaced before that.
+MAX_AGE = 23 * 3600
+# MEXC accepts at most 5 connections per listen key.
+CONNECTIONS_PER_KEY = 5
+# Seconds before a failed renewal or rotation is retried.
+RETRY_DELAY = 60
+
+_default_managers: dict[str, "ListenKeyManager"] = {}
+_default_lock = Lock()
+
+
+def _close_default_managers() -> None:
+    """Closes the default managers, so their listen keys are deleted at exit."""
+    with _default_lock:
+        managers = list(_default_managers.values())
+        _default_managers.clear()
+    for manager in managers:
+        manager.close()
+
+
+atexit.register(_close_default_managers)
+
+
+class _Lease:
+    """A listen key with the rotation callbacks of the connections using it."""
+
+    __slots__ = ("api_key", "listen_key", "created", "renewed", "users")
+
+    def __init__(self, api_key: str, listen_key: str, now: float) -> None:
+        self.api_key = api_key
+        self.listen_key = listen_key
+        self.created = now
+        self.renewed = now
+        self.users: list[Callable[[str], None] | None] = []
+
+
+class ListenKeyManager:
+    """
+    Hands out and renews the listen keys of any number of accounts.
+
+    acquire returns a listen key with room for another connection, a new key
+    is only created when all keys of the account are full. Requests are never
+    sent with the lock held. Only keys created by the manager are handed out,
+    renewed, replaced and deleted, the keys other processes hold on the same
+    account are never touched, as their connections are unknown.
+
+    One scheduler thread renews all keys every keep_alive_interval and
+    replaces keys older than max_age. The connections of a replaced key get
+    the new key through the on_rotate callback they passed to acquire.
+    close stops the thread and deletes all keys, the default managers are
+    closed at exit.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://api.mexc.com",
+        keep_alive_interval: float = KEEP_ALIVE_INTERVAL,
+        max_age: float = MAX_AGE,
+        connections_per_key: int = CONNECTIONS_PER_KEY,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.base_url = base_url
+        self.keep_alive_interval = keep_alive_interval
+        self.max_age = max_age
+        self.connections_per_key = connections_per_key
+
+        self._spots: dict[str, "Spot"] = {}
+        self._leases: dict[str, list[_Lease]] = {}
+        self._lock = Lock()
+        # Accounts with a request of acquire in flight, others wait for it.
+        self._pending: set[str] = set()
+        self._done = Condition(self._lock)
+        self._closed = Event()
+        self._wake = Event()
+        self._thread: Thread | None = None
+
+    @classmethod
+    def default(cls, base_url: str = "https://api.mexc.com") -> "ListenKeyManager":
+        """Returns the manager shared by all connections to base_url."""
+        with _default_lock:
+            manager = _default_managers.get(base_url)
+            if manager is None or manager.closed:
+                manager = _default_managers[base_url] = cls(base_url)
+            return manager
+
+    @property
+    def closed(self) -> bool:
+        """Returns if the manager is closed."""
+        return self._closed.is_set()
+
+    @property
+    def listen_keys(self) -> list[str]:
+        """Returns all managed listen keys."""
+        with self._lock:
+            return [
+                lease.listen_key
+                for leases in self._leases.values()
+                for lease in leases
+            ]
+
+    def _create_lease(self, api_key: str, api_secret: str) -> None:
+        """Creates a new key for an account, it is deleted if the manager closed."""
+        spot = self._spots.get(api_key)
+        if spot is None:
+            # Imported here, so public streams do not load the REST stack.
+            from mexc_api.spot import Spot  # pylint: disable=import-outside-toplevel
+
+            spot = Spot(api_key, api_secret, base_url=self.base_url)
+        listen_key = spot.account.create_listen_key()
+        with self._lock:
+            if not self.closed:
+                lease = _Lease(api_key, listen_key, time.monotonic())
+                self._spots[api_key] = spot
+                self._leases.setdefault(api_key, []).append(lease)
+                return
+        spot.account.delete_listen_key(listen_key)
+
+    def _start(self) -> None:
+        """Starts the scheduler thread once."""
+        if self._thread is None:
+            self._thread = Thread(
+                target=self._run, daemon=True, name="Mexc listen key manager"
+            )
+            self._thread.start()
+
+    def acquire(
+        self,
+        api_key: str,
+        api_secret: str,
+        on_rotate: Callable[[str], None] | None = None,
+    ) -> str:
+        """
+        Returns a listen key of the account for one more connection.
+        on_rotate is called with the new key when the key is replaced.
+        """
+        while True:
+            with self._lock:
+                while api_key in self._pending:
+                    self._done.wait()
+                if self.closed:
+                    raise MexcAPIError("The listen key manager is closed.")
+                available = [
+                    lease
+                    for lease in self._leases.get(api_key, [])
+                    if len(lease.users) < self.connections_per_key
+                ]
+                if available:
+                    lease = max(available, key=lambda lease: len(lease.users))
+                    lease.users.append(on_rotate)
+                    self._start()
+                    return lease.listen_key
+                self._pending.add(api_key)
+
+            try:
+                self._create_lease(api_key, api_secret)
+            finally:
+                with self._lock:
+                    self._pending.discard(api_key)
+                    self._done.notify_all()
+
+    def release(
+        self, listen_key: str, on_rotate: Callable[[str], None] | None = None
+    ) -> None:
+        """
+        Returns a listen key that a connection no longer uses.
+        The key is kept and renewed for later connections until close.
+        """
+        with self._lock:
+            for leases in self._leases.values():
+                for lease in leases:
+                    if lease.listen_key == listen_key and on_rotate in lease.users:
+                        lease.users.remove(on_rotate)
+                        return
+
+    def _renew(self, lease: _Lease, now: float) -> None:
+        """Renews a listen key, a key that can not be renewed is replaced."""
+        try:
+            self._spots[lease.api_key].account.keep_alive_listen_key(lease.listen_key)
+            lease.renewed = now
+        except MexcAPIError as error:
+            self.logger.warning("Renewing a listen key failed: %s", error)
+            self._rotate(lease, now)
+
+    def _rotate(self, lease: _Lease, now: float) -> None:
+        """Replaces a listen key and passes the new key to its connections."""
+        account = self._spots[lease.api_key].account
+        new_key = account.create_listen_key()
+        with self._lock:
+            old_key, lease.listen_key = lease.listen_key, new_key
+            lease.created = lease.renewed = now
+            users = list(lease.users)
+        self.logger.debug("Rotated a listen key.")
+
+        for on_rotate in users:
+            if on_rotate is not None:
+                try:
+                    on_rotate(new_key)
+                except Exception:  # pylint: disable=broad-exception-caught
+                    self.logger.exception("Listen key rotation callback failed.")
+        try:
+            account.delete_listen_key(old_key)
+        except MexcAPIError:
+            pass
+
+    def _next_run(self) -> float:
+        """Returns the seconds until the next key is due."""
+        with self._lock:
+            leases = [lease for leases in self._leases.values() for lease in leases]
+        if not leases:
+            return self.keep_alive_interval
+        due = min(lease.renewed + self.keep_alive_interval for lease in leases)
+        return max(due - time.monotonic(), 0.0)
+
+    def _run(self) -> None:
+        """Renews and rotates the keys when they are due."""
+        while True:
+            self._wake.wait(self._next_run())
+            self._wake.clear()
+            if self.closed:
+                return
+            now = time.monotonic()
+            with self._lock:
+                leases = [
+                    lease for leases in self._leases.values() for lease in leases
+                ]
+            retry = now - self.keep_alive_interval
+            retry += min(RETRY_DELAY, self.keep_alive_interval)
+            for lease in leases:
+                try:
+                    if lease.created + self.max_age <= now:
+                        self._rotate(lease, now)
+                    elif lease.renewed + self.keep_alive_interval <= now:
+                        self._renew(lease, now)
+                except OSError as error:
+                    # Request errors contain the signed url with the listen key.
+                    self.logger.warning(
+                        "Listen key maintenance failed: %s", type(error).__name__
+                    )
+                    lease.renewed = retry
+                except Exception:  # pylint: disable=broad-exception-caught
+                    self.logger.exception("Listen key maintenance failed.")
+                    lease.renewed = retry
+
+    def close(self) -> None:
+        """Stops the scheduler thread and deletes all listen keys."""
+        self._closed.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        with self._lock:
+            leases = [lease for leases in self._leases.values() for lease in leases]
+            self._leases.clear()
+        for lease in leases:
+            try:
+                self._spots[lease.api_key].account.delete_listen_key(lease.listen_key)
+            except MexcAPIError as error:
+                self.logger.warning("Deleting a listen key failed: %s", error)
+            except OSError as error:
+                # Request errors contain the signed url with the listen key.
+                self.logger.warning(
+                    "Deleting a listen key failed: %s", type(error).__name__
+                )
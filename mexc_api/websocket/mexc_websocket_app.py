@@ -1,34 +1,56 @@
 """Defines the MexcWebsocketApp class."""
 import json
 import logging
-import time
+import socket
+from contextlib import suppress
 from threading import Thread
-from typing import Callable
+from typing import Any, Callable
 
 from websocket import WebSocketApp
 
-from mexc_api.spot import Spot
+from .listen_key_manager import ListenKeyManager
+
+STREAM_URL = "wss://wbs.mexc.com/ws"
 
 
 class MexcWebsocketApp(WebSocketApp):  # type: ignore[misc]
     """
     Implements the WebSocketApp ands starts the run in a thread.
-    Also creates a second thread for keeping the listen key alive.
+
+    The listen key is taken from the listen key manager, which renews it.
+    Connections without a manager share the default manager of base_url.
+    When the key is rotated the connection reconnects with the new key.
+
+    Without api key and secret only public streams are available and the
+    connection opens without a listen key.
     """
 
     def __init__(
         self,
-        api_key: str,
-        api_secret: str,
+        api_key: str | None,
+        api_secret: str | None,
         on_open: Callable | None = None,
         on_message: Callable | None = None,
         on_error: Callable | None = None,
         on_close: Callable | None = None,
+        on_pong: Callable | None = None,
+        url: str = STREAM_URL,
+        base_url: str = "https://api.mexc.com",
+        listen_key_manager: ListenKeyManager | None = None,
     ) -> None:
         self.logger = logging.getLogger(__name__)
-        spot = Spot(api_key, api_secret)
-        self.listen_key = spot.account.create_listen_key()
-        stream_url = f"wss://wbs.mexc.com/ws?listenKey={self.listen_key}"
+        self.stream_url = url
+        self.listen_key: str | None = None
+        self.listen_key_manager: ListenKeyManager | None = None
+        stream_url = url
+        if api_key is not None and api_secret is not None:
+            self.listen_key_manager = listen_key_manager or ListenKeyManager.default(
+                base_url
+            )
+            self.listen_key = self.listen_key_manager.acquire(
+                api_key, api_secret, self._on_rotate
+            )
+            stream_url = f"{url}?listenKey={self.listen_key}"
 
         super().__init__(
             stream_url,
@@ -36,23 +58,30 @@ class MexcWebsocketApp(WebSocketApp):  # type: ignore[misc]
             on_message=on_message,
             on_error=on_error,
             on_close=on_close,
+            on_pong=on_pong,
         )
 
         Thread(
             target=self.run_forever, kwargs={"reconnect": 1, "ping_interval": 20}
         ).start()
 
-        Thread(
-            target=lambda: self._keep_alive(spot),
-            daemon=True,
-            name="Mexc keep alive listen key",
-        ).start()
+    def _on_rotate(self, listen_key: str) -> None:
+        """Reconnects with a new listen key."""
+        self.listen_key = listen_key
+        self.url = f"{self.stream_url}?listenKey={listen_key}"
+        # A shutdown wakes the blocked read, so run_forever reconnects.
+        # A close handshake would end run_forever instead.
+        sock = getattr(self.sock, "sock", None)
+        if sock is not None:
+            with suppress(OSError):
+                sock.shutdown(socket.SHUT_RDWR)
 
-    def _keep_alive(self, spot: Spot) -> None:
-        """Keeps the listen key alive."""
-        while self._keep_alive:  # type: ignore[truthy-function]
-            time.sleep(1800)
-            spot.account.keep_alive_listen_key(self.listen_key)
+    def close(self, **kwargs: Any) -> None:
+        """Closes the connection and releases the listen key."""
+        super().close(**kwargs)
+        if self.listen_key_manager is not None and self.listen_key is not None:
+            self.listen_key_manager.release(self.listen_key, self._on_rotate)
+            self.listen_key_manager = None
 
     def send_message(self, message: dict) -> None:
         """Sends a message to the connected server."""
@@ -0,0 +1,290 @@
+"""Defines the OrderBook and OrderBookManager classes."""
+import logging
+import time
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable
+
+from mexc_api.common.enums import Action
+from mexc_api.common.exceptions import MexcAPIError
+from mexc_api.spot import Spot
+
+from .websocket_stream import SpotWebsocketStreamClient
+
+DIFF_DEPTH_CHANNEL = "spot@public.increase.depth.v3.api@"
+
+# Seconds the delay between failed resync attempts grows to at most.
+MAX_RETRY_DELAY = 30.0
+
+
+class BookSide:
+    """
+    One side of an order book, stored in two sorted float arrays.
+    Keys are sorted ascending with the best level last, so the best level
+    is read in O(1) and updates near the top only move a few entries.
+    """
+
+    __slots__ = ("_sign", "_keys", "_quantities")
+
+    def __init__(self, is_ask: bool) -> None:
+        self._sign = -1.0 if is_ask else 1.0
+        self._keys = array("d")
+        self._quantities = array("d")
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self) -> None:
+        """Removes all levels."""
+        del self._keys[:]
+        del self._quantities[:]
+
+    def update(self, price: float, quantity: float) -> None:
+        """Sets the quantity of a price level, a quantity of 0 removes the level."""
+        key = price * self._sign
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            if quantity:
+                self._quantities[index] = quantity
+            else:
+                del self._keys[index]
+                del self._quantities[index]
+        elif quantity:
+            self._keys.insert(index, key)
+            self._quantities.insert(index, quantity)
+
+    def best(self) -> tuple[float, float] | None:
+        """Returns the best price and quantity."""
+        if not self._keys:
+            return None
+        return self._keys[-1] * self._sign, self._quantities[-1]
+
+    def top(self, depth: int) -> list[tuple[float, float]]:
+        """Returns the best depth levels, best first."""
+        start = max(len(self._keys) - depth, 0)
+        return [
+            (self._keys[index] * self._sign, self._quantities[index])
+            for index in range(len(self._keys) - 1, start - 1, -1)
+        ]
+
+    def quantity(self, price: float) -> float:
+        """Returns the quantity at a price level, 0 if the level is empty."""
+        key = price * self._sign
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return self._quantities[index]
+        return 0.0
+
+
+class OrderBook:
+    """Local order book of a symbol."""
+
+    __slots__ = ("symbol", "version", "synced", "bids", "asks")
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+        self.version = 0
+        self.synced = False
+        self.bids = BookSide(is_ask=False)
+        self.asks = BookSide(is_ask=True)
+
+    def apply_snapshot(self, snapshot: dict) -> None:
+        """Replaces the book with a snapshot of the order book endpoint."""
+        self.bids.clear()
+        self.asks.clear()
+        for price, quantity in snapshot["bids"]:
+            self.bids.update(float(price), float(quantity))
+        for price, quantity in snapshot["asks"]:
+            self.asks.update(float(price), float(quantity))
+        self.version = int(snapshot["lastUpdateId"])
+
+    def apply_diff(self, data: dict, version: int) -> None:
+        """Applies the data of a diff depth message."""
+        for level in data.get("bids", ()):
+            self.bids.update(float(level["p"]), float(level["v"]))
+        for level in data.get("asks", ()):
+            self.asks.update(float(level["p"]), float(level["v"]))
+        self.version = version
+
+    def best_bid(self) -> tuple[float, float] | None:
+        """Returns the best bid price and quantity."""
+        return self.bids.best()
+
+    def best_ask(self) -> tuple[float, float] | None:
+        """Returns the best ask price and quantity."""
+        return self.asks.best()
+
+    def top_bids(self, depth: int) -> list[tuple[float, float]]:
+        """Returns the best depth bids, best first."""
+        return self.bids.top(depth)
+
+    def top_asks(self, depth: int) -> list[tuple[float, float]]:
+        """Returns the best depth asks, best first."""
+        return self.asks.top(depth)
+
+
+class _BookState:
+    """Sync state of a book, guarded by its lock."""
+
+    __slots__ = ("book", "lock", "buffer", "resyncing")
+
+    def __init__(self, symbol: str) -> None:
+        self.book = OrderBook(symbol)
+        self.lock = Lock()
+        self.buffer: list[tuple[int, dict]] = []
+        self.resyncing = False
+
+
+class OrderBookManager:
+    """
+    Maintains local order books from the diff depth stream and order book snapshots.
+
+    Diff depth messages must be passed to process_message, for example from the
+    on_message callback of the stream client. Messages are buffered until a
+    snapshot is loaded. When a version gap is detected the book is marked out of
+    sync and reloaded in the background.
+    """
+
+    def __init__(
+        self,
+        spot: Spot,
+        client: SpotWebsocketStreamClient | None = None,
+        snapshot_limit: int = 1000,
+        on_update: Callable[[OrderBook], None] | None = None,
+        max_workers: int = 4,
+        retry_delay: float = 0.5,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.spot = spot
+        self.client = client
+        self.snapshot_limit = snapshot_limit
+        self.on_update = on_update
+        self.retry_delay = retry_delay
+
+        self._states: dict[str, _BookState] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="Mexc order book sync"
+        )
+
+    def subscribe(self, symbol: str) -> OrderBook:
+        """Starts maintaining the book of a symbol."""
+        symbol = symbol.upper()
+        state = self._states.get(symbol)
+        if state is None:
+            state = _BookState(symbol)
+            self._states[symbol] = state
+            if self.client:
+                self.client.diff_depth(symbol)
+        return state.book
+
+    def unsubscribe(self, symbol: str) -> None:
+        """Stops maintaining the book of a symbol."""
+        symbol = symbol.upper()
+        if self._states.pop(symbol, None) and self.client:
+            self.client.diff_depth(symbol, Action.UNSUBSCRIBE)
+
+    def get(self, symbol: str) -> OrderBook | None:
+        """Returns the book of a symbol."""
+        state = self._states.get(symbol.upper())
+        return state.book if state else None
+
+    def process_message(self, message: dict) -> bool:
+        """
+        Applies a diff depth message to its book.
+        Returns false if the message is not a diff depth message of a subscribed symbol.
+        """
+        if not message.get("c", "").startswith(DIFF_DEPTH_CHANNEL):
+            return False
+        state = self._states.get(message["s"])
+        if state is None:
+            return False
+
+        data = message["d"]
+        version = int(data["r"])
+        with state.lock:
+            book = state.book
+            if book.synced:
+                if version <= book.version:
+                    return True
+                if version == book.version + 1:
+                    book.apply_diff(data, version)
+                    if self.on_update:
+                        self.on_update(book)
+                    return True
+
+                self.logger.warning(
+                    "Order book %s gap between %s and %s, resyncing.",
+                    book.symbol,
+                    book.version,
+                    version,
+                )
+                book.synced = False
+
+            state.buffer.append((version, data))
+            if not state.resyncing:
+                state.resyncing = True
+                self._executor.submit(self._resync, state)
+        return True
+
+    def _resync(self, state: _BookState) -> None:
+        """
+        Loads snapshots until one lines up with the buffered messages.
+        Failed attempts are retried with a delay that doubles up to
+        MAX_RETRY_DELAY. Stops when the symbol is unsubscribed.
+        """
+        symbol = state.book.symbol
+        delay = self.retry_delay
+        synced = False
+        try:
+            while self._states.get(symbol) is state:
+                try:
+                    snapshot = self.spot.market.order_book(symbol, self.snapshot_limit)
+                except (MexcAPIError, OSError) as error:
+                    self.logger.error("Order book %s snapshot failed: %s", symbol, error)
+                except Exception:  # pylint: disable=broad-exception-caught
+                    self.logger.exception("Order book %s snapshot failed.", symbol)
+                else:
+                    with state.lock:
+                        synced = self._apply_buffer(state, snapshot)
+                        if synced:
+                            state.resyncing = False
+                    if synced:
+                        if self.on_update:
+                            self.on_update(state.book)
+                        return
+                time.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+        finally:
+            if not synced:
+                with state.lock:
+                    state.resyncing = False
+
+    def _apply_buffer(self, state: _BookState, snapshot: dict) -> bool:
+        """
+        Applies the snapshot and the buffered messages after it.
+        Returns false if the snapshot is older than the buffered messages.
+        """
+        last_update_id = int(snapshot["lastUpdateId"])
+        buffer = [item for item in state.buffer if item[0] > last_update_id]
+        if buffer and buffer[0][0] != last_update_id + 1:
+            state.buffer = buffer
+            return False
+
+        book = state.book
+        book.apply_snapshot(snapshot)
+        for version, data in buffer:
+            if version != book.version + 1:
+                state.buffer = [item for item in buffer if item[0] >= version]
+                return False
+            book.apply_diff(data, version)
+
+        state.buffer = []
+        book.synced = True
+        return True
+
+    def stop(self) -> None:
+        """Stops the background resyncs."""
+        self._states.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
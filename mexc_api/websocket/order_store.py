@@ -0,0 +1,372 @@
+"""Defines the Order, Fill and OrderStore classes."""
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Iterable
+
+from mexc_api.common.enums import Side
+from mexc_api.common.exceptions import MexcAPIError
+from mexc_api.spot import Spot
+
+from .websocket_stream import SpotWebsocketStreamClient
+
+ORDERS_STREAM = "spot@private.orders.v3.api"
+DEALS_STREAM = "spot@private.deals.v3.api"
+
+# Status and type codes of the orders stream.
+STATUSES = {
+    1: "NEW",
+    2: "FILLED",
+    3: "PARTIALLY_FILLED",
+    4: "CANCELED",
+    5: "PARTIALLY_CANCELED",
+}
+ORDER_TYPES = {
+    1: "LIMIT",
+    2: "LIMIT_MAKER",
+    3: "IMMEDIATE_OR_CANCEL",
+    4: "FILL_OR_KILL",
+    5: "MARKET",
+    100: "STOP_LIMIT",
+}
+OPEN_STATUSES = frozenset(("NEW", "PARTIALLY_FILLED"))
+
+
+class Fill:
+    """A trade of an order."""
+
+    __slots__ = (
+        "trade_id",
+        "price",
+        "quantity",
+        "quote_quantity",
+        "fee",
+        "fee_asset",
+        "time",
+        "is_maker",
+    )
+
+    def __init__(self, data: dict) -> None:
+        self.trade_id: str = data["t"]
+        self.price = float(data["p"])
+        self.quantity = float(data["v"])
+        self.quote_quantity = float(data["a"])
+        self.fee = float(data["n"])
+        self.fee_asset: str = data["N"]
+        self.time: int = data["T"]
+        self.is_maker = bool(data["m"])
+
+    def __repr__(self) -> str:
+        return f"Fill({self.trade_id}, {self.price}, {self.quantity}, {self.time})"
+
+
+class Order:
+    """The state of an order."""
+
+    __slots__ = (
+        "symbol",
+        "order_id",
+        "client_order_id",
+        "side",
+        "type",
+        "price",
+        "quantity",
+        "executed_quantity",
+        "executed_quote_quantity",
+        "status",
+        "create_time",
+        "update_time",
+        "fills",
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        order_id: str,
+        client_order_id: str,
+        side: Side,
+        order_type: str,
+        price: float,
+        quantity: float,
+    ) -> None:
+        self.symbol = symbol
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.side = side
+        self.type = order_type
+        self.price = price
+        self.quantity = quantity
+        self.executed_quantity = 0.0
+        self.executed_quote_quantity = 0.0
+        self.status = "NEW"
+        self.create_time = 0
+        self.update_time = 0
+        self.fills: dict[str, Fill] = {}
+
+    @classmethod
+    def from_stream(cls, message: dict) -> "Order":
+        """Creates an order from an orders stream message."""
+        data = message["d"]
+        order = cls(
+            message["s"],
+            data["i"],
+            data.get("c") or "",
+            Side.BUY if data["S"] == 1 else Side.SELL,
+            ORDER_TYPES.get(data["o"], str(data["o"])),
+            float(data["p"]),
+            float(data["v"]),
+        )
+        order.executed_quantity = float(data.get("cv") or 0)
+        order.executed_quote_quantity = float(data.get("ca") or 0)
+        order.status = STATUSES.get(data["s"], str(data["s"]))
+        order.create_time = data.get("O", 0)
+        order.update_time = message["t"]
+        return order
+
+    @classmethod
+    def from_rest(cls, row: dict) -> "Order":
+        """Creates an order from an order endpoint response."""
+        order = cls(
+            row["symbol"],
+            row["orderId"],
+            row.get("clientOrderId") or "",
+            Side(row["side"]),
+            row["type"],
+            float(row["price"]),
+            float(row["origQty"]),
+        )
+        order.executed_quantity = float(row["executedQty"])
+        order.executed_quote_quantity = float(row["cummulativeQuoteQty"])
+        order.status = row["status"]
+        order.create_time = row.get("time") or row.get("transactTime") or 0
+        order.update_time = row.get("updateTime") or order.create_time
+        return order
+
+    @property
+    def is_open(self) -> bool:
+        """Returns if the order can still be filled."""
+        return self.status in OPEN_STATUSES
+
+    @property
+    def progress(self) -> tuple[float, bool]:
+        """Returns the executed quantity and if the order is closed, neither goes back."""
+        return self.executed_quantity, not self.is_open
+
+    def __repr__(self) -> str:
+        return (
+            f"Order({self.symbol}, {self.order_id}, {self.side.value}, {self.status}, "
+            f"{self.executed_quantity}/{self.quantity} @ {self.price})"
+        )
+
+
+class OrderStore:
+    """
+    Maintains the orders of an account from the private orders and deals streams.
+
+    Orders are indexed by order id, client order id and the open orders by
+    symbol, all lookups are dict lookups. seed loads the open orders of
+    symbols, orders of other symbols are added when the stream reports them.
+    on_change is called with every order that changed, with the lock held.
+
+    Updates never move an order back, an update with less executed quantity
+    or that reopens a closed order is stale and ignored. The store is only
+    reconciled with the order endpoints when the streams look inconsistent:
+    a deal of an order that is still unknown after reconcile_delay loads
+    that order, and on_open, passed as on_open of the stream client, reloads
+    the open orders of the seeded symbols after a reconnect. Reconciles run
+    in the background.
+
+    At most max_closed closed orders are kept, the oldest are removed.
+    """
+
+    def __init__(
+        self,
+        spot: Spot,
+        client: SpotWebsocketStreamClient | None = None,
+        on_change: Callable[[Order], None] | None = None,
+        max_closed: int = 1000,
+        max_workers: int = 2,
+        reconcile_delay: float = 1.0,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.spot = spot
+        self.client = client
+        self.on_change = on_change
+        self.max_closed = max_closed
+        self.reconcile_delay = reconcile_delay
+
+        self.symbols: set[str] = set()
+        self.stale = 0
+        self.reconciles = 0
+
+        self._orders: dict[str, Order] = {}
+        self._client_ids: dict[str, Order] = {}
+        self._open: dict[str, dict[str, Order]] = {}
+        self._closed: OrderedDict[str, None] = OrderedDict()
+        self._pending: set[str] = set()
+        self._orphans: dict[str, dict[str, Fill]] = {}
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="Mexc order store"
+        )
+        if client:
+            client.account_orders()
+            client.account_deals()
+
+    def get(self, order_id: str) -> Order | None:
+        """Returns an order by its order id."""
+        return self._orders.get(order_id)
+
+    def get_by_client_id(self, client_order_id: str) -> Order | None:
+        """Returns an order by its client order id."""
+        return self._client_ids.get(client_order_id)
+
+    def open_orders(self, symbol: str | None = None) -> list[Order]:
+        """Returns the open orders of a symbol, or of all symbols."""
+        with self._lock:
+            if symbol is not None:
+                return list(self._open.get(symbol.upper(), {}).values())
+            return [order for orders in self._open.values() for order in orders.values()]
+
+    def _apply(self, update: Order) -> Order | None:
+        """
+        Merges the state of an order into the store.
+        Returns the stored order, or None if the update is stale.
+        """
+        order = self._orders.get(update.order_id)
+        if order is None:
+            order = self._orders[update.order_id] = update
+            order.fills = self._orphans.pop(order.order_id, {})
+        elif update.progress < order.progress:
+            self.stale += 1
+            return None
+        else:
+            for name in Order.__slots__:
+                if name != "fills":
+                    setattr(order, name, getattr(update, name))
+
+        if order.client_order_id:
+            self._client_ids[order.client_order_id] = order
+        if order.is_open:
+            self._open.setdefault(order.symbol, {})[order.order_id] = order
+        else:
+            self._close(order)
+        return order
+
+    def _close(self, order: Order) -> None:
+        """Moves an order to the closed orders and removes the oldest ones."""
+        open_orders = self._open.get(order.symbol)
+        if open_orders is not None:
+            open_orders.pop(order.order_id, None)
+        self._closed[order.order_id] = None
+        self._closed.move_to_end(order.order_id)
+        while len(self._closed) > self.max_closed:
+            order_id, _ = self._closed.popitem(last=False)
+            removed = self._orders.pop(order_id, None)
+            if removed is not None and removed.client_order_id:
+                self._client_ids.pop(removed.client_order_id, None)
+
+    def _changed(self, order: Order | None) -> None:
+        """Calls on_change with an updated order."""
+        if order is not None and self.on_change is not None:
+            self.on_change(order)
+
+    def process_message(self, message: Any) -> bool:
+        """
+        Applies an orders or deals stream message.
+        Returns false if the message is of another stream.
+        """
+        if not isinstance(message, dict):
+            return False
+        stream = message.get("c")
+        if stream == ORDERS_STREAM:
+            with self._lock:
+                self._changed(self._apply(Order.from_stream(message)))
+            return True
+        if stream != DEALS_STREAM:
+            return False
+
+        data = message["d"]
+        with self._lock:
+            order = self._orders.get(data["i"])
+            if order is None:
+                self._orphans.setdefault(data["i"], {})[data["t"]] = Fill(data)
+                self._reconcile_order(message["s"], data["i"], unknown=True)
+            elif data["t"] not in order.fills:
+                order.fills[data["t"]] = Fill(data)
+                self._changed(order)
+        return True
+
+    def seed(self, symbols: Iterable[str]) -> None:
+        """Loads the open orders of symbols and reconciles them after reconnects."""
+        for symbol in symbols:
+            symbol = symbol.upper()
+            self._load_open_orders(symbol)
+            with self._lock:
+                self.symbols.add(symbol)
+
+    def on_open(self) -> None:
+        """Reloads the open orders of the seeded symbols in the background."""
+        with self._lock:
+            symbols = sorted(self.symbols)
+        for symbol in symbols:
+            self._executor.submit(self._reconcile_symbol, symbol)
+
+    def _reconcile_order(
+        self, symbol: str, order_id: str, unknown: bool = False
+    ) -> None:
+        """Loads an order in the background, once while it is pending."""
+        if order_id not in self._pending:
+            self._pending.add(order_id)
+            self._executor.submit(self._load_order, symbol, order_id, unknown)
+
+    def _load_order(self, symbol: str, order_id: str, unknown: bool) -> None:
+        """
+        Loads an order and applies it. An unknown order is only loaded when
+        it is still unknown after reconcile_delay, as the deal of a new order
+        may arrive before the order.
+        """
+        if unknown:
+            time.sleep(self.reconcile_delay)
+            with self._lock:
+                if order_id in self._orders:
+                    self._pending.discard(order_id)
+                    return
+        try:
+            row = self.spot.account.get_order(symbol, order_id)
+        except (MexcAPIError, OSError) as error:
+            self.logger.error("Loading order %s failed: %s", order_id, error)
+            row = {}
+        with self._lock:
+            self._pending.discard(order_id)
+            if row:
+                self.reconciles += 1
+                self._changed(self._apply(Order.from_rest(row)))
+
+    def _load_open_orders(self, symbol: str) -> None:
+        """
+        Loads the open orders of a symbol. Stored open orders that are
+        missing were closed, those are loaded one by one.
+        """
+        rows = self.spot.account.get_open_orders(symbol)
+        with self._lock:
+            self.reconciles += 1
+            for row in rows:
+                self._changed(self._apply(Order.from_rest(row)))
+            loaded = {row["orderId"] for row in rows}
+            for order_id in list(self._open.get(symbol, {})):
+                if order_id not in loaded:
+                    self._reconcile_order(symbol, order_id)
+
+    def _reconcile_symbol(self, symbol: str) -> None:
+        """Loads the open orders of a symbol in the background."""
+        try:
+            self._load_open_orders(symbol)
+        except (MexcAPIError, OSError) as error:
+            self.logger.error("Reconciling the orders of %s failed: %s", symbol, error)
+
+    def stop(self) -> None:
+        """Stops the background reconciles."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,158 @@
+"""
+Defines the protobuf messages of the MEXC websocket streams.
+
+The message types are built from descriptors at import time,
+so no generated code or protoc is needed. Requires the protobuf package.
+"""
+# pylint: disable=no-member
+from typing import Any
+
+try:
+    from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+    from google.protobuf.message import DecodeError
+except ImportError:  # pragma: no cover
+    descriptor_pb2 = None
+
+PACKAGE = "mexc"
+
+STRING = 9
+INT32 = 5
+INT64 = 3
+MESSAGE = 11
+
+# message name: [(field name, number, type, message type or None, repeated)]
+MESSAGES: dict[str, list[tuple[str, int, int, str | None, bool]]] = {
+    "PublicAggreDealsV3ApiItem": [
+        ("price", 1, STRING, None, False),
+        ("quantity", 2, STRING, None, False),
+        ("tradeType", 3, INT32, None, False),
+        ("time", 4, INT64, None, False),
+    ],
+    "PublicAggreDealsV3Api": [
+        ("deals", 1, MESSAGE, "PublicAggreDealsV3ApiItem", True),
+        ("eventType", 2, STRING, None, False),
+    ],
+    "PublicSpotKlineV3Api": [
+        ("interval", 1, STRING, None, False),
+        ("windowStart", 2, INT64, None, False),
+        ("openingPrice", 3, STRING, None, False),
+        ("closingPrice", 4, STRING, None, False),
+        ("highestPrice", 5, STRING, None, False),
+        ("lowestPrice", 6, STRING, None, False),
+        ("volume", 7, STRING, None, False),
+        ("amount", 8, STRING, None, False),
+        ("windowEnd", 9, INT64, None, False),
+    ],
+    "PublicAggreDepthV3ApiItem": [
+        ("price", 1, STRING, None, False),
+        ("quantity", 2, STRING, None, False),
+    ],
+    "PublicAggreDepthsV3Api": [
+        ("asks", 1, MESSAGE, "PublicAggreDepthV3ApiItem", True),
+        ("bids", 2, MESSAGE, "PublicAggreDepthV3ApiItem", True),
+        ("eventType", 3, STRING, None, False),
+        ("fromVersion", 4, STRING, None, False),
+        ("toVersion", 5, STRING, None, False),
+    ],
+    "PublicLimitDepthV3ApiItem": [
+        ("price", 1, STRING, None, False),
+        ("quantity", 2, STRING, None, False),
+    ],
+    "PublicLimitDepthsV3Api": [
+        ("asks", 1, MESSAGE, "PublicLimitDepthV3ApiItem", True),
+        ("bids", 2, MESSAGE, "PublicLimitDepthV3ApiItem", True),
+        ("eventType", 3, STRING, None, False),
+        ("version", 4, STRING, None, False),
+    ],
+    "PublicAggreBookTickerV3Api": [
+        ("bidPrice", 1, STRING, None, False),
+        ("bidQuantity", 2, STRING, None, False),
+        ("askPrice", 3, STRING, None, False),
+        ("askQuantity", 4, STRING, None, False),
+    ],
+}
+
+# The body of the wrapper is a oneof, other bodies are kept as unknown fields.
+WRAPPER_BODIES = [
+    ("publicLimitDepths", 303, "PublicLimitDepthsV3Api"),
+    ("publicSpotKline", 308, "PublicSpotKlineV3Api"),
+    ("publicAggreDepths", 313, "PublicAggreDepthsV3Api"),
+    ("publicAggreDeals", 314, "PublicAggreDealsV3Api"),
+    ("publicAggreBookTicker", 315, "PublicAggreBookTickerV3Api"),
+]
+WRAPPER_FIELDS = [
+    ("channel", 1, STRING),
+    ("symbol", 3, STRING),
+    ("symbolId", 4, STRING),
+    ("createTime", 5, INT64),
+    ("sendTime", 6, INT64),
+]
+
+
+def _add_field(
+    message: Any,
+    name: str,
+    number: int,
+    field_type: int,
+    type_name: str | None = None,
+    repeated: bool = False,
+) -> Any:
+    """Adds a field to a message descriptor proto."""
+    field = message.field.add(name=name, number=number, type=field_type)
+    field.label = (
+        descriptor_pb2.FieldDescriptorProto.LABEL_REPEATED
+        if repeated
+        else descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL
+    )
+    if type_name:
+        field.type_name = f".{PACKAGE}.{type_name}"
+    return field
+
+
+def _build_messages() -> dict[str, Any]:
+    """Builds the message classes of the stream messages."""
+    file_proto = descriptor_pb2.FileDescriptorProto(
+        name="mexc_api/websocket/push_data.proto", package=PACKAGE, syntax="proto3"
+    )
+    for message_name, fields in MESSAGES.items():
+        message = file_proto.message_type.add(name=message_name)
+        for field in fields:
+            _add_field(message, *field)
+
+    wrapper = file_proto.message_type.add(name="PushDataV3ApiWrapper")
+    wrapper.oneof_decl.add(name="body")
+    for name, number, field_type in WRAPPER_FIELDS:
+        _add_field(wrapper, name, number, field_type)
+    for name, number, type_name in WRAPPER_BODIES:
+        _add_field(wrapper, name, number, MESSAGE, type_name).oneof_index = 0
+
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file_proto)
+    file_descriptor = pool.FindFileByName(file_proto.name)
+    return {
+        name: message_factory.GetMessageClass(descriptor)
+        for name, descriptor in file_descriptor.message_types_by_name.items()
+    }
+
+
+# pylint: disable-next=invalid-name
+PushDataV3ApiWrapper: Any = (
+    _build_messages()["PushDataV3ApiWrapper"] if descriptor_pb2 is not None else None
+)
+
+
+def decode(data: bytes) -> Any:
+    """
+    Decodes a binary stream frame into a PushDataV3ApiWrapper message.
+    The body is set in the field named by wrapper.WhichOneof("body").
+    Raises a ValueError if the frame is not a valid message.
+    """
+    if PushDataV3ApiWrapper is None:
+        raise ImportError(
+            "Protobuf streams require protobuf, "
+            "install it with 'pip install mexc-api[protobuf]'."
+        )
+    try:
+        return PushDataV3ApiWrapper.FromString(data)
+    except DecodeError as error:
+        raise ValueError(f"Invalid protobuf frame: {error}") from error
@@ -0,0 +1,167 @@
+"""Defines the ShardedWebsocketStreamClient."""
+import logging
+from contextlib import ExitStack, contextmanager
+from threading import RLock
+from typing import Any, Callable, Iterator
+
+from mexc_api.common.enums import Action
+
+from .dispatcher import Dispatcher
+from .listen_key_manager import ListenKeyManager
+from .websocket_stream import BaseStreamClient, SpotWebsocketStreamClient
+
+# MEXC accepts at most 30 stream subscriptions per connection.
+MAX_STREAMS_PER_CONNECTION = 30
+
+
+class ShardedWebsocketStreamClient(BaseStreamClient):
+    """
+    Spreads stream subscriptions over a pool of websocket connections.
+
+    Every connection holds at most max_streams streams and has its own reader
+    thread. New streams go to the connection with the fewest streams, a new
+    connection is opened when all are full. After an unsubscribe the streams
+    of the emptiest connection are moved to the others when they fit, and
+    the connection is closed.
+
+    All connections share one dispatcher, messages of streams without a
+    route are passed to on_message from the reader thread of the connection
+    that received the message.
+
+    Pass None as api key and secret to only use public streams. The shards
+    share the listen keys of the listen key manager, up to 5 per key.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None,
+        api_secret: str | None,
+        on_message: Callable[[Any], None],
+        on_close: Callable | None = None,
+        on_error: Callable | None = None,
+        protobuf: bool = False,
+        max_streams: int = MAX_STREAMS_PER_CONNECTION,
+        listen_key_manager: ListenKeyManager | None = None,
+    ) -> None:
+        super().__init__(protobuf, api_key is None or api_secret is None)
+        self.logger = logging.getLogger(__name__)
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.on_message = on_message
+        self.dispatcher = Dispatcher(on_message)
+        self.on_close = on_close
+        self.on_error = on_error
+        self.max_streams = max_streams
+        self.listen_key_manager = listen_key_manager
+
+        self.shards: dict[SpotWebsocketStreamClient, set[str]] = {}
+        self._assignments: dict[str, SpotWebsocketStreamClient] = {}
+        self._batch: ExitStack | None = None
+        self._batched: set[SpotWebsocketStreamClient] = set()
+        self._lock = RLock()
+
+    @property
+    def streams(self) -> set[str]:
+        """Returns all subscribed streams."""
+        return set(self._assignments)
+
+    def _create_shard(self) -> SpotWebsocketStreamClient:
+        """Opens a new connection."""
+        shard = SpotWebsocketStreamClient(
+            self.api_key,
+            self.api_secret,
+            on_message=self.dispatcher.dispatch,
+            on_close=self.on_close,
+            on_error=self.on_error,
+            protobuf=self.protobuf,
+            listen_key_manager=self.listen_key_manager,
+        )
+        self.shards[shard] = set()
+        self.logger.debug("Opened websocket shard %s.", len(self.shards))
+        return shard
+
+    def _send(
+        self, shard: SpotWebsocketStreamClient, stream: str, action: Action
+    ) -> None:
+        """Changes a subscription on a shard, batched while in a batch context."""
+        if self._batch is not None and shard not in self._batched:
+            self._batched.add(shard)
+            self._batch.enter_context(shard.batch())
+        shard.subscriptions.change([stream], action)
+
+    def _subscribe(self, stream: str) -> None:
+        """Subscribes a stream on the emptiest shard with room."""
+        shards = [
+            shard
+            for shard, streams in self.shards.items()
+            if len(streams) < self.max_streams
+        ]
+        if shards:
+            shard = min(shards, key=lambda shard: len(self.shards[shard]))
+        else:
+            shard = self._create_shard()
+
+        self.shards[shard].add(stream)
+        self._assignments[stream] = shard
+        self._send(shard, stream, Action.SUBSCRIBE)
+
+    def _unsubscribe(self, stream: str) -> None:
+        """Unsubscribes a stream from its shard."""
+        shard = self._assignments.pop(stream)
+        self.shards[shard].discard(stream)
+        self._send(shard, stream, Action.UNSUBSCRIBE)
+
+    def _rebalance(self) -> None:
+        """Closes the emptiest shard when its streams fit in the other shards."""
+        while len(self.shards) > 1:
+            shard = min(self.shards, key=lambda shard: len(self.shards[shard]))
+            streams = self.shards[shard]
+            room = sum(
+                self.max_streams - len(other_streams)
+                for other, other_streams in self.shards.items()
+                if other is not shard
+            )
+            if len(streams) > room:
+                return
+
+            del self.shards[shard]
+            for stream in streams:
+                del self._assignments[stream]
+                self._subscribe(stream)
+            shard.stop()
+            self.logger.debug("Closed websocket shard, %s left.", len(self.shards))
+
+    def _change_subscription(
+        self, stream: str, action: Action = Action.SUBSCRIBE
+    ) -> None:
+        """Subscribes to or unsubscribes from stream on the shard that holds it."""
+        with self._lock:
+            if action == Action.SUBSCRIBE:
+                if stream not in self._assignments:
+                    self._subscribe(stream)
+            elif stream in self._assignments:
+                self._unsubscribe(stream)
+                self._rebalance()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Sends the subscriptions changed in the context in batched messages."""
+        with self._lock:
+            if self._batch is not None:
+                yield
+                return
+            with ExitStack() as self._batch:
+                try:
+                    yield
+                finally:
+                    self._batch = None
+                    self._batched.clear()
+
+    def stop(self) -> None:
+        """Stops all websocket connections."""
+        with self._lock:
+            for shard in self.shards:
+                shard.stop()
+            self.shards.clear()
+            self._assignments.clear()
+        self.dispatcher.stop()
@@ -0,0 +1,201 @@
+"""Defines the SubscriptionManager class."""
+import logging
+import time
+from contextlib import contextmanager
+from threading import RLock
+from typing import Callable, Iterator
+
+from mexc_api.common.enums import Action
+
+# Streams sent in the params of one subscription message.
+BATCH_SIZE = 30
+
+
+class _Request:
+    """A subscription message that is waiting for its ack."""
+
+    __slots__ = ("action", "streams", "sent", "attempts")
+
+    def __init__(self, action: Action, streams: list[str]) -> None:
+        self.action = action
+        self.streams = streams
+        self.sent = 0.0
+        self.attempts = 0
+
+
+def get_ack_streams(message: dict) -> tuple[bool, frozenset[str]]:
+    """
+    Returns whether an ack is successful and the streams it confirms.
+    Successful acks list the streams in msg, failed acks list them in brackets.
+    """
+    msg = str(message.get("msg", ""))
+    success = message.get("code") == 0 and not msg.startswith("Not ")
+    if "[" in msg:
+        msg = msg[msg.index("[") + 1 : msg.index("]", msg.index("["))]
+    return success, frozenset(stream.strip() for stream in msg.split(",") if stream)
+
+
+class SubscriptionManager:
+    """
+    Tracks the desired and the confirmed subscriptions of one connection.
+
+    Changes are sent with up to batch_size streams per message and a stream
+    is confirmed when the server acks it. Requests without an ack within the
+    timeout and failed requests are sent again, a stream is dropped after
+    max_attempts failed attempts. Expired requests are checked with every
+    processed message, clients also call retry_expired for binary frames and
+    from their ping loop, so idle and protobuf connections retry as well.
+
+    Call reset when the connection is (re)opened, the desired streams are
+    then sent again in as few messages as possible.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[dict], None],
+        batch_size: int = BATCH_SIZE,
+        timeout: float = 5,
+        max_attempts: int = 3,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.send = send
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+
+        self.desired: set[str] = set()
+        self.confirmed: set[str] = set()
+        self.failed: set[str] = set()
+        self._pending: list[_Request] = []
+        self._depth = 0
+        self._lock = RLock()
+
+    def _get_pending_streams(self, action: Action) -> set[str]:
+        """Returns the streams of the requests of an action waiting for an ack."""
+        return {
+            stream
+            for request in self._pending
+            if request.action == action
+            for stream in request.streams
+        }
+
+    def _send_request(self, request: _Request) -> None:
+        """Sends a request and marks it as pending."""
+        request.sent = time.monotonic()
+        request.attempts += 1
+        if request not in self._pending:
+            self._pending.append(request)
+        self.send(
+            {"method": request.action.value, "params": request.streams}
+        )
+
+    def _send_changes(self, action: Action, streams: set[str]) -> None:
+        """Sends the streams of an action in batches."""
+        ordered = sorted(streams)
+        for index in range(0, len(ordered), self.batch_size):
+            self._send_request(
+                _Request(action, ordered[index : index + self.batch_size])
+            )
+
+    def flush(self) -> None:
+        """Sends the changes between the desired and the confirmed streams."""
+        with self._lock:
+            subscribing = self._get_pending_streams(Action.SUBSCRIBE)
+            unsubscribing = self._get_pending_streams(Action.UNSUBSCRIBE)
+
+            self._send_changes(
+                Action.SUBSCRIBE, self.desired - self.confirmed - subscribing
+            )
+            self._send_changes(
+                Action.UNSUBSCRIBE,
+                (self.confirmed | subscribing) - self.desired - unsubscribing,
+            )
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Collects the changes made in the context and sends them on exit."""
+        with self._lock:
+            self._depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._depth -= 1
+                if not self._depth:
+                    self.flush()
+
+    def change(self, streams: list[str], action: Action = Action.SUBSCRIBE) -> None:
+        """Subscribes to or unsubscribes from streams."""
+        with self._lock:
+            if action == Action.SUBSCRIBE:
+                self.desired.update(streams)
+                self.failed.difference_update(streams)
+            else:
+                self.desired.difference_update(streams)
+            if not self._depth:
+                self.flush()
+
+    def reset(self) -> None:
+        """Forgets the confirmed streams and sends all desired streams again."""
+        with self._lock:
+            self.confirmed.clear()
+            self._pending.clear()
+            self.flush()
+
+    def _get_request(self, streams: frozenset[str]) -> _Request | None:
+        """Returns the oldest pending request with the acked streams."""
+        for request in self._pending:
+            if streams == frozenset(request.streams):
+                return request
+        return None
+
+    def _retry(self, request: _Request) -> None:
+        """Sends a request again or drops its streams after the last attempt."""
+        if request.attempts < self.max_attempts:
+            self._send_request(request)
+            return
+
+        self._pending.remove(request)
+        self.logger.warning(
+            "%s failed for %s.", request.action.value, ", ".join(request.streams)
+        )
+        if request.action == Action.SUBSCRIBE:
+            self.desired.difference_update(request.streams)
+            self.failed.update(request.streams)
+
+    def retry_expired(self) -> None:
+        """Sends the requests without an ack within the timeout again."""
+        if not self._pending:
+            return
+        with self._lock:
+            expired = time.monotonic() - self.timeout
+            for request in [
+                request for request in self._pending if request.sent < expired
+            ]:
+                self._retry(request)
+
+    def process_message(self, message: dict) -> bool:
+        """
+        Processes a received message.
+        Returns true if the message is a subscription ack.
+        """
+        self.retry_expired()
+        if "c" in message or "code" not in message or "msg" not in message:
+            return False
+
+        success, streams = get_ack_streams(message)
+        with self._lock:
+            request = self._get_request(streams)
+            if request is None:
+                return True
+
+            if not success:
+                self._retry(request)
+                return True
+
+            self._pending.remove(request)
+            if request.action == Action.SUBSCRIBE:
+                self.confirmed.update(request.streams)
+            else:
+                self.confirmed.difference_update(request.streams)
+        return True
@@ -1,29 +1,174 @@
 """Defines the MexcWebsocketClient."""
 import json
 import logging
-from typing import Callable, Literal
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Literal
+
+from websocket import WebSocketConnectionClosedException
 
 from mexc_api.common.enums import Action, StreamInterval
+from mexc_api.common.exceptions import MexcAPIError
+
+from .dispatcher import Dispatcher
+from .listen_key_manager import ListenKeyManager
+from .mexc_websocket_app import STREAM_URL, MexcWebsocketApp
+from .recorder import Recorder
+from .subscription_manager import SubscriptionManager
+
+# Push interval of the aggregated protobuf streams.
+PROTOBUF_INTERVAL = "100ms"
+
+
+class BaseStreamClient:
+    """
+    Defines the stream subscription methods, which return the stream name.
+    Subclasses implement how a subscription is changed.
+
+    With protobuf the trades, klines, depth and book ticker streams are
+    subscribed in their protobuf variant. A public client has no listen key
+    and raises a MexcAPIError when a private stream is subscribed.
+    The protobuf messages are only imported with protobuf or on the first
+    binary frame, as building them slows down the import.
+    """
+
+    def __init__(self, protobuf: bool = False, public: bool = False) -> None:
+        self._decode: Callable[[bytes], Any] | None = None
+        if protobuf:
+            # pylint: disable-next=import-outside-toplevel
+            from .protobuf import PushDataV3ApiWrapper, decode
+
+            if PushDataV3ApiWrapper is None:
+                raise ImportError(
+                    "Protobuf streams require protobuf, "
+                    "install it with 'pip install mexc-api[protobuf]'."
+                )
+            self._decode = decode
+        self.protobuf = protobuf
+        self.public = public
+
+    def _decode_frame(self, message: bytes) -> Any:
+        """Decodes a binary frame into a PushDataV3ApiWrapper message."""
+        if self._decode is None:
+            # pylint: disable-next=import-outside-toplevel
+            from .protobuf import decode
+
+            self._decode = decode
+        return self._decode(message)
+
+    def _change_subscription(
+        self, stream: str, action: Action = Action.SUBSCRIBE
+    ) -> None:
+        """Subscribes to or unsubscribes from stream."""
+        raise NotImplementedError
+
+    def trades(self, symbol: str, action: Action = Action.SUBSCRIBE) -> str:
+        """Subscribes to the trade stream of a symbol."""
+        if self.protobuf:
+            stream = f"spot@public.aggre.deals.v3.api.pb@{PROTOBUF_INTERVAL}@{symbol.upper()}"
+        else:
+            stream = f"spot@public.deals.v3.api@{symbol.upper()}"
+        self._change_subscription(stream, action)
+        return stream
+
+    def klines(
+        self, symbol: str, interval: StreamInterval, action: Action = Action.SUBSCRIBE
+    ) -> str:
+        """Subscribes to the kline stream of a symbol."""
+        channel = "kline.v3.api.pb" if self.protobuf else "kline.v3.api"
+        stream = f"spot@public.{channel}@{symbol.upper()}@{interval.value}"
+        self._change_subscription(stream, action)
+        return stream
+
+    def diff_depth(self, symbol: str, action: Action = Action.SUBSCRIBE) -> str:
+        """Subscribes to the increase depth stream of a symbol."""
+        if self.protobuf:
+            stream = f"spot@public.aggre.depth.v3.api.pb@{PROTOBUF_INTERVAL}@{symbol.upper()}"
+        else:
+            stream = f"spot@public.increase.depth.v3.api@{symbol.upper()}"
+        self._change_subscription(stream, action)
+        return stream
+
+    def partial_depth(
+        self, symbol: str, level: Literal[5, 10, 20], action: Action = Action.SUBSCRIBE
+    ) -> str:
+        """Subscribes to the partial depth stream of a symbol."""
+        channel = "limit.depth.v3.api.pb" if self.protobuf else "limit.depth.v3.api"
+        stream = f"spot@public.{channel}@{symbol.upper()}@{level}"
+        self._change_subscription(stream, action)
+        return stream
+
+    def book_ticker(self, symbol: str, action: Action = Action.SUBSCRIBE) -> str:
+        """Subscribes to the book ticker stream of a symbol."""
+        if self.protobuf:
+            stream = f"spot@public.aggre.bookTicker.v3.api.pb@{PROTOBUF_INTERVAL}@{symbol.upper()}"
+        else:
+            stream = f"spot@public.bookTicker.v3.api@{symbol.upper()}"
+        self._change_subscription(stream, action)
+        return stream
+
+    def _change_private_subscription(self, stream: str, action: Action) -> str:
+        """Subscribes to or unsubscribes from a stream that needs a listen key."""
+        if self.public and action is Action.SUBSCRIBE:
+            raise MexcAPIError(
+                f"{stream} requires an api key and secret, the client is public."
+            )
+        self._change_subscription(stream, action)
+        return stream
+
+    def account_updates(self, action: Action = Action.SUBSCRIBE) -> str:
+        """Subscribes to account updates."""
+        return self._change_private_subscription("spot@private.account.v3.api", action)
 
-from .mexc_websocket_app import MexcWebsocketApp
+    def account_deals(self, action: Action = Action.SUBSCRIBE) -> str:
+        """Subscribes to account deals."""
+        return self._change_private_subscription("spot@private.deals.v3.api", action)
 
+    def account_orders(self, action: Action = Action.SUBSCRIBE) -> str:
+        """Subscribes to account orders."""
+        return self._change_private_subscription("spot@private.orders.v3.api", action)
 
-class SpotWebsocketStreamClient:
-    """Handles the stream subscriptions."""
+
+class SpotWebsocketStreamClient(BaseStreamClient):
+    """
+    Handles the stream subscriptions.
+
+    Binary frames of protobuf streams are passed to on_message
+    as decoded PushDataV3ApiWrapper messages, text frames as dicts.
+    Subscription acks are handled by the SubscriptionManager and
+    are not passed to on_message.
+
+    Messages are routed by their stream by the dispatcher, messages of
+    streams without a registered route are passed to on_message.
+
+    With a recorder every received frame is recorded before it is processed.
+
+    Pass None as api key and secret for a public client, which connects
+    without any REST request and only supports the public streams.
+    Private clients take their listen key from listen_key_manager, or from
+    the default manager shared by all connections.
+    """
 
     def __init__(
         self,
-        api_key: str,
-        api_secret: str,
-        on_message: Callable[[dict], None],
+        api_key: str | None,
+        api_secret: str | None,
+        on_message: Callable[[Any], None],
         on_open: Callable[[], None] | None = None,
         on_close: Callable | None = None,
         on_error: Callable | None = None,
+        protobuf: bool = False,
+        recorder: Recorder | None = None,
+        url: str = STREAM_URL,
+        base_url: str = "https://api.mexc.com",
+        listen_key_manager: ListenKeyManager | None = None,
     ):
+        super().__init__(protobuf, api_key is None or api_secret is None)
         self.logger = logging.getLogger(__name__)
-        self.streams: set[str] = set()
+        self.subscriptions = SubscriptionManager(self._send)
         self.on_open = on_open
         self.on_message = on_message
+        self.dispatcher = Dispatcher(on_message)
+        self.recorder = recorder
         self.mexc_websocket_app = MexcWebsocketApp(
             api_key=api_key,
             api_secret=api_secret,
@@ -31,73 +176,66 @@ class SpotWebsocketStreamClient:
             on_open=self._on_open,
             on_close=on_close,
             on_error=on_error,
+            on_pong=self._on_pong,
+            url=url,
+            base_url=base_url,
+            listen_key_manager=listen_key_manager,
         )
         self.logger.debug("Mexc WebSocket Client started.")
 
+    @property
+    def streams(self) -> set[str]:
+        """Returns the subscribed streams."""
+        return self.subscriptions.desired
+
+    def _send(self, message: dict) -> None:
+        """Sends a message, messages before the connection is open are dropped."""
+        try:
+            self.mexc_websocket_app.send_message(message)
+        except WebSocketConnectionClosedException:
+            self.logger.debug("Not connected, %s is sent on open.", message)
+
     def _on_open(self, _app: MexcWebsocketApp) -> None:
-        """Reconnects to all streams and calls on_open callback."""
-        for stream in self.streams:
-            self._change_subscription(stream)
+        """Resubscribes to all streams and calls on_open callback."""
+        self.subscriptions.reset()
 
         if self.on_open:
             self.on_open()
 
-    def _on_message(self, _app: MexcWebsocketApp, message: str) -> None:
-        """passes the loaded data to the on_message_callback."""
-        self.on_message(json.loads(message))
+    def _on_message(self, _app: MexcWebsocketApp, message: str | bytes) -> None:
+        """Records and processes a received frame."""
+        if self.recorder is not None:
+            self.recorder.record(message)
+        self.process_frame(message)
+
+    def _on_pong(self, _app: MexcWebsocketApp, _data: bytes) -> None:
+        """Retries expired subscriptions on idle connections."""
+        self.subscriptions.retry_expired()
+
+    def process_frame(self, message: str | bytes) -> None:
+        """Decodes a frame and passes it to the dispatcher."""
+        if isinstance(message, bytes):
+            self.subscriptions.retry_expired()
+            self.dispatcher.dispatch(self._decode_frame(message))
+            return
+
+        data = json.loads(message)
+        if not self.subscriptions.process_message(data):
+            self.dispatcher.dispatch(data)
 
     def _change_subscription(
         self, stream: str, action: Action = Action.SUBSCRIBE
     ) -> None:
         """Subscribes to or unsubscribes from stream."""
-        self.streams.add(stream)
-        message = {"method": action.value, "params": [stream]}
-        self.mexc_websocket_app.send_message(message)
+        self.subscriptions.change([stream], action)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Sends the subscriptions changed in the context in batched messages."""
+        with self.subscriptions.batch():
+            yield
 
     def stop(self) -> None:
-        """Stops the websocket connection."""
+        """Stops the websocket connection and the dispatcher."""
         self.mexc_websocket_app.close()
-
-    def trades(self, symbol: str, action: Action = Action.SUBSCRIBE) -> None:
-        """Subscribes to the trade stream of a symbol."""
-        self._change_subscription(f"spot@public.deals.v3.api@{symbol.upper()}", action)
-
-    def klines(
-        self, symbol: str, interval: StreamInterval, action: Action = Action.SUBSCRIBE
-    ) -> None:
-        """Subscribes to the kline stream of a symbol."""
-        self._change_subscription(
-            f"spot@public.kline.v3.api@{symbol.upper()}@{interval.value}", action
-        )
-
-    def diff_depth(self, symbol: str, action: Action = Action.SUBSCRIBE) -> None:
-        """Subscribes to the increase depth stream of a symbol."""
-        self._change_subscription(
-            f"spot@public.increase.depth.v3.api@{symbol.upper()}", action
-        )
-
-    def partial_depth(
-        self, symbol: str, level: Literal[5, 10, 20], action: Action = Action.SUBSCRIBE
-    ) -> None:
-        """Subscribes to the partial depth stream of a symbol."""
-        self._change_subscription(
-            f"spot@public.limit.depth.v3.api@{symbol.upper()}@{level}", action
-        )
-
-    def book_ticker(self, symbol: str, action: Action = Action.SUBSCRIBE) -> None:
-        """Subscribes to the book ticker stream of a symbol."""
-        self._change_subscription(
-            f"spot@public.bookTicker.v3.api@{symbol.upper()}", action
-        )
-
-    def account_updates(self, action: Action = Action.SUBSCRIBE) -> None:
-        """Subscribes to account updates."""
-        self._change_subscription("spot@private.account.v3.api", action)
-
-    def account_deals(self, action: Action = Action.SUBSCRIBE) -> None:
-        """Subscribes to account deals."""
-        self._change_subscription("spot@private.deals.v3.api", action)
-
-    def account_orders(self, action: Action = Action.SUBSCRIBE) -> None:
-        """Subscribes to account orders."""
-        self._change_subscription("spot@private.orders.v3.api", action)
+        self.dispatcher.stop()
@@ -0,0 +1,58 @@
+"""Tests that AsyncSpot returns the same results as Spot."""
+import asyncio
+from typing import Any, Callable
+
+import pytest
+
+from mexc_api.common.enums import Interval, OrderType, Side
+from mexc_api.spot import AsyncSpot, Spot
+from mexc_api.testing.fake_server import FakeMexcServer
+
+pytest.importorskip("aiohttp")
+
+START_MS = 1_700_000_040_000
+# Keys holding the time the server answered at.
+TIME_KEYS = ("serverTime", "transactTime")
+
+# Calls with deterministic responses, run in order on a fresh server each.
+CALLS: list[Callable[[Any], Any]] = [
+    lambda spot: spot.market.default_symbols(),
+    lambda spot: spot.market.exchange_info(symbols=["btcusdt", "ethusdt"]),
+    lambda spot: spot.market.order_book("btcusdt", 10),
+    lambda spot: spot.market.klines(
+        "BTCUSDT", Interval.FIVE_MIN, START_MS, START_MS + 3_000_000
+    ),
+    lambda spot: spot.market.avg_price("ETHUSDT"),
+    lambda spot: spot.market.ticker_price("BTCUSDT"),
+    lambda spot: spot.market.ticker_price(),
+    lambda spot: spot.market.ticker_book_price("ethusdt"),
+    lambda spot: spot.account.new_order(
+        "btcusdt", Side.BUY, OrderType.LIMIT, "0.5", price="99.5", client_order_id="a"
+    ),
+    lambda spot: spot.account.get_order("BTCUSDT", client_order_id="a"),
+    lambda spot: spot.account.get_open_orders("BTCUSDT"),
+    lambda spot: spot.account.cancel_order("BTCUSDT", "C02__1"),
+]
+
+
+def strip_times(result: Any) -> Any:
+    """Removes the times the server answered at."""
+    if isinstance(result, list):
+        return [strip_times(item) for item in result]
+    if isinstance(result, dict):
+        return {key: value for key, value in result.items() if key not in TIME_KEYS}
+    return result
+
+
+def test_async_results_match_sync() -> None:
+    """Every call returns the same result from both clients."""
+    with FakeMexcServer("key", "secret") as server:
+        spot = Spot("key", "secret", base_url=server.base_url)
+        expected = [strip_times(call(spot)) for call in CALLS]
+
+    async def run() -> list:
+        async with FakeMexcServer("key", "secret") as server:
+            async with AsyncSpot("key", "secret", base_url=server.base_url) as spot:
+                return [strip_times(await call(spot)) for call in CALLS]
+
+    assert asyncio.run(run()) == expected
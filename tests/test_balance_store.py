@@ -0,0 +1,100 @@
+"""Tests the BalanceStore with a stubbed account endpoint."""
+import time
+from typing import Any, Callable
+
+from mexc_api.websocket.balance_store import ACCOUNT_STREAM, Balance, BalanceStore
+
+
+def update(
+    asset: str, free: float, locked: float, free_change: float, time_ms: int
+) -> dict:
+    """Returns an account updates stream message."""
+    data = {"a": asset, "f": str(free), "l": str(locked), "c": time_ms}
+    return {"c": ACCOUNT_STREAM, "d": {**data, "fd": str(free_change), "ld": "0"}}
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    """Waits until condition is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+class FakeAccount:
+    """An account endpoint that calls during while a request is in flight."""
+
+    def __init__(self, balances: dict[str, float]) -> None:
+        self.balances = balances
+        self.during: Callable[[], None] | None = None
+        self.requests = 0
+
+    def get_account_info(self) -> dict[str, Any]:
+        """Returns the balances, stream updates arrive while it is in flight."""
+        self.requests += 1
+        response = {
+            "updateTime": None,
+            "balances": [
+                {"asset": asset, "free": str(free), "locked": "0"}
+                for asset, free in self.balances.items()
+            ],
+        }
+        if self.during is not None:
+            self.during()
+        return response
+
+
+class FakeSpot:
+    """A spot client with the fake account."""
+
+    def __init__(self, balances: dict[str, float]) -> None:
+        self.account = FakeAccount(balances)
+
+
+def create_store(balances: dict[str, float]) -> tuple[BalanceStore, list[Balance]]:
+    """Returns a seeded store and the list its changes are appended to."""
+    changes: list[Balance] = []
+    spot = FakeSpot(balances)
+    store = BalanceStore(spot, on_change=changes.append)  # type: ignore[arg-type]
+    store.seed()
+    changes.clear()
+    return store, changes
+
+
+def test_updates_during_reconcile_are_applied() -> None:
+    """An update in flight wins over the older response regardless of clocks."""
+    store, changes = create_store({"USDT": 100.0, "MX": 5.0})
+    account = store.spot.account
+    account.balances = {"USDT": 100.0}  # type: ignore[attr-defined]
+    account.during = lambda: store.process_message(  # type: ignore[attr-defined]
+        update("USDT", 90.0, 0.0, -10.0, 1)
+    )
+    store.reconcile()
+
+    assert store.free("USDT") == 90.0
+    assert store.get("MX") is None
+    assert [(change.asset, change.total) for change in changes] == [
+        ("USDT", 90.0),
+        ("MX", 0.0),
+    ]
+
+
+def test_missed_updates_are_reconciled() -> None:
+    """An update that does not follow the stored balance reconciles the store."""
+    store, changes = create_store({"USDT": 100.0})
+    store.spot.account.balances = {"USDT": 75.0}  # type: ignore[attr-defined]
+    try:
+        store.process_message(update("USDT", 95.0, 0.0, -5.0, 1))
+        assert store.inconsistencies == 0
+        assert store.reconciles == 1
+
+        # The update of 95 to 85 was missed and the account holds 75 by now.
+        store.process_message(update("USDT", 80.0, 0.0, -5.0, 2))
+        assert store.inconsistencies == 1
+        wait_for(lambda: store.reconciles == 2)
+    finally:
+        store.stop()
+
+    assert store.free("USDT") == 75.0
+    assert store.spot.account.requests == 2  # type: ignore[attr-defined]
+    assert [change.free for change in changes] == [95.0, 80.0, 75.0]
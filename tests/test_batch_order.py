@@ -0,0 +1,66 @@
+"""Tests the chunking of batch_order against the fake server."""
+import asyncio
+from typing import Any, Awaitable, cast
+
+import pytest
+
+from mexc_api.common.enums import OrderType, Side
+from mexc_api.spot import AsyncSpot, Spot
+from mexc_api.testing.fake_server import FakeMexcServer
+
+pytest.importorskip("aiohttp")
+
+
+def create_orders() -> list[dict[str, Any]]:
+    """Returns interleaved BTCUSDT and ETHUSDT orders and one unknown symbol."""
+    orders: list[dict[str, Any]] = [
+        {
+            "symbol": "BTCUSDT" if index % 2 == 0 or index >= 42 else "ETHUSDT",
+            "side": Side.BUY,
+            "order_type": OrderType.LIMIT,
+            "quantity": "1",
+            "price": f"{90 + index}",
+            "client_order_id": f"order-{index}",
+        }
+        for index in range(46)
+    ]
+    orders.insert(7, {**orders[0], "symbol": "XRPUSDT", "client_order_id": "xrp"})
+    return orders
+
+
+def check_results(orders: list[dict[str, Any]], results: list[dict]) -> None:
+    """Checks that every result belongs to the order at its index."""
+    assert len(results) == len(orders)
+    for order, result in zip(orders, results):
+        if order["symbol"] == "XRPUSDT":
+            assert result == {"code": 400, "msg": "Invalid parameter 'XRPUSDT'."}
+            continue
+        assert result["clientOrderId"] == order["client_order_id"]
+        assert result["symbol"] == order["symbol"]
+        assert result["price"] == order["price"]
+
+
+def test_batch_order_chunks() -> None:
+    """Orders are sent in chunks of 20 per symbol and matched by index."""
+    orders = create_orders()
+    with FakeMexcServer("key", "secret") as server:
+        spot = Spot("key", "secret", base_url=server.base_url)
+        results = spot.account.batch_order(orders)
+        # 25 BTCUSDT, 21 ETHUSDT and 1 XRPUSDT orders.
+        assert server.requests == 5
+    check_results(orders, results)
+
+
+def test_async_batch_order_chunks() -> None:
+    """AsyncSpot matches the results of its chunks the same way."""
+    orders = create_orders()
+
+    async def run() -> list[dict]:
+        async with FakeMexcServer("key", "secret") as server:
+            async with AsyncSpot("key", "secret", base_url=server.base_url) as spot:
+                batch = cast(Awaitable[list[dict]], spot.account.batch_order(orders))
+                results = await batch
+                assert server.requests == 5
+                return results
+
+    check_results(orders, asyncio.run(run()))
@@ -0,0 +1,81 @@
+"""Tests the overflow policies of the dispatcher routes."""
+import time
+from threading import Event, Thread
+from typing import Any
+
+import pytest
+
+from mexc_api.common.enums import OverflowPolicy
+from mexc_api.websocket.dispatcher import Route
+
+
+class BlockingHandler:
+    """Records messages and holds the worker on the first one until released."""
+
+    def __init__(self) -> None:
+        self.handled: list[Any] = []
+        self.started = Event()
+        self.release = Event()
+
+    def __call__(self, message: Any) -> None:
+        self.started.set()
+        self.release.wait(5)
+        self.handled.append(message)
+
+
+@pytest.mark.parametrize(
+    ("policy", "handled", "dropped"),
+    [
+        (OverflowPolicy.DROP_OLDEST, [0, 4, 5], 3),
+        (OverflowPolicy.DROP_NEWEST, [0, 1, 2], 3),
+        (OverflowPolicy.CONFLATE, [0, 5], 4),
+    ],
+)
+def test_dropping_policies(
+    policy: OverflowPolicy, handled: list[int], dropped: int
+) -> None:
+    """A full queue drops the oldest, the newest or all but the last message."""
+    handler = BlockingHandler()
+    route = Route("stream", handler, max_size=2, policy=policy)
+    route.put(0)
+    assert handler.started.wait(5)
+    for message in range(1, 6):
+        route.put(message)
+
+    assert route.dropped == dropped
+    handler.release.set()
+    route.stop()
+    assert handler.handled == handled
+    assert route.stats() == {
+        "depth": 0,
+        "received": 6,
+        "dropped": dropped,
+        "handled": len(handled),
+    }
+
+
+def test_block_policy() -> None:
+    """A full queue blocks the producer until the worker makes room."""
+    handler = BlockingHandler()
+    route = Route("stream", handler, max_size=2, policy=OverflowPolicy.BLOCK)
+    route.put(0)
+    assert handler.started.wait(5)
+    route.put(1)
+    route.put(2)
+
+    def produce() -> None:
+        for message in (3, 4):
+            route.put(message)
+
+    producer = Thread(target=produce)
+    producer.start()
+    time.sleep(0.05)
+    assert producer.is_alive()
+    assert route.depth == 2
+
+    handler.release.set()
+    producer.join(5)
+    assert not producer.is_alive()
+    route.stop()
+    assert handler.handled == [0, 1, 2, 3, 4]
+    assert route.dropped == 0
@@ -0,0 +1,88 @@
+"""Runs Spot and AsyncSpot against the fake server."""
+import asyncio
+from typing import Any, Awaitable, Iterator, cast
+
+import pytest
+
+from mexc_api.common.enums import Interval, OrderType, Side
+from mexc_api.common.exceptions import MexcAPIError
+from mexc_api.spot import AsyncSpot, Spot
+from mexc_api.testing.fake_server import FakeMexcServer
+
+pytest.importorskip("aiohttp")
+
+
+@pytest.fixture(name="server", scope="module")
+def fixture_server() -> Iterator[FakeMexcServer]:
+    """Runs the fake server in a thread."""
+    with FakeMexcServer("key", "secret") as server:
+        yield server
+
+
+def awaitable(result: Any) -> Awaitable[Any]:
+    """Inherited async endpoints are typed as sync but return the coroutine."""
+    return cast(Awaitable[Any], result)
+
+
+def test_spot(server: FakeMexcServer) -> None:
+    """The market, order and listen key routes answer in the parsed shapes."""
+    spot = Spot("key", "secret", base_url=server.base_url)
+    assert spot.market.server_time() > 0
+    assert "BTCUSDT" in spot.market.default_symbols()
+    assert len(spot.market.klines("BTCUSDT", Interval.ONE_MIN, limit=5)) == 5
+    assert spot.market.order_book("BTCUSDT", 5)["bids"]
+
+    order = spot.account.new_order(
+        "BTCUSDT", Side.BUY, OrderType.LIMIT, "1", price="90"
+    )
+    assert spot.account.get_order("BTCUSDT", order["orderId"]) == order
+    assert spot.account.cancel_open_orders("BTCUSDT")[0]["status"] == "CANCELED"
+    assert spot.account.get_open_orders("BTCUSDT") == []
+    with pytest.raises(MexcAPIError):
+        spot.account.cancel_order("BTCUSDT", "unknown")
+
+    listen_key = spot.account.create_listen_key()
+    assert listen_key in server.listen_keys
+    spot.account.delete_listen_key(listen_key)
+    assert listen_key not in server.listen_keys
+
+
+def test_unsupported_routes_raise(server: FakeMexcServer) -> None:
+    """Routes the fake server does not serve raise instead of returning {}."""
+    spot = Spot("key", "secret", base_url=server.base_url)
+    calls = (
+        spot.wallet.info,
+        spot.rebate.get_refer_code,
+        spot.subaccount.get_sub_accounts,
+        lambda: spot.etf.info("BTC3LUSDT"),
+        spot.account.get_mx_deduct,
+    )
+    for call in calls:
+        with pytest.raises(MexcAPIError, match="404"):
+            call()
+
+
+def test_async_spot(server: FakeMexcServer) -> None:
+    """AsyncSpot sends the same requests on its own connection pool."""
+
+    async def run() -> None:
+        async with AsyncSpot("key", "secret", base_url=server.base_url) as spot:
+            assert await spot.market.server_time() > 0
+            klines = await awaitable(
+                spot.market.klines("BTCUSDT", Interval.ONE_MIN, limit=5)
+            )
+            assert len(klines) == 5
+
+            order = await awaitable(
+                spot.account.new_order(
+                    "BTCUSDT", Side.SELL, OrderType.LIMIT, "1", price="110"
+                )
+            )
+            canceled = await awaitable(
+                spot.account.cancel_order("BTCUSDT", order["orderId"])
+            )
+            assert canceled["status"] == "CANCELED"
+            with pytest.raises(MexcAPIError, match="404"):
+                await awaitable(spot.wallet.info())
+
+    asyncio.run(run())
@@ -0,0 +1,147 @@
+"""Tests that GapRecovery drops the backfilled events that overlap live ones."""
+import time
+from threading import Event
+from typing import Any, Callable
+
+from mexc_api.common.utils import get_timestamp
+from mexc_api.websocket.gap_recovery import PRIVATE_DEALS_STREAM, GapRecovery
+
+DEALS_STREAM = "spot@public.deals.v3.api@BTCUSDT"
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    """Waits until condition is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def deals_message(*times: int) -> dict:
+    """Returns a trades message with one deal per time."""
+    return {
+        "c": DEALS_STREAM,
+        "d": {
+            "deals": [
+                {"S": 1, "p": "100", "t": time_ms, "v": "1"} for time_ms in times
+            ],
+            "e": "spot@public.deals.v3.api",
+        },
+        "s": "BTCUSDT",
+        "t": times[-1],
+    }
+
+
+def private_deal_message(trade_id: str, time_ms: int) -> dict:
+    """Returns an account deals message."""
+    return {
+        "c": PRIVATE_DEALS_STREAM,
+        "d": {"t": trade_id, "T": time_ms},
+        "s": "BTCUSDT",
+    }
+
+
+def account_trade(trade_id: str, time_ms: int) -> dict:
+    """Returns a trade of the account trades endpoint."""
+    return {
+        "symbol": "BTCUSDT",
+        "id": trade_id,
+        "orderId": "1",
+        "price": "100",
+        "qty": "1",
+        "quoteQty": "100",
+        "commission": "0",
+        "commissionAsset": "USDT",
+        "time": time_ms,
+        "isBuyer": True,
+        "isMaker": False,
+    }
+
+
+class FakeEndpoints:
+    """Market and account endpoints that hold every request until released."""
+
+    def __init__(self) -> None:
+        self.release = Event()
+        self.agg_trades_data: list[dict] = []
+        self.account_trades: list[dict] = []
+
+    def agg_trades(self, symbol: str, start_ms: int, end_ms: int, limit: int) -> list:
+        """Returns the aggregate trades between start_ms and end_ms."""
+        assert symbol == "BTCUSDT"
+        assert self.release.wait(5)
+        trades = [
+            trade for trade in self.agg_trades_data if start_ms <= trade["T"] <= end_ms
+        ]
+        return trades[:limit]
+
+    def iter_trades(self, symbol: str, start_ms: int, end_ms: int) -> list:
+        """Returns the account trades between start_ms and end_ms."""
+        assert symbol == "BTCUSDT"
+        assert self.release.wait(5)
+        return [
+            trade
+            for trade in self.account_trades
+            if start_ms <= trade["time"] < end_ms
+        ]
+
+
+class FakeSpot:
+    """A spot client whose market and account are the fake endpoints."""
+
+    def __init__(self) -> None:
+        self.market = self.account = FakeEndpoints()
+
+
+def test_backfilled_deals_overlapping_live_deals_are_dropped() -> None:
+    """Deals are passed once, whether they arrive backfilled, buffered or late."""
+    base = get_timestamp() - 10_000
+    spot = FakeSpot()
+    spot.market.agg_trades_data = [
+        {"a": None, "p": "100", "q": "1", "T": base + offset, "m": False}
+        for offset in (1000, 2000, 3000, 4000)
+    ]
+    delivered: list[dict] = []
+    recovery = GapRecovery(spot, delivered.append)  # type: ignore[arg-type]
+    try:
+        recovery.process_message(deals_message(base, base + 1000))
+        recovery.on_open()
+        recovery.process_message(deals_message(base + 3000, base + 4000))
+        spot.market.release.set()
+        wait_for(lambda: len(delivered) == 3)
+
+        # A late live message repeats a backfilled deal next to a new one.
+        recovery.process_message(deals_message(base + 2000, base + 5000))
+    finally:
+        recovery.stop()
+
+    times = [deal["t"] for message in delivered for deal in message["d"]["deals"]]
+    assert times == [base + offset for offset in (0, 1000, 2000, 3000, 4000, 5000)]
+    assert recovery.backfilled == 1
+    assert recovery.duplicates == 1
+
+
+def test_backfilled_account_deals_are_deduplicated_by_id() -> None:
+    """Account deals passed before the disconnect or live are not passed again."""
+    base = get_timestamp() - 10_000
+    spot = FakeSpot()
+    spot.account.account_trades = [
+        account_trade(trade_id, base + offset)
+        for trade_id, offset in (("1", 0), ("2", 1000), ("3", 2000), ("4", 3000))
+    ]
+    delivered: list[Any] = []
+    recovery = GapRecovery(spot, delivered.append)  # type: ignore[arg-type]
+    try:
+        recovery.process_message(private_deal_message("1", base))
+        recovery.process_message(private_deal_message("2", base + 1000))
+        recovery.on_open()
+        recovery.process_message(private_deal_message("4", base + 3000))
+        spot.account.release.set()
+        wait_for(lambda: len(delivered) == 4)
+        recovery.process_message(private_deal_message("3", base + 2000))
+    finally:
+        recovery.stop()
+
+    assert [message["d"]["t"] for message in delivered] == ["1", "2", "3", "4"]
+    assert recovery.backfilled == 1
+    assert recovery.duplicates == 2
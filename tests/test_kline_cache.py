@@ -0,0 +1,67 @@
+"""Tests the KlineCache against a fake klines endpoint and clock."""
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from mexc_api.common.enums import Interval
+from mexc_api.spot import kline_cache
+from mexc_api.spot.kline_cache import KlineCache
+
+pytest.importorskip("numpy")
+
+
+def get_ms(year: int, month: int, day: int = 1) -> int:
+    """Returns the timestamp of a UTC date in milliseconds."""
+    return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp()) * 1000
+
+
+MONTHS = [get_ms(2026, month) for month in range(1, 11)]
+
+
+class FakeMarket:
+    """Returns a monthly kline for every month of 2026 up to October."""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[int, int]] = []
+
+    def klines(
+        self, symbol: str, interval: Interval, start_ms: int, end_ms: int, limit: int
+    ) -> list[list[Any]]:
+        """Returns the klines with an open time in [start_ms, end_ms]."""
+        assert symbol == "BTCUSDT" and interval is Interval.ONE_MONTH
+        self.requests.append((start_ms, end_ms))
+        rows = [
+            [open_time, "1", "2", "0.5", "1.5", "10", open_time + 1, "15"]
+            for open_time in MONTHS
+            if start_ms <= open_time <= end_ms
+        ]
+        return rows[:limit]
+
+
+class FakeSpot:
+    """A spot client with the fake market."""
+
+    def __init__(self) -> None:
+        self.market = FakeMarket()
+
+
+def test_open_month_is_not_cached(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """In the middle of a month its kline is fetched on every call but not stored."""
+    monkeypatch.setattr(kline_cache, "get_timestamp", lambda: get_ms(2026, 10, 18))
+    spot = FakeSpot()
+    cache = KlineCache(spot, tmp_path)  # type: ignore[arg-type]
+
+    klines = cache.get("BTCUSDT", Interval.ONE_MONTH, MONTHS[0], get_ms(2026, 11))
+    assert list(klines["open_time"]) == MONTHS
+    assert cache.get_ranges("BTCUSDT", Interval.ONE_MONTH) == [
+        [MONTHS[0], get_ms(2026, 10)]
+    ]
+
+    spot.market.requests.clear()
+    klines = cache.get("BTCUSDT", Interval.ONE_MONTH, MONTHS[0], get_ms(2026, 11))
+    assert list(klines["open_time"]) == MONTHS
+    assert spot.market.requests == [(get_ms(2026, 10), get_ms(2026, 11) - 1)]
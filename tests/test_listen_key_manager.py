@@ -0,0 +1,52 @@
+"""Tests the ListenKeyManager against the fake server."""
+import time
+from typing import Callable
+
+import pytest
+
+from mexc_api.spot import Spot
+from mexc_api.testing.fake_server import FakeMexcServer
+from mexc_api.websocket.listen_key_manager import ListenKeyManager
+
+pytest.importorskip("aiohttp")
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    """Waits until condition is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_keys_rotate_and_are_deleted_on_close() -> None:
+    """A key is replaced at max_age and all keys are deleted on close."""
+    with FakeMexcServer("key", "secret") as server:
+        manager = ListenKeyManager(
+            server.base_url, keep_alive_interval=0.2, max_age=0.5
+        )
+        rotated: list[str] = []
+        first = manager.acquire("key", "secret", rotated.append)
+        assert server.listen_keys == {first}
+
+        wait_for(lambda: len(rotated) == 1)
+        wait_for(lambda: server.listen_keys == set(rotated))
+        assert rotated[0] != first
+
+        manager.close()
+        assert not server.listen_keys
+
+
+def test_keys_of_other_processes_are_not_used() -> None:
+    """Existing keys are neither handed out nor deleted."""
+    with FakeMexcServer("key", "secret") as server:
+        foreign = Spot("key", "secret", base_url=server.base_url)
+        other_key = foreign.account.create_listen_key()
+        manager = ListenKeyManager(server.base_url, connections_per_key=2)
+
+        keys = [manager.acquire("key", "secret") for _ in range(3)]
+        assert other_key not in keys
+        assert keys[0] == keys[1] != keys[2]
+
+        manager.close()
+        assert server.listen_keys == {other_key}
@@ -0,0 +1,91 @@
+"""Tests the gap detection and resync of the OrderBookManager."""
+import time
+from collections import deque
+from typing import Any, Callable
+
+from mexc_api.common.exceptions import MexcAPIError
+from mexc_api.websocket.order_book import DIFF_DEPTH_CHANNEL, OrderBookManager
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    """Waits until condition is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def diff(version: int, bid: float, quantity: float) -> dict:
+    """Returns a diff depth message changing one bid."""
+    return {
+        "c": f"{DIFF_DEPTH_CHANNEL}BTCUSDT",
+        "s": "BTCUSDT",
+        "d": {"r": str(version), "bids": [{"p": str(bid), "v": str(quantity)}]},
+    }
+
+
+def snapshot(version: int, bids: list[tuple[float, float]]) -> dict:
+    """Returns an order book snapshot."""
+    return {
+        "lastUpdateId": version,
+        "bids": [[str(price), str(quantity)] for price, quantity in bids],
+        "asks": [["101.0", "1.0"]],
+    }
+
+
+class FakeMarket:
+    """Answers the snapshot requests with the queued responses or errors."""
+
+    def __init__(self) -> None:
+        self.responses: deque[Any] = deque()
+        self.requests = 0
+
+    def order_book(self, symbol: str, limit: int) -> dict:
+        """Returns or raises the next queued response."""
+        assert symbol == "BTCUSDT" and limit == 1000
+        self.requests += 1
+        if not self.responses:
+            raise MexcAPIError(503, "No snapshot queued.")
+        response = self.responses.popleft()
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class FakeSpot:
+    """A spot client with the fake market."""
+
+    def __init__(self) -> None:
+        self.market = FakeMarket()
+
+
+def test_gap_resyncs_after_failed_snapshot() -> None:
+    """A gap marks the book out of sync until a snapshot lines up."""
+    spot = FakeSpot()
+    manager = OrderBookManager(spot, retry_delay=0.01)  # type: ignore[arg-type]
+    book = manager.subscribe("BTCUSDT")
+    try:
+        spot.market.responses.extend(
+            [MexcAPIError(500, "busy"), snapshot(10, [(100.0, 1.0)])]
+        )
+        manager.process_message(diff(11, 99.0, 2.0))
+        wait_for(lambda: book.synced)
+        assert spot.market.requests == 2
+        assert book.version == 11
+        assert book.top_bids(2) == [(100.0, 1.0), (99.0, 2.0)]
+
+        manager.process_message(diff(12, 100.0, 0.0))
+        assert book.best_bid() == (99.0, 2.0)
+
+        # Versions 13 and 14 are missed, the snapshot of 14 fills the gap.
+        manager.process_message(diff(15, 98.0, 3.0))
+        assert not book.synced
+        spot.market.responses.append(snapshot(14, [(99.0, 2.0), (98.0, 4.0)]))
+        wait_for(lambda: book.synced)
+        assert book.version == 15
+        assert book.top_bids(2) == [(99.0, 2.0), (98.0, 3.0)]
+
+        manager.process_message(diff(16, 97.0, 1.0))
+        assert book.version == 16
+    finally:
+        manager.stop()
@@ -0,0 +1,58 @@
+"""Tests that the OrderStore ignores stale updates that arrive out of order."""
+from mexc_api.websocket.order_store import ORDERS_STREAM, Order, OrderStore
+
+
+def order_message(status: int, executed: str, time_ms: int) -> dict:
+    """Returns an orders stream message of a limit buy of 2 BTCUSDT."""
+    return {
+        "c": ORDERS_STREAM,
+        "d": {
+            "i": "1",
+            "c": "client-1",
+            "S": 1,
+            "o": 1,
+            "p": "100",
+            "v": "2",
+            "cv": executed,
+            "ca": str(float(executed) * 100),
+            "s": status,
+            "O": 1000,
+        },
+        "s": "BTCUSDT",
+        "t": time_ms,
+    }
+
+
+def test_stale_updates_are_ignored() -> None:
+    """Updates with less executed quantity or that reopen an order are dropped."""
+    changes: list[tuple[str, float]] = []
+
+    def on_change(order: Order) -> None:
+        changes.append((order.status, order.executed_quantity))
+
+    store = OrderStore(None, on_change=on_change)  # type: ignore[arg-type]
+    try:
+        store.process_message(order_message(3, "1", 1002))
+        # The new order and a smaller fill arrive after the later fill.
+        store.process_message(order_message(1, "0", 1000))
+        store.process_message(order_message(3, "0.5", 1001))
+        assert store.stale == 2
+        assert [order.order_id for order in store.open_orders("BTCUSDT")] == ["1"]
+
+        store.process_message(order_message(2, "2", 1004))
+        # A partial fill with the same quantity arrives after the fill.
+        store.process_message(order_message(3, "2", 1003))
+    finally:
+        store.stop()
+
+    assert store.stale == 3
+    assert changes == [("PARTIALLY_FILLED", 1.0), ("FILLED", 2.0)]
+    order = store.get_by_client_id("client-1")
+    assert order is store.get("1")
+    assert order is not None
+    assert (order.status, order.executed_quantity, order.update_time) == (
+        "FILLED",
+        2.0,
+        1004,
+    )
+    assert not store.open_orders()
@@ -0,0 +1,80 @@
+"""Tests the window splitting of the WindowPaginator."""
+import asyncio
+
+import pytest
+
+from mexc_api.common.pagination import WindowPaginator, split_range
+
+ITEMS = [{"time": time_ms} for time_ms in range(100)]
+# Windows of 0 to 100 with a span of 50 and a limit of 20, split until not full.
+SPLIT_CALLS = [
+    (0, 49),
+    (0, 24),
+    (0, 11),
+    (12, 24),
+    (25, 49),
+    (25, 36),
+    (37, 49),
+    (50, 99),
+    (50, 74),
+    (50, 61),
+    (62, 74),
+    (75, 99),
+    (75, 86),
+    (87, 99),
+]
+
+
+class FakeEndpoint:
+    """Returns the items with a time in [start_ms, end_ms], at most limit."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[int, int]] = []
+
+    def fetch(self, start_ms: int, end_ms: int, limit: int) -> list[dict]:
+        """Records the window and returns its first limit items."""
+        self.calls.append((start_ms, end_ms))
+        return [item for item in ITEMS if start_ms <= item["time"] <= end_ms][:limit]
+
+    async def fetch_async(self, start_ms: int, end_ms: int, limit: int) -> list[dict]:
+        """Returns the items of a window from a coroutine."""
+        await asyncio.sleep(0)
+        return self.fetch(start_ms, end_ms, limit)
+
+
+def test_split_range() -> None:
+    """Windows touch at their boundaries and the last one ends at end_ms."""
+    assert split_range(0, 25, 10) == [(0, 10), (10, 20), (20, 25)]
+    assert split_range(0, 20, 10) == [(0, 10), (10, 20)]
+    assert not split_range(10, 10, 10)
+
+
+def test_windows_end_before_the_next_start() -> None:
+    """The inclusive end of a window is one before the start of the next."""
+    endpoint = FakeEndpoint()
+    paginator = WindowPaginator(endpoint.fetch, 0, 100, 30, 1000)
+    assert list(paginator) == ITEMS
+    assert endpoint.calls == [(0, 29), (30, 59), (60, 89), (90, 99)]
+
+
+@pytest.mark.parametrize("prefetch", [0, 3])
+def test_full_windows_are_split(prefetch: int) -> None:
+    """A window with limit items is fetched again in halves, nothing repeats."""
+    endpoint = FakeEndpoint()
+    paginator = WindowPaginator(endpoint.fetch, 0, 100, 50, 20, prefetch)
+    assert list(paginator) == ITEMS
+    assert sorted(endpoint.calls) == sorted(SPLIT_CALLS)
+    assert paginator.requests == len(SPLIT_CALLS)
+
+
+def test_async_full_windows_are_split() -> None:
+    """async for splits full windows the same way."""
+    endpoint = FakeEndpoint()
+    paginator = WindowPaginator(endpoint.fetch_async, 0, 100, 50, 20, prefetch=2)
+
+    async def collect() -> list:
+        return [item async for item in paginator]
+
+    assert asyncio.run(collect()) == ITEMS
+    assert sorted(endpoint.calls) == sorted(SPLIT_CALLS)
+    assert paginator.requests == len(SPLIT_CALLS)
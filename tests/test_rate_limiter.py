@@ -0,0 +1,146 @@
+"""Tests the RateLimiter against a fake session and clock."""
+from collections import deque
+from typing import Any
+
+import pytest
+
+from mexc_api.common import rate_limiter
+from mexc_api.common.api import Api
+from mexc_api.common.enums import Method
+from mexc_api.common.exceptions import MexcAPIError
+from mexc_api.common.rate_limiter import RateLimiter
+
+ENDPOINT = "/api/v3/klines"
+PARAMS = {"symbol": "MXUSDT"}
+LIMIT = 50
+INTERVAL = 1.0
+
+
+class FakeClock:
+    """Replaces the time module of the rate limiter, sleeping advances the clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        """Returns the current time."""
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Advances the clock."""
+        self.now += seconds
+
+
+class FakeResponse:
+    """A response of the fake session."""
+
+    def __init__(self, status_code: int, headers: dict[str, str]) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.ok = status_code < 400
+
+    def json(self) -> Any:
+        """Returns the content of the response."""
+        return {} if self.ok else {"msg": "Too many requests."}
+
+
+class FakeSession:
+    """
+    A session that enforces limit weight per interval like the server.
+    Responses are taken from responses first, then computed from the window.
+    """
+
+    def __init__(self, clock: FakeClock, limit: int = LIMIT) -> None:
+        self.clock = clock
+        self.limit = limit
+        self.sent: list[float] = []
+        self.rejected = 0
+        self.responses: deque[FakeResponse] = deque()
+
+    def request(self, method: str, url: str) -> FakeResponse:
+        """Records the request and returns its response."""
+        assert method == "GET" and ENDPOINT in url
+        now = self.clock.monotonic()
+        self.sent.append(now)
+        if self.responses:
+            return self.responses.popleft()
+        used = sum(1 for sent in self.sent if sent > now - INTERVAL)
+        if used > self.limit:
+            self.rejected += 1
+            return FakeResponse(429, {"Retry-After": "1"})
+        return FakeResponse(200, {})
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Patches the clock of the rate limiter."""
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return clock
+
+
+def create_api(clock: FakeClock, limiter: RateLimiter) -> tuple[Api, FakeSession]:
+    """Returns an api that sends its requests to a fake session."""
+    api = Api("key", "secret", rate_limiter=limiter)
+    session = FakeSession(clock)
+    api.session = session  # type: ignore[assignment]
+    return api, session
+
+
+def test_sustained_throughput(clock: FakeClock) -> None:
+    """Sustained requests stay within the limit in every interval and near it."""
+    api, session = create_api(clock, RateLimiter(LIMIT, LIMIT, INTERVAL))
+    for _ in range(LIMIT * 10):
+        api.send_request(Method.GET, ENDPOINT, PARAMS)
+
+    assert session.rejected == 0
+    sent = session.sent
+    for i, started in enumerate(sent):
+        in_window = sum(1 for other in sent[i:] if other < started + INTERVAL)
+        assert in_window <= LIMIT
+    # The limiter keeps a burst of 10% and sends the rest evenly.
+    rate = (len(sent) - 1) / (sent[-1] - sent[0])
+    assert 0.9 * LIMIT / INTERVAL <= rate <= LIMIT / INTERVAL
+
+
+def test_backs_off_after_429(clock: FakeClock) -> None:
+    """A 429 blocks the endpoint for Retry-After before the retry."""
+    api, session = create_api(clock, RateLimiter(LIMIT, LIMIT, INTERVAL))
+    session.responses.append(FakeResponse(429, {"Retry-After": "3"}))
+    assert api.send_request(Method.GET, ENDPOINT, PARAMS) == {}
+
+    assert len(session.sent) == 2
+    assert session.sent[1] - session.sent[0] >= 3.0
+
+
+def test_raises_after_max_retries(clock: FakeClock) -> None:
+    """A request that stays rate limited raises after max_retries."""
+    api, session = create_api(clock, RateLimiter(LIMIT, LIMIT, INTERVAL))
+    api.max_retries = 2
+    session.responses.extend(FakeResponse(429, {}) for _ in range(3))
+    with pytest.raises(MexcAPIError):
+        api.send_request(Method.GET, ENDPOINT, PARAMS)
+
+    assert len(session.sent) == 3
+    assert session.sent[-1] - session.sent[0] >= 2 * INTERVAL
+
+
+def test_used_weight_lowers_budget(clock: FakeClock) -> None:
+    """A used weight header makes the next requests wait for the used budget."""
+    api, session = create_api(clock, RateLimiter(LIMIT, LIMIT, INTERVAL))
+    session.responses.append(FakeResponse(200, {"X-MEXC-USED-WEIGHT": str(LIMIT)}))
+    api.send_request(Method.GET, ENDPOINT, PARAMS)
+    api.send_request(Method.GET, ENDPOINT, PARAMS)
+
+    assert len(session.sent) == 2
+    assert session.sent[1] - session.sent[0] >= 0.9 * INTERVAL
+
+
+def test_malformed_used_weight_is_ignored(clock: FakeClock) -> None:
+    """A malformed used weight header does not change the budget."""
+    api, session = create_api(clock, RateLimiter(LIMIT, LIMIT, INTERVAL))
+    session.responses.append(FakeResponse(200, {"X-MEXC-USED-WEIGHT": "many"}))
+    api.send_request(Method.GET, ENDPOINT, PARAMS)
+    api.send_request(Method.GET, ENDPOINT, PARAMS)
+
+    assert session.sent == [clock.now, clock.now]
@@ -0,0 +1,75 @@
+"""Tests that the Replayer reads back what the Recorder wrote."""
+import json
+from pathlib import Path
+
+import pytest
+
+from mexc_api.websocket.recorder import Recorder, Replayer
+
+START_NS = 1_700_000_000_000_000_000
+
+
+def deal_frame(index: int) -> str:
+    """Returns a json trade frame."""
+    return json.dumps({"c": "spot@public.deals.v3.api@BTCUSDT", "t": index})
+
+
+def record(path: Path, frames: list[str | bytes], chunk_size: int) -> None:
+    """Records frames one millisecond apart."""
+    recorder = Recorder(path, chunk_size=chunk_size, flush_interval=60)
+    for index, frame in enumerate(frames):
+        recorder.record(frame, START_NS + index * 1_000_000)
+    recorder.close()
+
+
+def test_round_trip_with_newlines(tmp_path: Path) -> None:
+    """Text frames with newlines and binary frames are read back unchanged."""
+    frames: list[str | bytes] = [deal_frame(index) for index in range(50)]
+    frames[3] = "line one\nline two\n"
+    frames[10] = b"\n\x00binary\nframe\xff"
+    frames[11] = ""
+    frames[40] = "\n"
+    path = tmp_path / "frames.log"
+    record(path, frames, chunk_size=200)
+
+    replayer = Replayer(path)
+    assert len(replayer.index) > 5
+    assert list(replayer.frames()) == [
+        (START_NS + index * 1_000_000, frame) for index, frame in enumerate(frames)
+    ]
+    assert [frame for _, frame in replayer.frames(START_NS // 10**6 + 10, None)] == (
+        frames[10:]
+    )
+    assert [frame for _, frame in replayer.frames(None, START_NS // 10**6 + 4)] == (
+        frames[:4]
+    )
+    replayed: list[str | bytes] = []
+    assert replayer.replay(replayed.append) == len(frames)
+    assert replayed == frames
+
+
+def test_round_trip_protobuf(tmp_path: Path) -> None:
+    """Serialized protobuf messages are replayed as bytes that decode again."""
+    pytest.importorskip("google.protobuf")
+    protobuf = pytest.importorskip("mexc_api.websocket.protobuf")
+    messages = []
+    for index in range(20):
+        message = protobuf.PushDataV3ApiWrapper(
+            channel="spot@public.aggre.deals.v3.api.pb@100ms@BTCUSDT",
+            symbol="BTCUSDT",
+            sendTime=1_700_000_000_000 + index,
+        )
+        message.publicAggreDeals.deals.add(
+            price="64123.45", quantity="0.01", tradeType=1, time=index
+        )
+        messages.append(message)
+    frames: list[str | bytes] = [message.SerializeToString() for message in messages]
+    assert any(b"\n" in frame for frame in frames)
+    frames.insert(5, deal_frame(5))
+    path = tmp_path / "frames.log"
+    record(path, frames, chunk_size=1 << 20)
+
+    replayed = [frame for _, frame in Replayer(path).frames()]
+    assert replayed == frames
+    decoded = [protobuf.decode(frame) for frame in replayed if isinstance(frame, bytes)]
+    assert decoded == messages
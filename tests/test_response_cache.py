@@ -0,0 +1,98 @@
+"""Tests the request coalescing and expiry of the ResponseCache."""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+import pytest
+
+from mexc_api.common import response_cache
+from mexc_api.common.response_cache import ResponseCache
+
+ENDPOINT = "/api/v3/ticker/price"
+
+
+def test_waiter_sends_when_leader_is_cancelled() -> None:
+    """A cancelled leader hands the request to a waiting task."""
+
+    async def run() -> None:
+        cache = ResponseCache()
+        sent: list[int] = []
+        release = asyncio.Event()
+
+        async def send() -> list:
+            sent.append(len(sent))
+            await release.wait()
+            return [{"symbol": "BTCUSDT", "price": str(len(sent))}]
+
+        leader = asyncio.create_task(cache.fetch_async(ENDPOINT, "", {}, send))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(cache.fetch_async(ENDPOINT, "", {}, send))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*waiters)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert len(sent) == 2
+        assert results == [[{"symbol": "BTCUSDT", "price": "2"}]] * 3
+
+    asyncio.run(run())
+
+
+class FakeClock:
+    """Replaces the time module of the response cache."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        """Returns the current time."""
+        return self.now
+
+
+def test_concurrent_requests_are_sent_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Threads asking for the same key share one request until the ttl expires."""
+    clock = FakeClock()
+    monkeypatch.setattr(response_cache, "time", clock)
+    cache = ResponseCache({ENDPOINT: 1.0})
+    started = Event()
+    release = Event()
+    sent: list[int] = []
+
+    def send() -> list:
+        sent.append(len(sent))
+        started.set()
+        release.wait(5)
+        return [{"symbol": "BTCUSDT", "price": str(len(sent))}]
+
+    with ThreadPoolExecutor(5) as executor:
+        leader = executor.submit(cache.fetch, ENDPOINT, "", {}, send)
+        assert started.wait(5)
+        waiters = [
+            executor.submit(cache.fetch, ENDPOINT, "", {}, send) for _ in range(4)
+        ]
+        while cache.coalesced < 4:
+            time.sleep(0.001)
+        release.set()
+        results = [future.result(5) for future in [leader, *waiters]]
+
+    assert sent == [0]
+    assert results == [[{"symbol": "BTCUSDT", "price": "1"}]] * 5
+    assert cache.fetch(ENDPOINT, "symbol=BTCUSDT", {"symbol": "BTCUSDT"}, send) == {
+        "symbol": "BTCUSDT",
+        "price": "1",
+    }
+    assert cache.stats()["derived"] == 1
+
+    clock.now += 0.5
+    assert cache.fetch(ENDPOINT, "", {}, send) == results[0]
+    clock.now += 0.5
+    assert cache.fetch(ENDPOINT, "", {}, send) == [{"symbol": "BTCUSDT", "price": "2"}]
+    assert sent == [0, 1]
+    assert cache.stats()["misses"] == 2
@@ -0,0 +1,78 @@
+"""Tests the acks, expiry and retries of the SubscriptionManager."""
+import pytest
+
+from mexc_api.common.enums import Action
+from mexc_api.websocket import subscription_manager
+from mexc_api.websocket.subscription_manager import SubscriptionManager
+
+STREAMS = [f"spot@public.deals.v3.api@SYMBOL{index:02}USDT" for index in range(35)]
+
+
+class FakeClock:
+    """Replaces the time module of the subscription manager."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        """Returns the current time."""
+        return self.now
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Patches the clock of the subscription manager."""
+    clock = FakeClock()
+    monkeypatch.setattr(subscription_manager, "time", clock)
+    return clock
+
+
+def ack(streams: list[str]) -> dict:
+    """Returns a successful subscription ack."""
+    return {"id": 0, "code": 0, "msg": ",".join(streams)}
+
+
+def failed_ack(streams: list[str]) -> dict:
+    """Returns a failed subscription ack."""
+    return {
+        "id": 0,
+        "code": 0,
+        "msg": f"Not Subscribed successfully! [{','.join(streams)}]. Reason: Blocked!",
+    }
+
+
+def test_acks_expiry_and_retries(clock: FakeClock) -> None:
+    """Streams are confirmed by acks, unacked and failed requests are retried."""
+    sent: list[dict] = []
+    manager = SubscriptionManager(sent.append, timeout=5, max_attempts=3)
+    manager.change(STREAMS)
+    first, second = STREAMS[:30], STREAMS[30:]
+    assert sent == [
+        {"method": "SUBSCRIPTION", "params": first},
+        {"method": "SUBSCRIPTION", "params": second},
+    ]
+
+    assert manager.process_message(ack(first))
+    assert manager.confirmed == set(first)
+
+    # The second request is not acked within the timeout.
+    clock.now += 4
+    manager.retry_expired()
+    assert len(sent) == 2
+    clock.now += 2
+    manager.retry_expired()
+    assert sent[2:] == [{"method": "SUBSCRIPTION", "params": second}]
+
+    # A failed ack is retried at once, the third attempt expires again.
+    assert manager.process_message(failed_ack(second))
+    assert len(sent) == 4
+    clock.now += 6
+    assert not manager.process_message({"c": STREAMS[0], "d": {}})
+    assert len(sent) == 4
+    assert manager.failed == set(second)
+    assert manager.desired == set(first)
+
+    manager.change(first[:2], Action.UNSUBSCRIBE)
+    assert sent[4] == {"method": "UNSUBSCRIPTION", "params": first[:2]}
+    manager.process_message(ack(first[:2]))
+    assert manager.confirmed == set(first[2:])